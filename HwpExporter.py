@@ -1,24 +1,76 @@
 import os
+import sys
 import time
 import re
 import json
 import threading
 import logging
+import queue
+import atexit
+import multiprocessing
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import traceback
+import zipfile
+import zlib
+import struct
+import hashlib
+import gzip
+import bisect
+import heapq
+import argparse
+import csv
+import difflib
+import contextlib
+import functools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape, quoteattr
 
 import xml.etree.ElementTree as ET
-import win32com.client as win32
-from pyhwpx import Hwp
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+
+# CHANGELOG V1.1.0: 한글/엑셀(COM)과 tkinter는 실제로 쓰는 명령에서만 불러온다.
+#
+# 서버나 명령줄에서 직접 읽기 백엔드와 xlsx 출력만 쓰는 경우 이 모듈들이 없거나 불러오는 데만 시간이 오래 걸린다.
+win32 = None
+Hwp = None
+tk = ttk = filedialog = messagebox = None
+
+def load_hwp_module():
+    global Hwp
+    if Hwp is None:
+        from pyhwpx import Hwp
+
+def load_excel_module():
+    global win32
+    if win32 is None:
+        import win32com.client as win32
+
+def load_gui_modules():
+    global tk, ttk, filedialog, messagebox
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk, filedialog, messagebox
 
 # Constants
-VERSION = "1.0.0"
+VERSION = "1.1.0"
 IS_STABLE = True
 
 DATA_DIR = "data"
 SETTINGS_FILE = os.path.join(DATA_DIR,'settings.json')
 LOG_FILE = os.path.join(DATA_DIR,'hwp_converter.log')
+TRACE_FILE = os.path.join(DATA_DIR,'hwp_converter.trace.json')
+PAGE_INDEX_DIR = os.path.join(DATA_DIR,'page_index')
+TABLE_CACHE_DIR = os.path.join(DATA_DIR,'table_cache')
+MANIFEST_DIR = os.path.join(DATA_DIR,'manifests')
+CHECKPOINT_DIR = os.path.join(DATA_DIR,'checkpoints')
 # CHANGELOG V1.0.0 : 딜레이와 재시도 횟수 설정 제거
 DEFAULT_SETTINGS = {
     "isHwpVisible": True,
@@ -26,22 +78,2112 @@ DEFAULT_SETTINGS = {
     "doOpenHwp": True,
     "doOpenXlsx": True,
     "SPMode" : True,
+    "backend" : "auto",
+    "output" : "excel",
+    "useCache" : True,
+    "cacheMaxMB" : 512,
+    "trace" : True,
+    "incremental" : False,
+    "checkpoint" : True,
+    "writeNumbers" : True,
+    "fontSize" : 9,
+    "borderWeight" : "thin",
+    "rowHeightCap" : 24,
+    "maxMemoryMB" : 1024,
+    "pipelineDepth" : 4,
+    # 열과 페이지는 1부터 센 "1-3,5" 꼴, 행·열 수 조건은 원본 표 기준이며 0은 조건 없음
+    "tableFilter" : {"header": "", "minRows": 0, "maxRows": 0, "minCols": 0, "maxCols": 0, "pages": "", "columns": ""},
+    "logLevel" : "INFO",
+    "logMaxMB" : 10,
+    "logBackups" : 3,
     # "copyPasteDelay" : 0.2,
     # "retryLife" : 5,
 }
 
+HWPX_SECTION_PATTERN = re.compile(r"Contents/section(\d+)\.xml$", re.IGNORECASE)
+NOTE_TAGS = ("footNote", "endNote")
+
+def local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+# CHANGELOG V1.1.0: 한글의 배치 엔진 없이 표의 페이지를 정하는 페이지 계산기
+#
+# 한글은 저장할 때 최상위 문단의 줄 배치 결과(HWPX의 lineseg, HWP5의 PARA_LINE_SEG)를 함께 남기며, 줄마다 쪽의 첫 줄(0x01),
+# 단의 첫 줄(0x02) 표시와 쪽 안에서의 세로 위치(vertpos)가 들어 있다. 쪽의 첫 줄 표시가 있거나 단이 바뀌지 않았는데
+# 세로 위치가 거꾸로 가면 새 쪽으로 센다. 세로 위치는 여러 쪽에 걸친 표 다음 문단처럼 첫 줄 표시가 없는 경우를 잡는다.
+# 한 줄이 개체 때문에 여러 조각(segment)으로 나뉘면 첫 조각만 본다. 줄 배치 정보가 없는 문단은 명시적인 쪽 나누기만 센다.
+# 표의 페이지는 표 컨트롤이 놓인 글자 위치가 들어 있는 줄의 쪽이다.
+LINESEG_PAGE_START = 0x01
+LINESEG_COLUMN_START = 0x02
+LINESEG_FIRST_SEGMENT = 0x20000
+LINESEG_SEGMENTS = 0x60000
+
+class PageResolver:
+    def __init__(self, page=1):
+        self.page = page
+        self.vertpos = None
+        self.first_paragraph = True
+
+    def new_section(self):
+        self.page += 1
+        self.vertpos = None
+        self.first_paragraph = True
+
+    # lines는 (글자 위치, 세로 위치, flags) 목록, anchors는 문단 안 표 컨트롤의 글자 위치 목록이다. 표마다 페이지를 돌려준다.
+    def paragraph(self, page_break, lines, anchors):
+        first = self.first_paragraph
+        self.first_paragraph = False
+        if page_break and not first and not (lines and lines[0][2] & LINESEG_PAGE_START):
+            # 쪽 나누기가 있는데 첫 줄 표시가 없으면 배치 정보가 오래된 것이므로 나누기를 따른다.
+            self.page += 1
+            self.vertpos = None
+        if not lines:
+            return [self.page] * len(anchors)
+        positions = []
+        pages = []
+        for textpos, vertpos, flags in lines:
+            continued = flags & LINESEG_SEGMENTS and not flags & LINESEG_FIRST_SEGMENT
+            if self.vertpos is not None and not continued:
+                if flags & LINESEG_PAGE_START or (vertpos < self.vertpos and not flags & LINESEG_COLUMN_START):
+                    self.page += 1
+            self.vertpos = vertpos
+            positions.append(textpos)
+            pages.append(self.page)
+        return [pages[max(0, bisect.bisect_right(positions, anchor) - 1)] for anchor in anchors]
+
+# CHANGELOG V1.1.0: 한글 없이 HWPX 문서를 직접 읽는 추출 방식 추가
+#
+# HWPX는 zip 안의 Contents/section*.xml에 본문이 들어있으므로, 한글을 실행하지 않고 섹션을 순서대로 흘려 읽으며
+# 표(tbl)가 닫힐 때마다 export_via_xml이 쓰는 것과 같은 TABLE/ROW/CELL/P 구조로 바꿔 (페이지, 표) 쌍으로 돌려준다.
+# 페이지는 구역 시작과 PageResolver로 센다. 표가 놓인 문단의 줄 배치 정보는 문단 끝에 있으므로 문단이 닫힐 때 표를 내보낸다.
+#
+# wanted(순번, 페이지)가 False인 표는 TABLE을 만들지 않고 None을 돌려주며, start(구역, 순번, 페이지)를 주면
+# 그 구역부터 읽는다. section_starts에는 읽은 구역마다 (첫 표 순번, 시작 페이지)를 남긴다.
+class HwpxReader:
+    def __init__(self, file):
+        self.file = file
+        self.zip = None
+
+    def open(self):
+        self.zip = zipfile.ZipFile(self.file)
+        if not self.section_names():
+            self.close()
+            raise ValueError("No section found in HWPX file")
+
+    def close(self):
+        if self.zip:
+            self.zip.close()
+        self.zip = None
+
+    def section_names(self):
+        sections = []
+        for name in self.zip.namelist():
+            match = HWPX_SECTION_PATTERN.match(name)
+            if match:
+                sections.append((int(match.group(1)), name))
+        return [name for _, name in sorted(sections)]
+
+    def iter_tables(self, wanted=None, start=(0, 0, 1)):
+        first_section, ordinal, page = start
+        resolver = PageResolver(page)
+        self.section_starts = []
+        for index, name in enumerate(self.section_names()):
+            if index < first_section:
+                continue
+            if index > first_section:
+                resolver.new_section()
+            self.section_starts.append((ordinal, resolver.page))
+            with self.zip.open(name) as stream:
+                ordinal = yield from self.iter_section_tables(stream, resolver, ordinal, wanted)
+
+    # 표 컨트롤의 글자 위치는 한글과 같이 본문 글자는 한 칸, 컨트롤은 여덟 칸으로 센다.
+    def iter_section_tables(self, stream, resolver, ordinal, wanted):
+        root = None
+        depth = 0
+        table_depth = 0
+        note_depth = 0
+        page_break = False
+        lines = []
+        tables = []
+        position = anchor = 0
+        in_ctrl = False
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            name = local_name(elem.tag)
+            if event == "start":
+                depth += 1
+                if root is None:
+                    root = elem
+                if name in NOTE_TAGS:
+                    note_depth += 1
+                elif name == "tbl":
+                    table_depth += 1
+                    if table_depth == 1:
+                        anchor = position
+                elif name == "p" and depth == 2:
+                    page_break = elem.get("pageBreak") == "1"
+                    lines = []
+                    position = 0
+                elif name == "lineseg" and depth == 4:
+                    lines.append((int(elem.get("textpos", 0)), int(elem.get("vertpos", 0)), int(elem.get("flags", 0))))
+                if depth == 4 and name not in ("t", "lineseg"):
+                    if name == "ctrl":
+                        in_ctrl = True
+                    else:
+                        position += 8
+                elif depth == 5 and in_ctrl:
+                    position += 8
+                continue
+
+            depth -= 1
+            if name in NOTE_TAGS:
+                note_depth -= 1
+            elif name == "tbl":
+                table_depth -= 1
+                if table_depth == 0 and note_depth == 0:
+                    tables.append((anchor, elem))
+            elif name == "t" and depth == 3:
+                position += len(elem.text or "") + sum(1 + len(child.tail or "") for child in elem)
+            elif name == "ctrl" and depth == 3:
+                in_ctrl = False
+            elif name == "p" and depth == 1:
+                pages = resolver.paragraph(page_break, lines, [anchor for anchor, _ in tables])
+                for page, (_, tbl) in zip(pages, tables):
+                    yield page, self.to_hwpml_table(tbl) if wanted is None or wanted(ordinal, page) else None
+                    ordinal += 1
+                tables = []
+                # 처리가 끝난 최상위 문단은 버려서 섹션 크기와 상관없이 메모리를 일정하게 유지한다.
+                root.clear()
+        return ordinal
+
+    def to_hwpml_table(self, tbl):
+        table = ET.Element("TABLE", RowCount=tbl.get("rowCnt", "0"), ColCount=tbl.get("colCnt", "0"))
+        for tr in tbl:
+            if local_name(tr.tag) != "tr":
+                continue
+            row = ET.SubElement(table, "ROW")
+            for tc in tr:
+                if local_name(tc.tag) != "tc":
+                    continue
+                cell = ET.SubElement(row, "CELL")
+                paragraphs = []
+                for child in tc:
+                    child_name = local_name(child.tag)
+                    if child_name == "cellAddr":
+                        cell.set("ColAddr", child.get("colAddr", "0"))
+                        cell.set("RowAddr", child.get("rowAddr", "0"))
+                    elif child_name == "cellSpan":
+                        cell.set("ColSpan", child.get("colSpan", "1"))
+                        cell.set("RowSpan", child.get("rowSpan", "1"))
+                    elif child_name == "subList":
+                        paragraphs = self.iter_paragraph_texts(child)
+                for text in paragraphs:
+                    ET.SubElement(cell, "P").text = text
+        return table
+
+    def iter_paragraph_texts(self, elem):
+        for child in elem:
+            name = local_name(child.tag)
+            if name in NOTE_TAGS:
+                continue
+            if name == "p":
+                yield "".join(
+                    "".join(t.itertext())
+                    for run in child if local_name(run.tag) == "run"
+                    for t in run if local_name(t.tag) == "t"
+                )
+            yield from self.iter_paragraph_texts(child)
+
+# CHANGELOG V1.1.0: 한글 없이 HWP 5.0 바이너리 문서를 직접 읽는 추출 방식 추가
+#
+# HWP 5.0 문서는 OLE 복합 파일이므로, 먼저 컨테이너에서 스트림을 꺼내는 최소한의 읽기 기능만 구현한다.
+CFB_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+CFB_END_OF_CHAIN = 0xFFFFFFFE
+CFB_NO_STREAM = 0xFFFFFFFF
+
+# 파일 전체를 메모리(mmap)에 올리지 않고 필요한 섹터만 읽는다. 큰 스트림은 iter_stream으로 이어진 섹터를 묶어 조금씩 돌려준다.
+CFB_READ_SECTORS = 128
+
+class CompoundFile:
+    def __init__(self, file):
+        self.file = open(file, "rb")
+        header = self.file.read(512)
+        if header[:8] != CFB_SIGNATURE:
+            self.close()
+            raise ValueError("Not an OLE compound file")
+
+        sector_shift, mini_sector_shift = struct.unpack_from("<HH", header, 0x1E)
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_sector_shift
+        (fat_count, directory_start, _, self.mini_cutoff,
+         mini_fat_start, _, difat_start, difat_count) = struct.unpack_from("<8I", header, 0x2C)
+
+        difat = list(struct.unpack_from("<109I", header, 0x4C))
+        sector = difat_start
+        for _ in range(difat_count):
+            entries = struct.unpack(f"<{self.sector_size // 4}I", self.read_at(self.sector_offset(sector), self.sector_size))
+            difat.extend(entries[:-1])
+            sector = entries[-1]
+        self.fat = []
+        for sector in difat[:fat_count]:
+            self.fat.extend(struct.unpack(f"<{self.sector_size // 4}I", self.read_at(self.sector_offset(sector), self.sector_size)))
+
+        directory = self.read_chain(directory_start)
+        self.entries = [directory[i:i + 128] for i in range(0, len(directory) - 127, 128)]
+        root = self.entries[0]
+        self.mini_stream = self.read_chain(struct.unpack_from("<I", root, 116)[0], struct.unpack_from("<Q", root, 120)[0])
+        self.mini_fat = []
+        if mini_fat_start < CFB_END_OF_CHAIN:
+            mini_fat = self.read_chain(mini_fat_start)
+            self.mini_fat = list(struct.unpack(f"<{len(mini_fat) // 4}I", mini_fat))
+        self.streams = {}
+        self.collect_streams(struct.unpack_from("<I", root, 76)[0], "")
+
+    def close(self):
+        self.file.close()
+
+    def sector_offset(self, sector):
+        return (sector + 1) * self.sector_size
+
+    def read_at(self, offset, size):
+        self.file.seek(offset)
+        data = self.file.read(size)
+        return data + bytes(size - len(data))
+
+    def read_chain(self, sector, size=None, fat=None, read_sector=None):
+        if fat is None:
+            return b"".join(self.iter_chain(sector, size))
+        chunks = []
+        while sector < CFB_END_OF_CHAIN and len(chunks) <= len(fat):
+            chunks.append(read_sector(sector))
+            sector = fat[sector]
+        data = b"".join(chunks)
+        return data if size is None else data[:size]
+
+    # FAT 체인을 따라 이어진 섹터를 CFB_READ_SECTORS개까지 한 번에 읽어 돌려준다. 고리로 이어진 손상된 체인은 FAT 길이에서 멈춘다.
+    def iter_chain(self, sector, size=None):
+        remaining = size
+        visited = 0
+        while sector < CFB_END_OF_CHAIN and visited <= len(self.fat) and (remaining is None or remaining > 0):
+            first = last = sector
+            count = 1
+            while count < CFB_READ_SECTORS and last < len(self.fat) and self.fat[last] == last + 1:
+                last += 1
+                count += 1
+            data = self.read_at(self.sector_offset(first), count * self.sector_size)
+            if remaining is not None:
+                data = data[:remaining]
+                remaining -= len(data)
+            yield data
+            visited += count
+            sector = self.fat[last] if last < len(self.fat) else CFB_END_OF_CHAIN
+
+    def collect_streams(self, index, prefix):
+        # 디렉터리 엔트리는 이진 트리로 연결되어 있으므로 형제(left/right)와 자식을 모두 따라가며 경로를 만든다.
+        pending = [(index, prefix)]
+        while pending:
+            index, prefix = pending.pop()
+            if index == CFB_NO_STREAM or index >= len(self.entries):
+                continue
+            entry = self.entries[index]
+            name_length = struct.unpack_from("<H", entry, 64)[0]
+            name = entry[:max(name_length - 2, 0)].decode("utf-16-le")
+            entry_type = entry[66]
+            left, right, child = struct.unpack_from("<III", entry, 68)
+            pending.append((left, prefix))
+            pending.append((right, prefix))
+            if entry_type == 1:
+                pending.append((child, f"{prefix}{name}/"))
+            elif entry_type == 2:
+                self.streams[f"{prefix}{name}"] = (struct.unpack_from("<I", entry, 116)[0], struct.unpack_from("<Q", entry, 120)[0])
+
+    def read_stream(self, path):
+        return b"".join(self.iter_stream(path))
+
+    def iter_stream(self, path):
+        start, size = self.streams[path]
+        if size < self.mini_cutoff:
+            yield self.read_chain(
+                start, size, self.mini_fat,
+                lambda s: self.mini_stream[s * self.mini_sector_size:(s + 1) * self.mini_sector_size],
+            )
+            return
+        yield from self.iter_chain(start, size)
+
+HWP5_SIGNATURE = b"HWP Document File"
+HWP5_SECTION_PATTERN = re.compile(r"BodyText/Section(\d+)$")
+HWPTAG_PARA_HEADER = 66
+HWPTAG_PARA_TEXT = 67
+HWPTAG_PARA_LINE_SEG = 69
+HWPTAG_CTRL_HEADER = 71
+HWPTAG_LIST_HEADER = 72
+HWPTAG_TABLE = 77
+HWP5_TABLE_ID = int.from_bytes(b"tbl ", "big")
+HWP5_NOTE_IDS = (int.from_bytes(b"fn  ", "big"), int.from_bytes(b"en  ", "big"))
+HWP5_PAGE_BREAKS = 0x01 | 0x04  # 구역 나누기, 쪽 나누기
+# 문단 텍스트에서 한 글자만 차지하는 제어 문자. 나머지 0~31 제어 문자는 8글자(16바이트)를 차지한다.
+HWP5_CHAR_CONTROLS = {0: "", 10: "", 13: "", 24: "-", 25: "", 26: "", 27: "", 28: "", 29: "", 30: " ", 31: " "}
+# 문단 아래 CTRL_HEADER와 차례대로 짝이 되는 확장 컨트롤 문자
+HWP5_EXTENDED_CONTROLS = frozenset((1, 2, 3, 11, 12, 14, 15, 16, 17, 18, 21, 22, 23))
+HWP5_LINE_SEG = struct.Struct("<IiiiiiiiI")
+HWP5_CHUNK_SIZE = 1 << 16
+
+# 조금씩 풀린 구역 데이터(chunks)에서 레코드를 차례로 꺼낸다. 아직 다 오지 않은 레코드만 버퍼에 남긴다.
+def iter_hwp5_records(chunks):
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        offset = 0
+        end = len(buffer)
+        while offset + 4 <= end:
+            header = struct.unpack_from("<I", buffer, offset)[0]
+            tag, level, size = header & 0x3FF, (header >> 10) & 0x3FF, header >> 20
+            start = offset + 4
+            if size == 0xFFF:
+                if start + 4 > end:
+                    break
+                size = struct.unpack_from("<I", buffer, start)[0]
+                start += 4
+            if start + size > end:
+                break
+            yield tag, level, bytes(buffer[start:start + size])
+            offset = start + size
+        del buffer[:offset]
+
+# 문단 텍스트에서 확장 컨트롤이 놓인 글자 위치 목록
+def hwp5_control_positions(payload):
+    codes = struct.unpack(f"<{len(payload) // 2}H", payload[:len(payload) // 2 * 2])
+    positions = []
+    i = 0
+    while i < len(codes):
+        code = codes[i]
+        if code >= 32 or code in HWP5_CHAR_CONTROLS:
+            i += 1
+            continue
+        if code in HWP5_EXTENDED_CONTROLS:
+            positions.append(i)
+        i += 8
+    return positions
+
+def hwp5_line_segments(payload):
+    return [(textpos, vertpos, flags) for textpos, vertpos, *_, flags in HWP5_LINE_SEG.iter_unpack(payload[:len(payload) // 36 * 36])]
+
+def decode_hwp5_text(payload):
+    codes = struct.unpack(f"<{len(payload) // 2}H", payload[:len(payload) // 2 * 2])
+    parts = []
+    start = i = 0
+    while i < len(codes):
+        code = codes[i]
+        if code >= 32:
+            i += 1
+            continue
+        parts.append(payload[start * 2:i * 2].decode("utf-16-le", "replace"))
+        if code in HWP5_CHAR_CONTROLS:
+            parts.append(HWP5_CHAR_CONTROLS[code])
+            i += 1
+        else:
+            parts.append("\t" if code == 9 else "")
+            i += 8
+        start = i
+    parts.append(payload[start * 2:].decode("utf-16-le", "replace"))
+    return "".join(parts)
+
+# BodyText/Section* 스트림을 풀어서 레코드를 읽고, 표 컨트롤(tbl)을 만나면 그 하위 레코드(TABLE, 셀 LIST_HEADER, 문단)를
+# HwpxReader와 같은 TABLE/ROW/CELL/P 구조로 바꿔 (페이지, 표) 쌍으로 돌려준다. 페이지는 구역 시작과 PageResolver로 세며,
+# wanted, start와 section_starts는 HwpxReader와 같다.
+class Hwp5Reader:
+    def __init__(self, file):
+        self.file = file
+        self.ole = None
+        self.compressed = True
+
+    def open(self):
+        self.ole = CompoundFile(self.file)
+        try:
+            header = self.ole.read_stream("FileHeader")
+            if not header.startswith(HWP5_SIGNATURE):
+                raise ValueError("Not an HWP 5.0 document")
+            flags = struct.unpack_from("<I", header, 36)[0]
+            if flags & 0x06:
+                raise ValueError("Password protected or distribution HWP documents are not supported")
+            self.compressed = bool(flags & 0x01)
+            if not self.section_names():
+                raise ValueError("No section found in HWP file")
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        if self.ole:
+            self.ole.close()
+        self.ole = None
+
+    def section_names(self):
+        sections = []
+        for name in self.ole.streams:
+            match = HWP5_SECTION_PATTERN.match(name)
+            if match:
+                sections.append((int(match.group(1)), name))
+        return [name for _, name in sorted(sections)]
+
+    # 구역 스트림을 HWP5_CHUNK_SIZE씩 풀어 돌려준다. 압축된 구역이나 푼 구역 전체를 메모리에 두지 않는다.
+    def iter_section(self, name):
+        chunks = self.ole.iter_stream(name)
+        if not self.compressed:
+            yield from chunks
+            return
+        decompressor = zlib.decompressobj(-15)
+        for chunk in chunks:
+            while chunk and not decompressor.eof:
+                data = decompressor.decompress(chunk, HWP5_CHUNK_SIZE)
+                chunk = decompressor.unconsumed_tail
+                if data:
+                    yield data
+            if decompressor.eof:
+                break
+        yield decompressor.flush()
+
+    def iter_tables(self, wanted=None, start=(0, 0, 1)):
+        first_section, ordinal, page = start
+        resolver = PageResolver(page)
+        self.section_starts = []
+        for index, name in enumerate(self.section_names()):
+            if index < first_section:
+                continue
+            if index > first_section:
+                resolver.new_section()
+            self.section_starts.append((ordinal, resolver.page))
+            ordinal = yield from self.iter_section_tables(iter_hwp5_records(self.iter_section(name)), resolver, ordinal, wanted)
+
+    # 레코드를 흘려 읽으며 표 컨트롤을 만나면 그 하위 레코드만 모아 TABLE로 바꾼다. 한글은 문단의 텍스트와 줄 배치(PARA_LINE_SEG)를
+    # 컨트롤보다 먼저 저장하므로, 문단의 첫 표에서 PageResolver로 문단 안 컨트롤마다의 페이지를 정하고 표는 읽는 대로 내보낸다.
+    # 표가 없는 문단은 문단이 끝날 때 줄 배치만 센다.
+    def iter_section_tables(self, records, resolver, ordinal, wanted):
+        page_break = False
+        text = None
+        lines = []
+        pages = None
+        controls = 0
+        record = next(records, None)
+        while True:
+            if record is None or (record[0] == HWPTAG_PARA_HEADER and record[1] == 0):
+                if text is not None and pages is None:
+                    resolver.paragraph(page_break, lines, [])
+                if record is None:
+                    return ordinal
+                payload = record[2]
+                page_break = len(payload) > 11 and bool(payload[11] & HWP5_PAGE_BREAKS)
+                text = b""
+                lines = []
+                pages = None
+                controls = 0
+            else:
+                tag, level, payload = record
+                if tag == HWPTAG_PARA_TEXT and level == 1:
+                    text = payload
+                elif tag == HWPTAG_PARA_LINE_SEG and level == 1:
+                    lines = hwp5_line_segments(payload)
+                elif tag == HWPTAG_CTRL_HEADER and len(payload) >= 4:
+                    ctrl_id = struct.unpack_from("<I", payload)[0]
+                    if level == 1:
+                        controls += 1
+                    if ctrl_id == HWP5_TABLE_ID or ctrl_id in HWP5_NOTE_IDS:
+                        keep = False
+                        if ctrl_id == HWP5_TABLE_ID:
+                            if pages is None:
+                                # 텍스트에서 찾지 못한 컨트롤은 문단 첫 줄(글자 위치 0)에 둔다.
+                                positions = hwp5_control_positions(text or b"") + [0]
+                                pages = resolver.paragraph(page_break, lines, positions)
+                            page = pages[min(controls - 1, len(pages) - 1)]
+                            keep = wanted is None or wanted(ordinal, page)
+                        subtree = []
+                        record = next(records, None)
+                        while record is not None and record[1] > level:
+                            if keep:
+                                subtree.append(record)
+                            record = next(records, None)
+                        if ctrl_id == HWP5_TABLE_ID:
+                            yield page, self.to_hwpml_table(level, subtree) if keep else None
+                            ordinal += 1
+                        continue
+            record = next(records, None)
+
+    # records는 표 컨트롤(level) 아래의 하위 레코드다. 셀 안 각주/미주의 하위 레코드는 건너뛴다.
+    def to_hwpml_table(self, level, records):
+        table = ET.Element("TABLE")
+        rows = []
+        cell = paragraph = None
+        skip_level = None
+        for tag, record_level, payload in records:
+            if skip_level is not None:
+                if record_level > skip_level:
+                    continue
+                skip_level = None
+            if tag == HWPTAG_TABLE and record_level == level + 1:
+                row_count, col_count = struct.unpack_from("<HH", payload, 4)
+                table.set("RowCount", str(row_count))
+                table.set("ColCount", str(col_count))
+                rows = [ET.SubElement(table, "ROW") for _ in range(row_count)]
+            elif tag == HWPTAG_LIST_HEADER and record_level == level + 1:
+                col_addr, row_addr, col_span, row_span = struct.unpack_from("<4H", payload, 8)
+                while row_addr >= len(rows):
+                    rows.append(ET.SubElement(table, "ROW"))
+                cell = ET.SubElement(
+                    rows[row_addr], "CELL",
+                    ColAddr=str(col_addr), RowAddr=str(row_addr), ColSpan=str(col_span), RowSpan=str(row_span),
+                )
+                paragraph = None
+            elif cell is not None and tag == HWPTAG_PARA_HEADER:
+                paragraph = ET.SubElement(cell, "P")
+                paragraph.text = ""
+            elif paragraph is not None and tag == HWPTAG_PARA_TEXT:
+                paragraph.text += decode_hwp5_text(payload)
+            elif tag == HWPTAG_CTRL_HEADER and len(payload) >= 4 and struct.unpack_from("<I", payload)[0] in HWP5_NOTE_IDS:
+                skip_level = record_level
+        return table
+
+NATIVE_READERS = {
+    "hwpx": HwpxReader,
+    "hwp5": Hwp5Reader,
+}
+BACKENDS = ("auto", "com", *NATIVE_READERS)
+
+# CHANGELOG V1.1.0: 엑셀을 거치지 않는 출력을 위해 표를 메모리에 들고 있는 모델 추가
+#
+# rows는 표 안의 행 목록이며 값이 없는 칸은 None이다. merges는 표 기준 0부터 센 (시작 행, 시작 열, 끝 행, 끝 열)이다.
+class Table:
+    def __init__(self, page=None, ordinal=None):
+        self.page = page
+        self.ordinal = ordinal
+        self.rows = []
+        self.merges = []
+        self.bordered = False
+
+    @property
+    def n_rows(self):
+        return len(self.rows)
+
+    @property
+    def n_cols(self):
+        return len(self.rows[0]) if self.rows else 0
+
+    # 재배치가 행을 제자리에서 바꾸므로 주고받을 때는 행을 복사한다.
+    def to_dict(self):
+        return {"ordinal": self.ordinal, "page": self.page, "rows": [list(row) for row in self.rows], "merges": self.merges, "bordered": self.bordered}
+
+    @classmethod
+    def from_dict(cls, data):
+        table = cls(data["page"], data["ordinal"])
+        table.rows = [list(row) for row in data["rows"]]
+        table.merges = [tuple(merge) for merge in data["merges"]]
+        table.bordered = data.get("bordered", False)
+        return table
+
+    # 메모리 상한 계산에 쓰는 대략적인 크기. 문자열은 객체 머리 50바이트에 한글 기준 글자당 2바이트로 센다.
+    def size(self):
+        return 120 + sum(64 + 8 * len(row) + sum(50 + 2 * len(value) for value in row if value) for row in self.rows)
+
+# CHANGELOG V1.1.0: 메모리 상한(maxMemoryMB)을 넘으면 시트의 표를 임시 파일로 내려 쓴다.
+#
+# 모든 시트의 표 목록이 하나의 MemoryBudget을 나눠 쓰고, 상한을 넘긴 순간 표를 추가하던 목록이 메모리에 든 표를
+# 임시 파일(JSON 줄)로 옮긴다. 쓰기와 재배치는 표 목록을 앞에서부터 한 번씩만 훑으므로 표가 아무리 많아도
+# 메모리에는 상한만큼의 표와 지금 다루는 표 하나만 남는다. 상한이 0이면 내려 쓰지 않는다.
+class MemoryBudget:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.used = 0
+        self.spilled = False
+
+class TableList:
+    def __init__(self, budget=None):
+        self.budget = budget if budget is not None and budget.max_bytes else None
+        self.memory = []
+        self.memory_bytes = 0
+        self.file = None
+        self.spilled_count = 0
+
+    def __len__(self):
+        return self.spilled_count + len(self.memory)
+
+    def __iter__(self):
+        if self.file is not None:
+            self.file.flush()
+            self.file.seek(0)
+            for line in self.file:
+                yield Table.from_dict(json.loads(line))
+        yield from self.memory
+
+    def append(self, table):
+        self.memory.append(table)
+        if self.budget is None:
+            return
+        size = table.size()
+        self.memory_bytes += size
+        self.budget.used += size
+        if self.budget.used > self.budget.max_bytes:
+            self.spill()
+
+    def extend(self, tables):
+        for table in tables:
+            self.append(table)
+
+    def spill(self):
+        if self.file is None:
+            self.file = tempfile.TemporaryFile("w+", encoding="utf-8", dir=DATA_DIR if os.path.isdir(DATA_DIR) else None)
+            if not self.budget.spilled:
+                logging.info(f"tables exceed maxMemoryMB ({self.budget.max_bytes // (1024 * 1024)}MB); spilling sheets to disk")
+            self.budget.spilled = True
+        self.file.seek(0, os.SEEK_END)
+        for table in self.memory:
+            self.file.write(json.dumps(table.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.spilled_count += len(self.memory)
+        self.budget.used -= self.memory_bytes
+        self.memory = []
+        self.memory_bytes = 0
+
+    # 표를 넘겨주면서 목록에서 빼므로, 다른 목록으로 옮겨 담을 때 메모리를 두 번 세지 않는다.
+    def drain(self):
+        if self.file is not None:
+            self.file.flush()
+            self.file.seek(0)
+            for line in self.file:
+                yield Table.from_dict(json.loads(line))
+        for index, table in enumerate(self.memory):
+            self.memory[index] = None
+            if self.budget is not None:
+                size = table.size()
+                self.memory_bytes -= size
+                self.budget.used -= size
+            yield table
+        self.close()
+
+    def close(self):
+        if self.budget is not None:
+            self.budget.used -= self.memory_bytes
+        self.memory = []
+        self.memory_bytes = 0
+        self.spilled_count = 0
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class SheetModel:
+    def __init__(self, name, budget=None):
+        self.name = name
+        self.tables = TableList(budget)
+
+# 표의 행은 (ColAddr, ColSpan, RowSpan, 문단 텍스트 목록) 셀들의 목록으로 주고받는다.
+def cell_from_element(cell_elem, paragraphs):
+    return (
+        int(cell_elem.get("ColAddr", 0)),
+        int(cell_elem.get("ColSpan", 1)),
+        int(cell_elem.get("RowSpan", 1)),
+        [text for text in ("".join(p_elem.itertext()).strip() for p_elem in paragraphs) if text],
+    )
+
+# select(행 번호, ColAddr, ColSpan)가 False인 셀은 글자를 합치지 않고 빈 셀로 넘긴다.
+def skipped_cell(cell_elem):
+    return (int(cell_elem.get("ColAddr", 0)), int(cell_elem.get("ColSpan", 1)), int(cell_elem.get("RowSpan", 1)), [])
+
+def iter_element_rows(root, select=None):
+    for r, row_elem in enumerate(root.findall(".//ROW")):
+        yield [
+            cell_from_element(cell_elem, cell_elem.findall(".//P"))
+            if select is None or select(r, int(cell_elem.get("ColAddr", 0)), int(cell_elem.get("ColSpan", 1)))
+            else skipped_cell(cell_elem)
+            for cell_elem in row_elem.findall("CELL")
+        ]
+
+# CHANGELOG V1.1.0: 정규식으로 TABLE만 잘라낸 뒤 통째로 파싱하던 방식을 끌어오기(pull) 파서로 변경
+#
+# GetTextFile 결과를 조각내어 흘려 넣고, FOOTNOTE/ENDNOTE 하위는 닫히는 즉시 비우며, 가장 바깥 표의 ROW가 닫히는 즉시
+# 행을 내보내고 지나간 엘리먼트는 비운다. 표가 아무리 커도 메모리에는 지금 읽고 있는 행만 남는다.
+# 안쪽 표의 글자는 바깥 셀 문단의 글자로 합쳐진다.
+HWPML_NOTE_TAGS = ("FOOTNOTE", "ENDNOTE")
+
+def iter_hwpml_rows(src, chunk_size=1 << 16, select=None):
+    if src.startswith("<?xml"):
+        src = src[src.index("?>") + 2:]
+    parser = ET.XMLPullParser(events=("start", "end"))
+    table_depth = 0
+    note_depth = 0
+    row = []
+    row_number = 0
+    paragraphs = []
+    for offset in range(0, len(src) + 1, chunk_size):
+        if offset < len(src):
+            parser.feed(src[offset:offset + chunk_size])
+        else:
+            parser.close()
+        for event, elem in parser.read_events():
+            tag = elem.tag
+            if event == "start":
+                if tag in HWPML_NOTE_TAGS:
+                    note_depth += 1
+                elif tag == "TABLE" and not note_depth:
+                    table_depth += 1
+                continue
+
+            if tag in HWPML_NOTE_TAGS:
+                note_depth -= 1
+                elem.clear()
+            elif note_depth:
+                continue
+            elif tag == "TABLE":
+                table_depth -= 1
+                if not table_depth:
+                    elem.clear()
+            elif table_depth != 1:
+                if not table_depth:
+                    elem.clear()
+            elif tag == "P":
+                paragraphs.append(elem)
+            elif tag == "CELL":
+                if select is None or select(row_number, int(elem.get("ColAddr", 0)), int(elem.get("ColSpan", 1))):
+                    row.append(cell_from_element(elem, paragraphs))
+                else:
+                    row.append(skipped_cell(elem))
+                paragraphs = []
+                elem.clear()
+            elif tag == "ROW":
+                yield row
+                row = []
+                row_number += 1
+                elem.clear()
+
+# CHANGELOG V1.1.0: 표 거르기와 열 고르기 (tableFilter 설정)
+#
+# 페이지 조건은 표를 가져오기 전에, 머리 행 정규식과 원본 표의 행·열 수 조건은 행을 읽는 도중에 확인하므로
+# 걸러질 표는 머리 행(또는 조건을 넘긴 행)까지만 읽고 버린다. 고르지 않은 열의 셀은 파서가 글자를 합치지 않고,
+# 남은 열은 왼쪽부터 다시 번호를 매긴다. 여러 열에 걸친 셀은 고른 열이 하나라도 있으면 그 열들만큼 남긴다.
+def parse_number_set(text):
+    numbers = set()
+    for part in re.split(r"[,\s]+", text.strip()):
+        if part:
+            first, _, last = part.partition("-")
+            numbers.update(range(int(first), int(last or first) + 1))
+    return numbers
+
+class TableFilter:
+    def __init__(self, header=None, min_rows=0, max_rows=0, min_cols=0, max_cols=0, pages=None, columns=None):
+        self.header = re.compile(header) if header else None
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.min_cols = min_cols
+        self.max_cols = max_cols
+        self.pages = pages
+        self.columns = sorted(columns) if columns else None
+        self.column_set = set(columns or ())
+
+    @classmethod
+    def from_settings(cls, settings):
+        options = settings.get("tableFilter") or {}
+        table_filter = cls(
+            options.get("header") or None,
+            options.get("minRows", 0),
+            options.get("maxRows", 0),
+            options.get("minCols", 0),
+            options.get("maxCols", 0),
+            parse_number_set(options["pages"]) if options.get("pages") else None,
+            {col - 1 for col in parse_number_set(options["columns"])} if options.get("columns") else None,
+        )
+        return table_filter if table_filter.active() else None
+
+    def active(self):
+        return any((self.header, self.min_rows, self.max_rows, self.min_cols, self.max_cols, self.pages, self.columns))
+
+    def describe(self):
+        return [self.header and self.header.pattern, self.min_rows, self.max_rows, self.min_cols, self.max_cols, sorted(self.pages or ()), self.columns]
+
+    def accepts_page(self, page):
+        return self.pages is None or page in self.pages
+
+    # 파서에 넘길 셀 선택 함수. 머리 행은 정규식에 맞춰 봐야 하므로 전부 읽는다.
+    def cell_selector(self):
+        if self.columns is None:
+            return None
+        def select(row_number, col_addr, col_span):
+            if row_number == 0 and self.header is not None:
+                return True
+            return any(col in self.column_set for col in range(col_addr, col_addr + col_span))
+        return select
+
+    def project(self, row):
+        projected = []
+        for col_addr, col_span, row_span, text_content in row:
+            selected = [col for col in range(col_addr, col_addr + col_span) if col in self.column_set]
+            if selected:
+                projected.append((bisect.bisect_left(self.columns, selected[0]), len(selected), row_span, text_content))
+        return projected
+
+    # 걸러지면 None을, 통과하면 고른 열만 남긴 행 목록을 돌려준다.
+    def apply(self, rows):
+        kept = []
+        n_cols = 0
+        for row in rows:
+            if not kept and self.header is not None and not self.header.search(" ".join(text for _, _, _, texts in row for text in texts)):
+                return None
+            n_cols = max(n_cols, max((col_addr + col_span for col_addr, col_span, _, _ in row), default=0))
+            kept.append(row)
+            if (self.max_cols and n_cols > self.max_cols) or (self.max_rows and len(kept) > self.max_rows):
+                return None
+        if (not kept and self.header is not None) or len(kept) < self.min_rows or n_cols < self.min_cols:
+            return None
+        return [self.project(row) for row in kept] if self.columns else kept
+
+# export_via_xml에서 셀을 바로 엑셀에 쓰던 배치 방식을 그대로 옮긴 것.
+# 문단마다 한 줄씩 아래로 쓰고, 세로 병합될 셀이 있는 행은 줄바꿈 효과를 무력화시켜서 바로 밑 열부터 채운다.
+#
+# CHANGELOG V1.1.0: 배치가 확정된 행부터 (행 번호, {열: 텍스트}, 병합 목록)으로 흘려보낸다.
+# 세로 병합 행은 다음 행이 아래 줄을 덮어쓸 수 있으므로, 현재 행 위치보다 위의 줄만 확정된 것으로 본다.
+def iter_layout_rows(rows):
+    cells = {}
+    merges = {}
+    row_index = 0
+    for row in rows:
+        cells_to_process = []
+        max_row_span = 1
+
+        for col_addr, col_span, row_span, text_content in row:
+            if text_content:
+                cells_to_process.append((col_addr, col_span, text_content))
+                max_row_span = max(max_row_span, row_span)
+
+        if cells_to_process:
+            max_cell_height = max(len(content) for _, _, content in cells_to_process)
+
+            for col_addr, col_span, text_content in cells_to_process:
+                for i, text in enumerate(text_content):
+                    cells.setdefault(row_index + i, {})[col_addr] = text
+                    if col_span > 1:
+                        merges.setdefault(row_index + i, []).append((row_index + i, col_addr, row_index + i, col_addr + col_span - 1))
+
+            if max_row_span > 1:
+                max_cell_height = 1
+
+            row_index += max_cell_height
+
+            for r in sorted(r for r in cells if r < row_index):
+                yield r, cells.pop(r), merges.pop(r, [])
+
+    for r in sorted(cells):
+        yield r, cells.pop(r), merges.pop(r, [])
+
+def layout_table(rows, page=None, ordinal=None):
+    table = Table(page, ordinal)
+    laid_out = list(iter_layout_rows(rows))
+    n_rows = max((r + 1 for r, _, _ in laid_out), default=0)
+    n_cols = max((max(max(cells, default=-1), max((c2 for _, _, _, c2 in merges), default=-1)) + 1 for _, cells, merges in laid_out), default=0)
+    table.rows = [[None] * n_cols for _ in range(n_rows)]
+    for r, cells, merges in laid_out:
+        for col, text in cells.items():
+            table.rows[r][col] = text
+        table.merges.extend(merges)
+    return table
+
+# CHANGELOG V1.1.0: 셀 값 형식 판별
+#
+# 셀마다 float()를 시도하고 예외로 판단하던 것을 미리 컴파일한 정규식 한 번으로 바꾼다. 맞은 이름 있는 그룹이 곧 형식이며
+# (숫자, 천 단위 구분 숫자, 백분율, 대시), 같은 문자열은 다시 판별하지 않도록 결과를 기억해 둔다.
+# 데모 열 판별과 출력할 때 숫자를 문자열이 아닌 숫자로 쓰는 데 함께 쓴다.
+# 기억하는 문자열은 셀 값 자체이므로 maxMemoryMB와 따로 늘지 않도록 최근 것만 적게 남긴다. 반복되는 값("-", 작은 수)은 이것으로 충분하다.
+CELL_CACHE_SIZE = 1 << 12
+CELL_EMPTY, CELL_TEXT, CELL_DASH, CELL_NUMBER, CELL_THOUSANDS, CELL_PERCENT = "empty", "text", "dash", "number", "thousands", "percent"
+NUMERIC_CELL_TYPES = frozenset((CELL_DASH, CELL_NUMBER, CELL_THOUSANDS, CELL_PERCENT))
+CELL_TYPE_PATTERN = re.compile(r"""\s*(?:
+    (?P<dash>-)
+    |(?P<number>[+-]?(?:\d+(?:\.\d*)?|\.\d+))
+    |(?P<thousands>[+-]?\d{1,3}(?:,\d{3})+(?:\.\d*)?)
+    |(?P<percent>[+-]?(?:(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d*)?|\.\d+)%)
+)\s*""", re.X)
+# 0으로 시작하는 코드(007)나 15자리를 넘는 번호는 숫자로 바꾸면 값이 바뀌므로 글자로 남긴다.
+CELL_KEEP_TEXT = re.compile(r"[+-]?0\d|.*\d{16}")
+# xlsx 스타일 번호의 위쪽 비트가 가리키는 표시 형식 (일반, #,##0, #,##0.00, 0%, 0.00%)
+XLSX_NUMBER_FORMATS = (0, 3, 4, 9, 10)
+
+@functools.lru_cache(maxsize=CELL_CACHE_SIZE)
+def cell_type(text):
+    if text is None or not text.strip():
+        return CELL_EMPTY
+    match = CELL_TYPE_PATTERN.fullmatch(text)
+    return match.lastgroup if match else CELL_TEXT
+
+# 숫자로 쓸 수 있는 셀이면 (값, 표시 형식 번호)를, 아니면 None을 돌려준다.
+@functools.lru_cache(maxsize=CELL_CACHE_SIZE)
+def cell_number(text):
+    kind = cell_type(text)
+    if kind not in (CELL_NUMBER, CELL_THOUSANDS, CELL_PERCENT):
+        return None
+    digits = text.strip().replace(",", "").rstrip("%")
+    if CELL_KEEP_TEXT.match(digits):
+        return None
+    decimal = "." in digits
+    value = float(digits) if decimal else int(digits)
+    if kind == CELL_PERCENT:
+        return value / 100, 4 if decimal else 3
+    if kind == CELL_THOUSANDS:
+        return value, 2 if decimal else 1
+    return value, 0
+
+def move_demo_column(table):
+    # 오른쪽 끝의 데모 열을 맨 앞으로 옮기고 나머지 열을 한 칸씩 민다.
+    for row in table.rows:
+        row.insert(0, row.pop())
+
+def column_letter(col):
+    letters = ""
+    while col > 0:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def range_address(r1, c1, r2, c2):
+    return f"{column_letter(c1)}{r1}:{column_letter(c2)}{r2}"
+
+# 엑셀의 Range 주소 문자열은 255자를 넘을 수 없으므로 여러 영역을 쉼표로 이어 붙이되 길이에 맞춰 나눈다.
+def join_addresses(addresses, limit=255):
+    chunk = []
+    length = 0
+    for address in addresses:
+        if chunk and length + len(address) + 1 > limit:
+            yield ",".join(chunk)
+            chunk = []
+            length = 0
+        chunk.append(address)
+        length += len(address) + 1
+    if chunk:
+        yield ",".join(chunk)
+
+XML_ILLEGAL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+SHEET_NAME_ILLEGAL_CHARS = re.compile(r"[\[\]:*?/\\]")
+XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XLSX_PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XLSX_BORDER_LEFT, XLSX_BORDER_RIGHT, XLSX_BORDER_TOP, XLSX_BORDER_BOTTOM = 1, 2, 4, 8
+
+# CHANGELOG V1.1.0: 표 서식(글꼴 크기, 테두리 두께, 행 높이 상한)을 설정에서 읽어 시트마다 한 번에 적용
+#
+# 엑셀(COM)에서는 시트의 테두리 둘 표 영역을 모아 쉼표로 이은 다중 영역 Range에 Borders를 한 번씩만 설정한다.
+# 다중 영역의 바깥 테두리(7~10)는 영역마다 따로 둘러지므로 표마다 그리던 것과 결과가 같다.
+# xlsx에서는 같은 값이 공유 스타일 레코드가 된다.
+BORDER_WEIGHTS = {"hair": 1, "thin": 2, "medium": -4138, "thick": 4}  # 키는 xlsx 테두리 이름, 값은 엑셀 XlBorderWeight
+
+class SheetStyle:
+    def __init__(self, font_size=9, border_weight="thin", row_height_cap=24):
+        if border_weight not in BORDER_WEIGHTS:
+            raise ValueError(f"borderWeight must be one of {', '.join(BORDER_WEIGHTS)} : {border_weight}")
+        self.font_size = font_size
+        self.border_weight = border_weight
+        self.row_height_cap = row_height_cap
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings["fontSize"], settings["borderWeight"], settings["rowHeightCap"])
+
+    # 적용하는 데 쓴 COM 호출 수를 돌려준다.
+    def apply_com(self, ws, bordered):
+        ws.Cells.Font.Size = self.font_size
+        calls = 2
+        for addresses in join_addresses(bordered):
+            region = ws.Range(addresses)
+            for i in range(7, 11):  # 7~10은 왼쪽, 위, 아래, 오른쪽 바깥 테두리
+                border = region.Borders(i)
+                border.LineStyle = 1  # 실선
+                border.Weight = BORDER_WEIGHTS[self.border_weight]
+                border.Color = 0x000000
+                calls += 4
+            calls += 1
+        return calls
+
+# CHANGELOG V1.1.0: 엑셀(COM) 없이 .xlsx 파일을 직접 쓰는 출력 방식 추가
+#
+# 시트는 표 단위로 흘려 쓰고(zip 안에 바로 기록), 공유 문자열과 스타일만 메모리에 모았다가 close에서 마무리한다.
+# 스타일은 바깥 테두리 조합 16가지를 미리 만들어두고, 셀의 스타일 번호가 곧 테두리 비트 조합이 되도록 한다.
+class XlsxWriter:
+    def __init__(self, path, style=None, numbers=True, shared_strings=True):
+        self.path = path
+        self.style = style or SheetStyle()
+        self.numbers = numbers
+        # 공유 문자열 표는 끝까지 메모리에 쌓이므로, 메모리 상한을 넘긴 문서는 문자열을 셀 안에 바로 쓴다.
+        self.shared_strings = shared_strings
+        self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        self.sheet_names = []
+        self.strings = {}
+        self.string_count = 0
+
+    def add_sheet(self, name, tables, gap=2):
+        name = SHEET_NAME_ILLEGAL_CHARS.sub("_", name)[:31] or f"Sheet{len(self.sheet_names) + 1}"
+        self.sheet_names.append(name)
+        merges = []
+        covered = set()
+        with self.zip.open(f"xl/worksheets/sheet{len(self.sheet_names)}.xml", "w") as stream:
+            stream.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<worksheet xmlns="{XLSX_MAIN_NS}"><sheetData>'.encode())
+            row_index = 1
+            for table in tables:
+                for r, row in enumerate(table.rows):
+                    stream.write(self.row_xml(table, r, row, row_index + r).encode())
+                for r1, c1, r2, c2 in table.merges:
+                    area = {(r, c) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1)}
+                    # 겹치는 병합 영역은 엑셀이 파일을 손상된 것으로 보므로 먼저 나온 병합만 남긴다.
+                    if len(area) > 1 and not area & covered:
+                        covered |= area
+                        merges.append(range_address(row_index + r1, c1 + 1, row_index + r2, c2 + 1))
+                covered.clear()
+                row_index += table.n_rows + gap
+            stream.write(b"</sheetData>")
+            if merges:
+                refs = "".join(f'<mergeCell ref="{ref}"/>' for ref in merges)
+                stream.write(f'<mergeCells count="{len(merges)}">{refs}</mergeCells>'.encode())
+            stream.write(b"</worksheet>")
+
+    def row_xml(self, table, r, row, sheet_row):
+        cells = []
+        last_col = len(row) - 1
+        for c, value in enumerate(row):
+            style = 0
+            if table.bordered:
+                style = (
+                    (XLSX_BORDER_LEFT if c == 0 else 0) | (XLSX_BORDER_RIGHT if c == last_col else 0)
+                    | (XLSX_BORDER_TOP if r == 0 else 0) | (XLSX_BORDER_BOTTOM if r == table.n_rows - 1 else 0)
+                )
+            if value is None:
+                if style:
+                    cells.append(f'<c r="{column_letter(c + 1)}{sheet_row}" s="{style}"/>')
+                continue
+            number = cell_number(value) if self.numbers and isinstance(value, str) else None
+            if number is not None:
+                cells.append(f'<c r="{column_letter(c + 1)}{sheet_row}" s="{style | number[1] << 4}"><v>{number[0]!r}</v></c>')
+                continue
+            if not self.shared_strings:
+                cells.append(f'<c r="{column_letter(c + 1)}{sheet_row}" s="{style}" t="inlineStr"><is><t xml:space="preserve">{escape(XML_ILLEGAL_CHARS.sub("", str(value)))}</t></is></c>')
+                continue
+            cells.append(f'<c r="{column_letter(c + 1)}{sheet_row}" s="{style}" t="s"><v>{self.string_index(value)}</v></c>')
+        return f'<row r="{sheet_row}">{"".join(cells)}</row>' if cells else ""
+
+    def string_index(self, value):
+        value = XML_ILLEGAL_CHARS.sub("", str(value))
+        self.string_count += 1
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def close(self):
+        if not self.sheet_names:
+            self.add_sheet("Sheet1", [])
+        sheets = "".join(
+            f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+            for i, name in enumerate(self.sheet_names, start=1)
+        )
+        self.write_part("xl/workbook.xml", f'<workbook xmlns="{XLSX_MAIN_NS}" xmlns:r="{XLSX_REL_NS}"><sheets>{sheets}</sheets></workbook>')
+
+        n = len(self.sheet_names)
+        relations = "".join(
+            f'<Relationship Id="rId{i}" Type="{XLSX_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, n + 1)
+        )
+        relations += f'<Relationship Id="rId{n + 1}" Type="{XLSX_REL_NS}/styles" Target="styles.xml"/>'
+        relations += f'<Relationship Id="rId{n + 2}" Type="{XLSX_REL_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+        self.write_part("xl/_rels/workbook.xml.rels", f'<Relationships xmlns="{XLSX_PACKAGE_REL_NS}">{relations}</Relationships>')
+        self.write_part("_rels/.rels", (
+            f'<Relationships xmlns="{XLSX_PACKAGE_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{XLSX_REL_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+        ))
+
+        with self.zip.open("xl/sharedStrings.xml", "w") as stream:
+            stream.write(f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<sst xmlns="{XLSX_MAIN_NS}" count="{self.string_count}" uniqueCount="{len(self.strings)}">'.encode())
+            for value in self.strings:
+                stream.write(f'<si><t xml:space="preserve">{escape(value)}</t></si>'.encode())
+            stream.write(b"</sst>")
+
+        self.write_part("xl/styles.xml", self.styles_xml())
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, n + 1)
+        )
+        self.write_part("[Content_Types].xml", (
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            f'{overrides}</Types>'
+        ))
+        self.zip.close()
+
+    def write_part(self, name, xml):
+        self.zip.writestr(name, '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n' + xml)
+
+    def styles_xml(self):
+        def edge(tag, enabled):
+            return f'<{tag} style="{self.style.border_weight}"><color rgb="FF000000"/></{tag}>' if enabled else f"<{tag}/>"
+        borders = "".join(
+            "<border>"
+            + edge("left", bits & XLSX_BORDER_LEFT) + edge("right", bits & XLSX_BORDER_RIGHT)
+            + edge("top", bits & XLSX_BORDER_TOP) + edge("bottom", bits & XLSX_BORDER_BOTTOM)
+            + "<diagonal/></border>"
+            for bits in range(16)
+        )
+        xfs = "".join(
+            f'<xf numFmtId="{number_format}" fontId="0" fillId="0" borderId="{bits}" xfId="0" applyBorder="1" applyNumberFormat="{int(number_format > 0)}"/>'
+            for number_format in XLSX_NUMBER_FORMATS for bits in range(16)
+        )
+        return (
+            f'<styleSheet xmlns="{XLSX_MAIN_NS}">'
+            f'<fonts count="1"><font><sz val="{self.style.font_size}"/><name val="맑은 고딕"/><family val="2"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+            f'<borders count="16">{borders}</borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            f'<cellXfs count="{16 * len(XLSX_NUMBER_FORMATS)}">{xfs}</cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            '</styleSheet>'
+        )
+
+# CHANGELOG V1.1.0: 이미 저장된 통합 문서를 다시 정리하기 (rearrange 명령)
+#
+# 예전처럼 행마다 Cells(row, col).Value를 읽어 빈 줄을 찾고 Rows.Delete/Insert로 시트를 밀어내지 않는다.
+# 시트마다 값을 한 번에 읽어 행 점유 비트맵을 만들고, 빈 줄로 나뉜 구간을 표로 되살린 뒤 데모 이동과 시트 분리를
+# 메모리에서 정하고 시트를 한 번에 다시 쓴다. 표 사이 공백은 다시 쓸 때 두 줄로 맞춰진다.
+# 표 안에 완전히 빈 행이 있으면 그 자리에서 표가 나뉜다.
+def cell_text(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+# 엑셀이 숫자로 저장한 셀을 표시 형식에 맞춰 추출할 때의 글자(1,234, 5.5%)로 되돌린다. 다시 쓸 때 cell_number가
+# 같은 값과 같은 표시 형식을 고르므로 재배치해도 천 단위 구분과 백분율이 유지된다. 되돌릴 수 없는 형식은 숫자 그대로 둔다.
+XLSX_FORMAT_CODES = {3: "#,##0", 4: "#,##0.00", 9: "0%", 10: "0.00%"}
+XLSX_TEXT_FORMATS = {"#,##0": (CELL_THOUSANDS, False), "#,##0.00": (CELL_THOUSANDS, True), "0%": (CELL_PERCENT, False), "0.00%": (CELL_PERCENT, True)}
+
+def number_text(value, number_format):
+    kind, decimal = XLSX_TEXT_FORMATS.get(number_format, (None, False))
+    if kind is None:
+        return cell_text(value)
+    scale, suffix, separator = (100, "%", "") if kind == CELL_PERCENT else (1, "", ",")
+    # 값이 바뀌지 않는 가장 짧은 자릿수로 쓴다. 소수 형식이면 소수점을 남겨 두 자리 형식으로 돌아오게 한다.
+    for digits in range(int(decimal), 18):
+        text = f"{value * scale:{separator}.{digits}f}"
+        if float(text.replace(",", "")) / scale == value:
+            number = cell_number(text + suffix)
+            return text + suffix if number is not None and number[0] == value else cell_text(value)
+    return cell_text(value)
+
+def row_occupancy(values):
+    return bytearray(any(value is not None and value != "" for value in row) for row in values)
+
+def check_not_rearranged(sheet_names, path, force=False):
+    if not force and "Sheet1 (2)" in sheet_names:
+        raise ValueError(f"{path} already has a split first sheet (Sheet1 (2)); use --force to rearrange it again")
+
+def tables_from_values(values):
+    occupied = row_occupancy(values)
+    tables = []
+    start = occupied.find(1)
+    while start >= 0:
+        end = occupied.find(0, start)
+        if end < 0:
+            end = len(occupied)
+        table = Table()
+        table.rows = [[cell_text(value) for value in row] for row in values[start:end]]
+        width = max(max((c + 1 for c, value in enumerate(row) if value is not None), default=0) for row in table.rows)
+        table.rows = [row[:width] + [None] * (width - len(row)) for row in table.rows]
+        tables.append(table)
+        start = occupied.find(1, end)
+    return tables
+
+def column_index(ref):
+    col = 0
+    for char in ref:
+        if not char.isalpha():
+            break
+        col = col * 26 + ord(char.upper()) - 64
+    return col - 1
+
+# 엑셀 없이 .xlsx의 값만 읽는다. 테두리와 병합은 재배치에서 어차피 다시 정하므로 읽지 않고,
+# 숫자 셀의 표시 형식만 스타일에서 찾아 number_text로 글자에 담는다.
+def read_xlsx_values(path):
+    def tag(name):
+        return f"{{{XLSX_MAIN_NS}}}{name}"
+
+    sheets = []
+    with zipfile.ZipFile(path) as archive:
+        number_formats = []
+        if "xl/styles.xml" in archive.namelist():
+            styles = ET.fromstring(archive.read("xl/styles.xml"))
+            codes = dict(XLSX_FORMAT_CODES)
+            codes.update((int(fmt.get("numFmtId")), fmt.get("formatCode")) for fmt in styles.iter(tag("numFmt")))
+            cell_xfs = styles.find(tag("cellXfs"))
+            if cell_xfs is not None:
+                number_formats = [codes.get(int(xf.get("numFmtId", 0))) for xf in cell_xfs.iter(tag("xf"))]
+        strings = []
+        if "xl/sharedStrings.xml" in archive.namelist():
+            with archive.open("xl/sharedStrings.xml") as stream:
+                for _, elem in ET.iterparse(stream):
+                    if elem.tag == tag("si"):
+                        strings.append("".join(t.text or "" for t in elem.iter(tag("t"))))
+                        elem.clear()
+        targets = {
+            rel.get("Id"): rel.get("Target")
+            for rel in ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        }
+        workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+        for sheet in workbook.iter(tag("sheet")):
+            target = targets[sheet.get(f"{{{XLSX_REL_NS}}}id")].lstrip("/")
+            rows = {}
+            with archive.open(target if target.startswith("xl/") else "xl/" + target) as stream:
+                for _, elem in ET.iterparse(stream):
+                    if elem.tag != tag("c"):
+                        continue
+                    kind = elem.get("t")
+                    if kind == "inlineStr":
+                        value = "".join(t.text or "" for t in elem.iter(tag("t")))
+                    else:
+                        v = elem.find(tag("v"))
+                        value = None if v is None else v.text
+                        if value is not None and kind == "s":
+                            value = strings[int(value)]
+                        elif value is not None and kind in (None, "n"):
+                            style = int(elem.get("s", 0))
+                            value = number_text(float(value), number_formats[style] if style < len(number_formats) else None)
+                    ref = elem.get("r")
+                    row = int(ref.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")) - 1
+                    rows.setdefault(row, {})[column_index(ref)] = value
+                    elem.clear()
+            width = max((max(cells) + 1 for cells in rows.values()), default=0)
+            values = [[None] * width for _ in range(max(rows, default=-1) + 1)]
+            for r, cells in rows.items():
+                for c, value in cells.items():
+                    values[r][c] = value
+            sheets.append((sheet.get("name"), values))
+    return sheets
+
+# CHANGELOG V1.1.0: 엑셀 서식 없이 표 데이터만 필요한 경우를 위한 스트리밍 출력(CSV/JSONL/Parquet)
+#
+# 싱크는 표마다 (페이지, 표 순번)과 배치가 확정된 행을 받아 바로 쓰므로 메모리에는 표 하나 분량만 남는다.
+# 표 재배치(데모 열 이동, 시트 분리)는 엑셀 출력에만 해당하므로 여기에는 원래 배치를 그대로 남긴다.
+#
+# 텍스트 싱크는 이어쓰기를 지원한다. 체크포인트에 표마다 파일 위치를 남기고, 다시 열 때 그 위치 뒤를 잘라낸다.
+class TextSink:
+    resumable = True
+
+    def __init__(self, path, offset=None):
+        if offset is None:
+            self.file = open(path, "w", encoding="utf-8", newline="")
+        else:
+            self.file = open(path, "r+", encoding="utf-8", newline="")
+            self.file.truncate(offset)
+            self.file.seek(offset)
+
+    def tell(self):
+        self.file.flush()
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+class CsvSink(TextSink):
+    extension = ".csv"
+
+    def __init__(self, path, offset=None):
+        super().__init__(path, offset)
+        self.writer = csv.writer(self.file)
+        if offset is None:
+            self.writer.writerow(("page", "table", "row", "col", "value"))
+
+    def write_table(self, page, ordinal, rows):
+        for r, cells, _ in rows:
+            self.writer.writerows((page, ordinal, r, c, cells[c]) for c in sorted(cells))
+
+class JsonlSink(TextSink):
+    extension = ".jsonl"
+
+    def write_table(self, page, ordinal, rows):
+        for r, cells, _ in rows:
+            values = [None] * (max(cells) + 1)
+            for c, text in cells.items():
+                values[c] = text
+            self.file.write(json.dumps({"page": page, "table": ordinal, "row": r, "values": values}, ensure_ascii=False) + "\n")
+
+class ParquetSink:
+    extension = ".parquet"
+    # 닫지 않은 Parquet 파일에는 이어서 쓸 수 없다.
+    resumable = False
+
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("parquet output needs pyarrow (pip install pyarrow)")
+        self.pa = pyarrow
+        self.schema = pyarrow.schema([
+            ("page", pyarrow.int32()),
+            ("table", pyarrow.int32()),
+            ("row", pyarrow.int32()),
+            ("col", pyarrow.int32()),
+            ("value", pyarrow.string()),
+        ])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write_table(self, page, ordinal, rows):
+        # 표 하나가 행 그룹 하나가 되도록 표 단위로 모아서 쓴다.
+        columns = {"page": [], "table": [], "row": [], "col": [], "value": []}
+        for r, cells, _ in rows:
+            for c in sorted(cells):
+                columns["page"].append(page)
+                columns["table"].append(ordinal)
+                columns["row"].append(r)
+                columns["col"].append(c)
+                columns["value"].append(cells[c])
+        if columns["value"]:
+            self.writer.write_table(self.pa.table(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+SINKS = {"csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+OUTPUTS = ("excel", "xlsx", *SINKS)
+
+def table_layout_rows(table):
+    for r, row in enumerate(table.rows):
+        cells = {c: text for c, text in enumerate(row) if text is not None}
+        if cells:
+            yield r, cells, []
+
+# CHANGELOG V1.1.0: 증분 추출
+#
+# 표마다 지문(공백을 정리한 셀 텍스트 + 위치 + 병합)을 남기고, 문서 경로별로 마지막 실행의 목록(매니페스트)과 표 내용을
+# data/manifests에 둔다. 다음 실행에서는 이전 목록과 지문 순서를 맞춰 보아 추가/변경/삭제/이동된 표를 보고서로 남긴다.
+# 한글(COM)로 추출할 때는 먼저 직접 읽기 백엔드로 문서 전체의 지문을 빠르게 만들어 두고(prescan),
+# 이전 실행과 지문이 같은 표는 GetTextFile 없이 이전 내용을 그대로 쓴다. 직접 읽기 백엔드는 원래 빠르므로 보고서만 만든다.
+# 매니페스트의 표 내용은 거르기 조건(머리 행, 행/열 수, 열 선택)을 거친 결과이므로 조건이 같을 때만 다시 쓴다.
+def table_fingerprint(table):
+    digest = hashlib.sha1()
+    for r, row in enumerate(table.rows):
+        for c, text in enumerate(row):
+            if text is not None:
+                digest.update(f"{r},{c}:{' '.join(str(text).split())}\x1e".encode())
+    for merge in sorted(table.merges):
+        digest.update(f"{merge}".encode())
+    return digest.hexdigest()
+
+class RunManifest:
+    def __init__(self, document, digest=None, entries=None, contents=None, table_filter=None):
+        self.document = document
+        self.digest = digest
+        self.table_filter = table_filter
+        self.entries = entries or []
+        self.contents = contents or {}
+        self.by_prescan = {entry["prescan"]: entry for entry in self.entries if entry.get("prescan")}
+
+    @staticmethod
+    def path(document):
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(document)).encode()).hexdigest()
+        return os.path.join(MANIFEST_DIR, f"{key}.json.gz")
+
+    def add(self, table, prescan=None):
+        fingerprint = table_fingerprint(table)
+        self.entries.append({"ordinal": table.ordinal, "page": table.page, "fingerprint": fingerprint, "prescan": prescan})
+        if fingerprint not in self.contents:
+            data = table.to_dict()
+            self.contents[fingerprint] = {"rows": data["rows"], "merges": data["merges"]}
+
+    def table(self, entry, page, ordinal):
+        table = Table.from_dict({"page": page, "ordinal": ordinal, **self.contents[entry["fingerprint"]]})
+        return table
+
+    @classmethod
+    def load(cls, document):
+        path = cls.path(document)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, EOFError, ValueError) as e:
+            logging.warning(f"previous manifest ignored ({document}) : {e}")
+            return None
+        return cls(data["document"], data["digest"], data["tables"], data["contents"], data.get("filter"))
+
+    def save(self):
+        os.makedirs(MANIFEST_DIR, exist_ok=True)
+        path = self.path(self.document)
+        with replace_file(path) as raw, gzip.open(raw, "wt", encoding="utf-8") as file:
+            json.dump({"version": VERSION, "document": self.document, "digest": self.digest, "filter": self.table_filter, "tables": self.entries, "contents": self.contents}, file, ensure_ascii=False, separators=(",", ":"))
+
+    def compare(self, previous, ranges):
+        # 이번에 추출한 범위 안의 표끼리만 비교한다.
+        old = [entry for entry in previous.entries if any(first <= entry["page"] <= last for first, last in ranges)]
+        new = self.entries
+        changes = []
+        matcher = difflib.SequenceMatcher(None, [entry["fingerprint"] for entry in old], [entry["fingerprint"] for entry in new], autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            for k in range(max(i2 - i1, j2 - j1)):
+                before = old[i1 + k] if i1 + k < i2 else None
+                after = new[j1 + k] if j1 + k < j2 else None
+                if tag == "equal":
+                    status = "unchanged" if before["page"] == after["page"] else "moved"
+                elif before and after:
+                    status = "changed"
+                else:
+                    status = "added" if after else "removed"
+                changes.append({
+                    "status": status,
+                    "ordinal": after and after["ordinal"],
+                    "page": after and after["page"],
+                    "previous_ordinal": before and before["ordinal"],
+                    "previous_page": before and before["page"],
+                })
+        summary = {status: sum(change["status"] == status for change in changes) for status in ("unchanged", "moved", "changed", "added", "removed")}
+        return {"document": self.document, "previous_digest": previous.digest, "digest": self.digest, "summary": summary, "tables": changes}
+
+# CHANGELOG V1.1.0: 체크포인트와 이어서 추출하기
+#
+# 표를 하나 끝낼 때마다 (범위 번호, 시트, 표 순번, 앵커, 현재 페이지, row_index, 표 내용 또는 출력 파일 위치)를
+# data/checkpoints의 JSON 줄 파일에 덧붙인다. 같은 문서·범위·출력 방식·출력 경로로 다시 실행하면 끝난 표는 체크포인트에서
+# 되살리고 마지막 표 다음부터 같은 출력 파일에 이어서 추출한다. 정상적으로 끝나면 체크포인트를 지운다.
+#
+# 체크포인트는 옆의 .lock 파일을 잠근 작업만 쓴다. 같은 체크포인트를 다른 작업(배치 작업자, 서비스 스레드)이 쓰고 있으면
+# 그 기록을 가져가거나 지우지 않도록 이번 실행은 체크포인트 없이 추출한다.
+#
+# 불러올 때는 범위마다 (첫 기록 위치, 표 수, 마지막 기록)만 기억하고, 표 내용은 범위를 되살릴 때 파일에서 한 줄씩 읽어
+# 시트에 넘기므로 이미 추출한 표가 많아도 maxMemoryMB 상한 안에서 되살린다.
+class Checkpoint:
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.ranges = {}
+        self.last = None
+        self.count = 0
+        self.end = 0
+        self.done_ranges = set()
+        self.file = None
+        self.lock = None
+
+    # target은 요청한 출력 경로(export_path/filename)다. 다른 작업이 쓰고 있으면 None을 돌려준다.
+    @classmethod
+    def load(cls, digest, range_list, output, target, table_filter=None):
+        target = os.path.normcase(os.path.abspath(target))
+        key = hashlib.sha1(json.dumps([digest, list(range_list), output, target] + ([table_filter] if table_filter else [])).encode()).hexdigest()
+        checkpoint = cls(os.path.join(CHECKPOINT_DIR, f"{key}.jsonl"))
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        checkpoint.lock = lock_file(checkpoint.path + ".lock")
+        if checkpoint.lock is None:
+            logging.warning(f"checkpoint is in use by another job; extracting without it : {checkpoint.path}")
+            return None
+        if not os.path.exists(checkpoint.path):
+            return checkpoint
+        with open(checkpoint.path, "rb") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 기록 도중에 끊긴 마지막 줄은 버린다.
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                if "header" in record:
+                    checkpoint.header = record["header"]
+                elif "range_done" in record:
+                    checkpoint.done_ranges.add(record["range_done"])
+                else:
+                    record.pop("table", None)
+                    first, count, _ = checkpoint.ranges.get(record["range_index"], (checkpoint.end, 0, None))
+                    checkpoint.ranges[record["range_index"]] = (first, count + 1, record)
+                    checkpoint.last = record
+                    checkpoint.count += 1
+                checkpoint.end += len(line)
+        return checkpoint
+
+    # 불러온 범위의 기록을 표 내용과 함께 파일에서 차례로 읽는다.
+    def records_of(self, range_index):
+        if range_index not in self.ranges:
+            return
+        first, count, _ = self.ranges[range_index]
+        with open(self.path, "rb") as file:
+            file.seek(first)
+            for line in file:
+                if count == 0:
+                    break
+                record = json.loads(line)
+                if record.get("range_index") == range_index and "range_done" not in record:
+                    count -= 1
+                    yield record
+
+    def start(self, header):
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        if self.header is None:
+            self.file = open(self.path, "w", encoding="utf-8")
+            self.header = header
+            self.write({"header": header})
+        else:
+            # 끊긴 마지막 줄 뒤에 덧붙이면 다음에 불러올 때 그 뒤의 기록을 모두 잃으므로 먼저 잘라 낸다.
+            with open(self.path, "r+b") as file:
+                file.truncate(self.end)
+            self.file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.file.flush()
+
+    def finish_range(self, range_index):
+        self.done_ranges.add(range_index)
+        self.write({"range_done": range_index})
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+        if self.lock:
+            unlock_file(self.lock)
+            self.lock = None
+
+    # 잠금은 그대로 쥔 채 기록만 지우고 처음부터 다시 쓴다.
+    def discard(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.header = None
+        self.ranges = {}
+        self.last = None
+        self.count = 0
+        self.end = 0
+        self.done_ranges = set()
+
+    def delete(self):
+        self.discard()
+        if self.lock:
+            # 잠금 파일은 잠근 채 지운다. 그 사이에 열어 둔 다른 작업은 lock_file에서 지워진 파일임을 알고 다시 연다.
+            # 윈도우에서는 다른 작업이 열어 둔 파일을 지울 수 없으므로 남겨 둔다.
+            with contextlib.suppress(OSError):
+                os.remove(self.lock.name)
+        self.close()
+
+# 다른 프로세스나 스레드가 잠근 파일이면 None을 돌려준다.
+def lock_file(path):
+    while True:
+        file = open(path, "a+b")
+        try:
+            if sys.platform == "win32":
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                # 잠그기 전에 잠금을 쥔 작업이 파일을 지웠으면 새로 만든 파일을 다시 잠근다.
+                if not os.path.exists(path) or not os.path.samestat(os.fstat(file.fileno()), os.stat(path)):
+                    file.close()
+                    continue
+        except OSError:
+            file.close()
+            return None
+        return file
+
+def unlock_file(file):
+    try:
+        if sys.platform == "win32":
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+    except OSError:
+        pass
+    file.close()
+
+# 같은 파일을 동시에 저장하는 작업끼리 임시 파일 이름이 겹치지 않도록 각자 고유한 임시 파일에 쓰고 바꿔 넣는다.
+@contextlib.contextmanager
+def replace_file(path):
+    handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(handle, "wb") as file:
+            yield file
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# CHANGELOG V1.1.0: 표 컨트롤 -> 페이지 색인
+#
+# 문서를 열 때 컨트롤 목록을 한 번만 훑어 표마다 (컨트롤 순번, 페이지, 앵커 위치)를 기록해 두고,
+# 시작 페이지는 이 색인에서 이분 탐색으로 찾는다. 색인은 문서 내용의 해시를 이름으로 data/page_index에 저장되어
+# 같은 문서를 다른 범위로 다시 추출할 때는 훑는 과정 없이 바로 불러온다.
+#
+# 직접 읽기 백엔드는 build_native로 TABLE을 만들지 않고 PageResolver의 페이지만 모아 같은 색인을 만든다. 이때 순번은
+# 표 순번이고, sections에 구역마다 (첫 표 순번, 시작 페이지)를 남겨 범위의 첫 표가 있는 구역부터 바로 읽을 수 있게 한다.
+class PageIndex:
+    def __init__(self, entries, sections=None):
+        self.entries = entries
+        self.pages = [page for _, page, _ in entries]
+        self.sections = sections or []
+
+    def first_table_from(self, page):
+        index = bisect.bisect_left(self.pages, page)
+        return index if index < len(self.entries) else None
+
+    # 직접 읽기 reader.iter_tables에 넘길 (구역, 첫 표 순번, 시작 페이지)
+    def section_start(self, ordinal):
+        section = bisect.bisect_right([first for first, _ in self.sections], ordinal) - 1
+        if section < 0:
+            return 0, 0, 1
+        return (section,) + tuple(self.sections[section])
+
+    @classmethod
+    def build_native(cls, reader):
+        pages = [page for page, _ in reader.iter_tables(wanted=lambda ordinal, page: False)]
+        return cls([(ordinal, page, ()) for ordinal, page in enumerate(pages)], reader.section_starts)
+
+    @classmethod
+    def build(cls, hwp):
+        entries = []
+        ctrl = hwp.HeadCtrl
+        ordinal = 0
+        while ctrl is not None:
+            if ctrl.CtrlID == "tbl":
+                anchor = ctrl.GetAnchorPos(0)
+                hwp.SetPosBySet(anchor)
+                entries.append((ordinal, hwp.current_page, (anchor.Item("List"), anchor.Item("Para"), anchor.Item("Pos"))))
+            ctrl = ctrl.Next
+            ordinal += 1
+        # 앵커 순서와 페이지 순서가 어긋나는 문서(떠 있는 개체 등)도 이분 탐색이 가능하도록 페이지는 앞쪽 최대값으로 맞춘다.
+        last_page = 1
+        for i, (ordinal, page, anchor) in enumerate(entries):
+            last_page = max(last_page, page)
+            entries[i] = (ordinal, last_page, anchor)
+        return cls(entries)
+
+    @staticmethod
+    def path(digest, kind="com"):
+        return os.path.join(PAGE_INDEX_DIR, f"{digest}.json" if kind == "com" else f"{digest}.{kind}.json")
+
+    @classmethod
+    def load(cls, digest, kind="com"):
+        path = cls.path(digest, kind)
+        if not os.path.exists(path):
+            return None
+        # 깨졌거나 다른 버전이 만든 인덱스는 없는 것으로 보고 다시 만든다.
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") != VERSION:
+                return None
+            return cls([(ordinal, page, tuple(anchor)) for ordinal, page, anchor in data["entries"]], data.get("sections"))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"page index ignored ({os.path.basename(path)}) : {e}")
+            return None
+
+    def save(self, digest, kind="com"):
+        os.makedirs(PAGE_INDEX_DIR, exist_ok=True)
+        # 같은 문서를 동시에 색인하는 작업자끼리 서로의 파일을 덮어쓰다 잘리지 않도록 각자 임시 파일에 쓰고 바꿔 넣는다.
+        with replace_file(self.path(digest, kind)) as file:
+            file.write(json.dumps({"version": VERSION, "entries": self.entries, "sections": self.sections}).encode("utf-8"))
+
+# CHANGELOG V1.1.0: 문서별 표 캐시
+#
+# 한 번 추출한 표는 문서 해시를 이름으로 data/table_cache에 gzip JSON 줄 형식으로 저장한다. 첫 줄은 표를 빠짐없이 담고 있는
+# 페이지 구간 목록이고, 이후 한 줄에 표 하나(순번, 페이지, 행, 병합)이다. 요청한 범위가 모두 이 구간 안에 있으면
+# 한글을 열지 않고 캐시에서 바로 시트를 만든다. 전체 크기가 cacheMaxMB를 넘으면 가장 오래 쓰지 않은 문서부터 지운다.
+#
+# 불러올 때는 구간 목록만 읽고 파일이 온전한지만 확인한다. 표는 범위를 그릴 때 파일에서 한 줄씩 읽고, 저장할 때도 이전 파일과
+# 이번에 추가한 표를 순번 순서로 섞어 쓰므로 캐시가 커도 문서 전체의 표를 메모리에 올리지 않는다.
+TABLE_CACHE_FORMAT = 1
+
+class TableCache:
+    def __init__(self, digest, coverage=None, stored=False):
+        self.digest = digest
+        self.coverage = coverage or []
+        self.stored = stored
+        self.stored_coverage = list(self.coverage)
+        self.tables = {}
+        self.dirty = False
+        self.frozen = False
+
+    @staticmethod
+    def path(digest):
+        return os.path.join(TABLE_CACHE_DIR, f"{digest}.jsonl.gz")
+
+    def covers(self, start, end):
+        return any(first <= start and end <= last for first, last in self.coverage)
+
+    def cover(self, start, end):
+        if self.frozen:
+            return
+        # 페이지는 정수이므로 맞닿은 구간(1~3, 4~10)도 하나로 합친다.
+        merged = []
+        for first, last in sorted(self.coverage + [[start, end]]):
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], last)
+            else:
+                merged.append([first, last])
+        self.coverage = merged
+        self.dirty = True
+
+    def add(self, table):
+        if self.frozen:
+            return
+        # 재배치 과정에서 표가 바뀌므로 쓰는 시점의 내용을 따로 떠 둔다.
+        self.tables[table.ordinal] = table.to_dict()
+        self.dirty = True
+
+    # 이번 실행에서 추가한 표는 메모리에만 있으므로 상한을 넘기면 버리고, 저장된 캐시는 읽기에만 쓴다.
+    def freeze(self):
+        self.frozen = True
+        self.tables = {}
+        self.coverage = list(self.stored_coverage)
+        self.dirty = False
+
+    # 저장된 표와 이번에 추가한 표를 순번 순서로 (순번, 표 dict)로 돌려준다. 같은 순번이면 이번에 추가한 표를 쓴다.
+    def iter_records(self):
+        added = sorted(self.tables.items())
+        if self.stored:
+            with gzip.open(self.path(self.digest), "rt", encoding="utf-8") as file:
+                file.readline()
+                stored = ((data["ordinal"], data) for data in map(json.loads, file) if data["ordinal"] not in self.tables)
+                yield from heapq.merge(stored, added, key=lambda record: record[0])
+        else:
+            yield from added
+
+    def tables_between(self, start, end):
+        for _, data in self.iter_records():
+            if start <= data["page"] <= end:
+                yield Table.from_dict(data)
+
+    @classmethod
+    def load(cls, digest):
+        path = cls.path(digest)
+        if not os.path.exists(path):
+            return cls(digest)
+        try:
+            with gzip.open(path, "rb") as file:
+                header = json.loads(file.readline())
+                if header.get("format") != TABLE_CACHE_FORMAT:
+                    return cls(digest)
+                # 끝까지 풀어 보아 잘린 파일(CRC 오류)은 여기서 걸러 낸다.
+                while file.read(1 << 16):
+                    pass
+        except (OSError, EOFError, ValueError) as e:
+            logging.warning(f"table cache ignored ({digest}) : {e}")
+            return cls(digest)
+        os.utime(path)
+        return cls(digest, header["coverage"], stored=True)
+
+    def save(self, max_bytes):
+        if not self.dirty:
+            return
+        os.makedirs(TABLE_CACHE_DIR, exist_ok=True)
+        path = self.path(self.digest)
+        with replace_file(path) as raw, gzip.open(raw, "wt", encoding="utf-8", compresslevel=6) as file:
+            file.write(json.dumps({"format": TABLE_CACHE_FORMAT, "version": VERSION, "coverage": self.coverage}) + "\n")
+            for _, data in self.iter_records():
+                file.write(json.dumps(data, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.stored = True
+        self.stored_coverage = list(self.coverage)
+        self.tables = {}
+        self.dirty = False
+        self.evict(max_bytes, keep=path)
+
+    @staticmethod
+    def evict(max_bytes, keep=None):
+        if not os.path.isdir(TABLE_CACHE_DIR):
+            return
+        entries = []
+        for name in os.listdir(TABLE_CACHE_DIR):
+            # 다른 작업이 아직 쓰고 있는 임시 파일과 그 사이 다른 작업이 지운 파일은 건너뛴다.
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(TABLE_CACHE_DIR, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            if path == keep:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+            logging.info(f"table cache evicted : {os.path.basename(path)}")
+
+    @staticmethod
+    def clear(digest=None):
+        if digest is not None:
+            paths = [TableCache.path(digest)]
+        elif os.path.isdir(TABLE_CACHE_DIR):
+            paths = [os.path.join(TABLE_CACHE_DIR, name) for name in os.listdir(TABLE_CACHE_DIR)]
+        else:
+            paths = []
+        removed = 0
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+                removed += 1
+        logging.info(f"table cache cleared : {removed} files")
+        return removed
+
+# CHANGELOG V1.1.0: 단계별 소요 시간 추적
+#
+# 문서 열기, 시작 페이지 이동, GetTextFile, 파싱, 셀 쓰기, 병합, 재배치, 저장 등을 구간(span)으로 재서
+# chrome://tracing 이나 Perfetto에서 열 수 있는 JSON(Trace Event Format)으로 로그 옆에 남긴다. 구간마다 페이지와 표 순번을 붙인다.
+# 구간은 표마다 생기므로 끝나는 대로 임시 파일에 한 줄씩 써 두고, 저장할 때 이어 붙인다.
+class Tracer:
+    def __init__(self, path=None, name=""):
+        self.path = path
+        self.name = name
+        self.file = None
+        self.count = 0
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter_ns()
+
+    @contextlib.contextmanager
+    def span(self, name, **args):
+        if self.path is None:
+            yield
+            return
+        started = time.perf_counter_ns()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = repr(e)
+            raise
+        finally:
+            self.write({
+                "name": name,
+                "ph": "X",
+                "ts": (started - self.origin) / 1000,
+                "dur": (time.perf_counter_ns() - started) / 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            })
+
+    def write(self, event):
+        line = json.dumps(event, ensure_ascii=False)
+        # 파이프라인의 단계 스레드들도 구간을 남긴다.
+        with self.lock:
+            if self.file is None:
+                self.file = tempfile.TemporaryFile("w+", encoding="utf-8", dir=DATA_DIR if os.path.isdir(DATA_DIR) else None)
+            self.file.write(line + "\n")
+            self.count += 1
+
+    def save(self):
+        if self.path is None:
+            return
+        metadata = {"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": self.name}}
+        with self.lock, open(self.path, "w", encoding="utf-8") as file:
+            file.write('{"traceEvents": [' + json.dumps(metadata, ensure_ascii=False))
+            if self.file is not None:
+                self.file.seek(0)
+                for line in self.file:
+                    file.write("," + line.rstrip("\n"))
+                self.file.close()
+                self.file = None
+            file.write('], "displayTimeUnit": "ms"}')
+        logging.info(f"trace saved : {self.path} ({self.count} spans)")
+
+# CHANGELOG V1.1.0: 표 가져오기 → 해석 → 쓰기를 크기가 정해진 큐로 이은 파이프라인 (pipelineDepth 설정)
+#
+# 한글 COM 객체는 만든 스레드에서만 불러야 하므로 가져오기는 put()을 부르는 스레드가 맡고, 뒤 단계는 단계마다 스레드 하나가 맡는다.
+# 단계마다 스레드가 하나라서 표 순서는 그대로이고, 큐가 차면 앞 단계가 기다리므로 단계 사이에 떠 있는 표는 depth개를 넘지 않는다.
+# 한 단계에서 예외가 나면 그 단계와 앞 단계는 뒤 표를 버리고 error에 남긴다. 뒷 단계는 이미 받은 앞 표를 마저 처리하므로
+# 체크포인트에는 실패한 표 바로 앞까지 남는다. close()는 남은 표를 모두 처리한 뒤 스레드를 거둔다.
+# depth가 0이면 스레드 없이 put()에서 바로 모든 단계를 처리한다.
+class Pipeline:
+    STOP = object()
+
+    def __init__(self, source, stages, depth=4):
+        self.names = [source] + [name for name, _ in stages]
+        self.stages = [stage for _, stage in stages]
+        self.busy = [0.0] * len(stages)
+        self.blocked = 0.0
+        self.lock = threading.Lock()
+        self.count = 0
+        self.error = None
+        self.failed_stage = None
+        self.elapsed = None
+        self.started = time.perf_counter()
+        self.queues = [queue.Queue(depth) for _ in stages] if depth > 0 else []
+        self.threads = [
+            threading.Thread(target=self.work, args=(i,), name=f"pipeline-{name}", daemon=True)
+            for i, (name, _) in enumerate(stages)
+        ] if depth > 0 else []
+        for thread in self.threads:
+            thread.start()
+
+    def run_stage(self, i, item):
+        started = time.perf_counter()
+        try:
+            return self.stages[i](item)
+        finally:
+            self.busy[i] += time.perf_counter() - started
+
+    def work(self, i):
+        inbox = self.queues[i]
+        outbox = self.queues[i + 1] if i + 1 < len(self.queues) else None
+        while True:
+            item = inbox.get()
+            if item is Pipeline.STOP:
+                if outbox is not None:
+                    outbox.put(item)
+                return
+            if self.failed_stage is not None and self.failed_stage >= i:
+                continue
+            try:
+                item = self.run_stage(i, item)
+            except Exception as e:
+                self.fail(i, e)
+                continue
+            if outbox is not None:
+                outbox.put(item)
+
+    def fail(self, i, error):
+        with self.lock:
+            if self.failed_stage is None or i < self.failed_stage:
+                self.failed_stage = i
+            if self.error is None:
+                self.error = error
+
+    def put(self, item):
+        if self.error is not None:
+            raise self.error
+        self.count += 1
+        if not self.queues:
+            for i in range(len(self.stages)):
+                try:
+                    item = self.run_stage(i, item)
+                except Exception as e:
+                    self.fail(i, e)
+                    raise
+            return
+        started = time.perf_counter()
+        self.queues[0].put(item)
+        self.blocked += time.perf_counter() - started
+
+    def close(self):
+        if self.elapsed is not None:
+            return
+        self.source_done = time.perf_counter()
+        if self.queues:
+            self.queues[0].put(Pipeline.STOP)
+            for thread in self.threads:
+                thread.join()
+        self.elapsed = time.perf_counter() - self.started
+
+    # 단계마다 일한 시간의 비율. 가져오기 단계는 큐가 차서 기다린 시간(스레드가 없으면 뒤 단계를 처리한 시간)을 뺀다.
+    def utilization(self):
+        if not self.elapsed:
+            return {name: 0.0 for name in self.names}
+        waited = self.blocked if self.queues else sum(self.busy)
+        source = max(0.0, self.source_done - self.started - waited)
+        return {name: busy / self.elapsed for name, busy in zip(self.names, [source] + self.busy)}
+
+    def stats(self):
+        utilization = self.utilization()
+        return {
+            "tables": self.count,
+            "seconds": self.elapsed,
+            "utilization": utilization,
+            "bottleneck": max(utilization, key=utilization.get),
+        }
+
+# CHANGELOG V1.1.0: 로그는 큐에 넣기만 하고 파일 쓰기는 백그라운드 스레드(QueueListener)가 맡는다.
+#
+# 한 줄에 JSON 하나씩 남기며 logMaxMB를 넘으면 logBackups개까지 돌려 쓴다. 일괄 처리의 작업자 프로세스들은
+# 파일을 직접 열지 않고 프로세스 간 큐로 부모에게 넘겨서, 회전이 한 곳에서만 일어나게 한다.
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps({
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "process": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }, ensure_ascii=False)
+
+log_listener = None
+
+def read_settings():
+    if not os.path.exists(SETTINGS_FILE):
+        return dict(DEFAULT_SETTINGS)
+    with open(SETTINGS_FILE, 'r', encoding="utf-8") as file:
+        return {**DEFAULT_SETTINGS, **json.load(file)}
+
+def setup_logging(level="INFO", max_mb=10, backups=3):
+    global log_listener
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    os.makedirs(DATA_DIR, exist_ok=True)
+    handler = RotatingFileHandler(LOG_FILE, maxBytes=int(max_mb * 1024 * 1024), backupCount=backups, encoding="utf-8")
+    handler.setFormatter(JsonLineFormatter())
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, handler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+def setup_worker_logging(level, log_queue):
+    # fork로 만들어진 작업자는 부모의 핸들러를 물려받으므로 모두 버리고 부모로 가는 큐 하나만 남긴다.
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(level)
+
 class HwpConverter:
     def __init__(self):
         self.file = ''
         self.filename = ''
         self.ctrl = None
+        self.ctrl_ordinal = 0
+        self.page_index = None
+        self.table_index = 0
+        self.digest = None
+        self.table_cache = None
+        self.tracer = Tracer()
+        self.trace_file = TRACE_FILE
+        self.baseline_file = None
+        self.run_manifest = None
+        self.previous_manifest = None
+        self.prescan = None
+        self.reused_tables = 0
+        self.checkpoint = None
+        self.range_index = 0
+        self.resume_after = None
+        # 서비스 작업자처럼 여러 작업을 이어서 처리할 때는 한글과 엑셀 프로그램을 끄지 않고 문서만 닫는다.
+        self.keep_apps = False
+        self.memory_budget = None
+        self.table_filter = None
+        self.filtered_tables = 0
+        self.pipeline_stats = []
+        # merge 명령에서는 저장하는 대신 시트를 WorkbookMerger에 넘긴다.
+        self.merger = None
         self.current_page = 1
         self.export_path = '.'
+        self.ensure_data_dir()
         self.settings = self.load_settings()
+        self.backend = "com"
         self.hwp = None
+        self.reader = None
         self.excel = None
         self.wb = None
         self.ws = None
+        self.sheets = []
+        self.sink = None
+        self.save_file = ''
+        self.com_calls = 0
         self.row_index = 1
         self.cancel_extraction = False
         self.setup_logging()
@@ -51,36 +2193,55 @@ class HwpConverter:
             os.makedirs(DATA_DIR)
     
     def setup_logging(self):
-        logging.basicConfig(filename=LOG_FILE,level=logging.INFO,format='%(asctime)s - %(levelname)s - %(message)s',encoding="utf-8")
-        logging.info("")
-        logging.info("")
-        logging.info(f"Program Started; Current Version is: {VERSION}")
+        setup_logging(self.settings["logLevel"], self.settings["logMaxMB"], self.settings["logBackups"])
+        logging.info("Program Started; Current Version is: %s", VERSION)
 
     def reset_state(self):
+        self.run_manifest = None
+        self.previous_manifest = None
+        self.prescan = None
+        self.checkpoint = None
+        self.range_index = 0
+        self.resume_after = None
         self.current_page = 1
         self.ctrl = None
+        self.page_index = None
         self.exported_pages = 0
         self.total_pages = 0
+        self.pipeline_stats = []
         logging.info("State reset")
     
     def load_settings(self):
         if not os.path.exists(SETTINGS_FILE):
             with open(SETTINGS_FILE, 'w', encoding="utf-8") as file:
                 json.dump(DEFAULT_SETTINGS, file, ensure_ascii=False, indent="\t")
-            return DEFAULT_SETTINGS
-        with open(SETTINGS_FILE, 'r', encoding="utf-8") as file:
-            return json.load(file)
+        return read_settings()
 
     def save_settings(self):
         with open(SETTINGS_FILE, 'w', encoding="utf-8") as file:
             json.dump(self.settings, file, ensure_ascii=False, indent="\t")
 
+    # CHANGELOG V1.1.0: 설정에 따라 한글(COM) 대신 직접 읽기 백엔드 사용
+    def resolve_backend(self):
+        backend = self.settings["backend"]
+        if backend == "auto":
+            backend = "hwpx" if self.file.lower().endswith(".hwpx") else "com"
+        if backend != "com" and backend not in NATIVE_READERS:
+            raise ValueError(f"Unknown backend : {backend}")
+        return backend
+
     def open_hwp_file(self):
         try:
             if self.file:
-                self.hwp = Hwp(visible=not self.settings['isHwpVisible'], new=False, register_module="./FilePathCheckeModule.dll")
-                self.hwp.open(self.file)
-                logging.info("HWP file Opened Successfully.")
+                if self.backend == "com":
+                    if self.hwp is None:
+                        load_hwp_module()
+                        self.hwp = Hwp(visible=not self.settings['isHwpVisible'], new=self.keep_apps, register_module="./FilePathCheckeModule.dll")
+                    self.hwp.open(self.file)
+                else:
+                    self.reader = NATIVE_READERS[self.backend](self.file)
+                    self.reader.open()
+                logging.info(f"HWP file Opened Successfully. backend : {self.backend}")
             else:
                 logging.warning("Hwp File Not Selected on GUI")
                 raise ValueError("No file selected")
@@ -88,36 +2249,71 @@ class HwpConverter:
             logging.error(e)
             raise
 
-    def close_hwp_file(self):
+    def close_hwp_file(self, quit_app=None):
+        quit_app = not self.keep_apps if quit_app is None else quit_app
         if hasattr(self, 'hwp') and self.hwp:
             try:
                 self.hwp.Clear(2)  
-                self.hwp.Quit()
+                if quit_app:
+                    self.hwp.Quit()
             except:
                 pass
-        self.hwp = None
+        if self.reader:
+            self.reader.close()
+        if quit_app:
+            self.hwp = None
+        self.reader = None
         self.ctrl = None
         logging.info("hwp closed.")
 
     def open_excel_file(self):
         logging.info("open_excel_file executed;")
+        if self.settings["output"] in SINKS:
+            self.close_excel_file()
+            sink = SINKS[self.settings["output"]]
+            resume = self.resume_record()
+            if resume:
+                self.save_file = self.checkpoint.header["save_file"]
+                self.sink = sink(self.save_file, offset=resume["offset"])
+            else:
+                self.save_file = self.get_unique_filename(filename=os.path.splitext(os.path.join(self.export_path, self.filename))[0] + sink.extension)
+                self.sink = sink(self.save_file)
+            logging.info(f"{self.settings['output']} sink opened : {self.save_file}")
+            return
         try:
             self.close_excel_file()
+            if self.settings["output"] == "xlsx":
+                if self.resume_record():
+                    self.save_file = self.checkpoint.header["save_file"]
+                else:
+                    self.save_file = self.get_unique_filename(filename=os.path.join(self.export_path, self.filename))
+                self.sheets = []
+                logging.info("xlsx workbook prepared.")
+                return
+
             save_file = (self.export_path + "/" + self.filename).replace("/","\\")
             save_file = self.get_unique_filename(filename=save_file)
             
-            self.excel = win32.gencache.EnsureDispatch("Excel.Application")
-            self.wb = self.excel.Workbooks.Add()
-            self.wb.SaveAs(save_file)
-            self.excel.Quit()
-            self.wb = self.excel.Workbooks.Open(save_file)
+            if self.excel is None:
+                load_excel_module()
+                self.excel = win32.gencache.EnsureDispatch("Excel.Application")
+            if self.resume_record() and os.path.exists(self.checkpoint.header["save_file"]):
+                # 이어서 추출할 때는 중단된 실행이 만든 통합 문서를 다시 연다.
+                save_file = self.checkpoint.header["save_file"]
+                self.wb = self.excel.Workbooks.Open(save_file)
+            else:
+                # SaveAs로 파일과 연결된 통합 문서는 엑셀을 껐다 켜서 다시 열지 않아도 그대로 쓸 수 있다.
+                self.wb = self.excel.Workbooks.Add()
+                self.wb.SaveAs(save_file)
+            self.save_file = save_file
             self.excel.Visible = not self.settings["isExcelVisible"]
             logging.info("Excel opened.")
         except Exception as e:
             logging.error(f"Creating New Excel file failed : {e}")
             raise Exception("Opening Excel failed.")
     
-    def close_excel_file(self):
+    def close_excel_file(self, quit_app=None):
+        quit_app = not self.keep_apps if quit_app is None else quit_app
         logging.info("closing excel..")
         try:
             if hasattr(self, 'wb') and self.wb:
@@ -126,7 +2322,7 @@ class HwpConverter:
                 except Exception as e:
                     logging.error(f"exception ocurred in closing excel #1 : {e}")
                     pass  # If there's an error closing the workbook, continue to close Excel
-            if hasattr(self, 'excel') and self.excel:
+            if hasattr(self, 'excel') and self.excel and quit_app:
                 try:
                     self.excel.Quit()
                 except Exception as e:
@@ -134,10 +2330,64 @@ class HwpConverter:
                     pass  # If there's an error quitting Excel, we've done our best
         except Exception as e:
             logging.error("Unknown error")
+        if self.sink is not None:
+            self.sink.close()
         self.wb = None
-        self.excel = None
+        if quit_app:
+            self.excel = None
+        self.sink = None
+        self.sheets = []
         logging.info("excel closed.")
 
+    # CHANGELOG V1.1.0: 추출한 표는 시트 모델에 모아두고 저장할 때 한 번에 쓴다.
+    #
+    # 예전 엑셀(COM)의 Worksheets.Add()는 활성 시트 앞에 SheetN을 만들었기 때문에 같은 이름과 순서로 쌓는다.
+    def add_sheet(self):
+        self.ws = SheetModel(f"Sheet{len(self.sheets) + 1}", self.memory_budget)
+        self.sheets.insert(0, self.ws)
+
+    def save_workbook(self):
+        if self.merger is not None:
+            self.merger.add_document(self.file, self.sheets)
+            self.sheets = []
+            return
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
+            logging.info(f"{self.settings['output']} saved : {self.save_file}")
+            return
+        if self.settings["output"] != "xlsx":
+            if self.wb is None:
+                return
+            worksheets = self.wb.Worksheets
+            while worksheets.Count < len(self.sheets):
+                worksheets.Add(After=worksheets(worksheets.Count))
+            # 새로 만든 시트의 기본 이름이 최종 이름과 겹치지 않도록 임시 이름을 거쳐서 바꾼다.
+            for index in range(len(self.sheets)):
+                worksheets(index + 1).Name = f"__sheet{index + 1}"
+            for index, sheet in enumerate(self.sheets):
+                ws = worksheets(index + 1)
+                ws.Name = sheet.name
+                with self.tracer.span("write_sheet", sheet=sheet.name, tables=len(sheet.tables)):
+                    self.write_sheet(ws, sheet)
+            self.wb.Save()
+            logging.info("excel saved")
+            return
+        writer = XlsxWriter(
+            self.save_file,
+            style=SheetStyle.from_settings(self.settings),
+            numbers=self.settings["writeNumbers"],
+            shared_strings=not (self.memory_budget and self.memory_budget.spilled),
+        )
+        try:
+            for sheet in self.sheets:
+                with self.tracer.span("write_sheet", sheet=sheet.name, tables=len(sheet.tables)):
+                    writer.add_sheet(sheet.name, sheet.tables)
+        finally:
+            with self.tracer.span("close_xlsx"):
+                writer.close()
+        logging.info(f"xlsx saved : {self.save_file}")
+
     def get_unique_filename(self, filename):
         temp = filename.split(".")
         counter = 1
@@ -146,28 +2396,37 @@ class HwpConverter:
             counter += 1
         return filename
 
+    # CHANGELOG V1.1.0: 컨트롤을 한 칸씩 오가며 페이지를 확인하던 방식 대신 페이지 색인으로 시작 표를 바로 찾는다.
+    def load_page_index(self):
+        kind = "com" if self.backend == "com" else "native"
+        self.page_index = PageIndex.load(self.digest, kind)
+        if self.page_index is None:
+            self.page_index = PageIndex.build(self.hwp) if self.backend == "com" else PageIndex.build_native(self.reader)
+            self.page_index.save(self.digest, kind)
+            logging.info(f"page index built : {len(self.page_index.entries)} tables")
+        else:
+            logging.info(f"page index loaded from cache : {len(self.page_index.entries)} tables")
+
+    def move_to_ctrl(self, ordinal):
+        # 컨트롤 포인터만 따라가므로 커서 이동이나 페이지 계산은 일어나지 않는다.
+        if self.ctrl is None or ordinal < self.ctrl_ordinal:
+            self.ctrl = self.hwp.HeadCtrl
+            self.ctrl_ordinal = 0
+        while self.ctrl is not None and self.ctrl_ordinal < ordinal:
+            self.ctrl = self.ctrl.Next
+            self.ctrl_ordinal += 1
+
+    def move_to_table(self, index):
+        self.table_index = index
+        if index is None or index >= len(self.page_index.entries):
+            self.ctrl = None
+            return
+        ordinal, self.current_page, _ = self.page_index.entries[index]
+        self.move_to_ctrl(ordinal)
+
     def go_to_start_page(self, initial_page):
         try:
-            while self.current_page != initial_page and not self.cancel_extraction:
-                if self.current_page < initial_page:
-                    self.ctrl = self.ctrl.Next
-                    if self.ctrl is None:
-                        break
-                    if self.ctrl.UserDesc == "표":
-                        self.hwp.SetPosBySet(self.ctrl.GetAnchorPos(0))
-                        self.current_page = self.hwp.current_page
-                else:
-                    self.ctrl = self.ctrl.Prev
-                    self.hwp.SetPosBySet(self.ctrl.GetAnchorPos(0))
-                    self.temp_cur_page = self.hwp.current_page
-                    # CHANGELOG V1.0.0: 이전 컨트롤로 돌아가는 동작을 한번만 하도록 변경.
-                    # self.hwp.SetPosBySet(self.ctrl.Prev.GetAnchorPos(0))
-                    # self.temp_prev_page = self.hwp.current_page
-                    if self.temp_cur_page != self.temp_prev_page :
-                        self.current_page = self.temp_cur_page
-                        
-                # logging.info(f"Current Page is: {self.current_page}")
-                self.hwp.goto_page(self.current_page)
+            self.move_to_table(self.page_index.first_table_from(initial_page))
 
             if self.cancel_extraction:
                 logging.info("Extraction cancelled during go_to_start_page")
@@ -225,72 +2484,245 @@ class HwpConverter:
     # CHANGELOG V1.0.0: XML을 활용한 신규 추출 방식 도입
     # 
     # 한글 문서에서 XML 형식의 텍스트를 추출하고, TABLE 태그 내부의 엘리먼트만 남긴 후 파싱하여 엑셀로 옮긴다.
-    def export_via_xml(self):
-        def optimize_column_height(sheet, start_row, end_row):
-            for row in range(start_row, end_row + 1):
-                if sheet.Rows(row).RowHeight > 24:
-                    sheet.Rows(row).RowHeight = 24
-        
-        self.hwp.SetPosBySet(self.ctrl.GetAnchorPos(0))
-        self.current_page = self.hwp.current_page
-        self.hwp.FindCtrl()
-        
-        table_pattern = r"<TABLE\b.*?>.*?</TABLE>"
-        footnote_pattern = r"<FOOTNOTE\b.*?>.*?</FOOTNOTE>"
-        
-        src = self.hwp.GetTextFile("HWPML2X",option="saveblock")
-        logging.info("got src for this page.")
-        
-        text_without_footnote = re.sub(footnote_pattern, '', src, flags=re.DOTALL | re.IGNORECASE)
-        tableList = re.findall(table_pattern, text_without_footnote, flags=re.DOTALL | re.IGNORECASE)
-        src = '\n'.join(tableList)
-        
-        root = ET.fromstring(src)
-        logging.info("generated root of xml data")
-        
-        self.ws.Activate()
-        sheet = self.excel.ActiveSheet
-        
-        sheet.Cells.Font.Size = 9
-        
-        start_row = self.row_index
-        
-        for row_elem in root.findall(".//ROW"):
-            cells_to_process = []
-            max_row_span = 1
-            
-            for cell_elem in row_elem.findall("CELL"):
-                col_addr = int(cell_elem.get("ColAddr", 0))
-                col_span = int(cell_elem.get("ColSpan", 1))
-                row_span = int(cell_elem.get("RowSpan", 1))
-                text_content = [text for text in ("".join(p_elem.itertext()).strip() for p_elem in cell_elem.findall(".//P")) if text]
-                if text_content:
-                    cells_to_process.append((col_addr, col_span, text_content))
-                    max_row_span = max(max_row_span,row_span)
+    # CHANGELOG V1.1.0: 가져오기만 하고 해석과 쓰기는 파이프라인의 뒤 단계(parse_stage, store_stage)로 넘긴다.
+    #
+    # 파이프라인에는 (페이지, 순번, 원문, prescan) 꼴로 넘기며, 원문 자리에는 HWPML 문자열, 직접 읽기의 TABLE 엘리먼트,
+    # 이전 실행에서 그대로 가져온 Table, 페이지 조건에 걸린 표면 None이 온다.
+    def export_via_xml(self, pipeline):
+        page, ordinal = self.current_page, self.table_index
+        if self.table_filter is not None and not self.table_filter.accepts_page(page):
+            pipeline.put((page, ordinal, None, None))
+            return
+        reused = self.reuse_previous_table()
+        if reused is not None:
+            logging.debug("table %s on page %s reused from the previous run", ordinal, page)
+            pipeline.put((page, ordinal) + reused)
+            return
+        with self.tracer.span("GetTextFile", page=page, table=ordinal):
+            self.hwp.SetPosBySet(self.ctrl.GetAnchorPos(0))
+            self.hwp.FindCtrl()
             
-            if cells_to_process:
-                max_cell_height = max(len(content) for _, _, content in cells_to_process)
-                
-                for col_addr, col_span, text_content in cells_to_process:
-                    for i, text in enumerate(text_content):
-                        cell = sheet.Cells(self.row_index + i, col_addr + 1)
-                        cell.Value = text
-                        
-                    if col_span > 1:
-                        for i in range(max(len(text_content), 1)):
-                            start_cell = sheet.Cells(self.row_index + i, col_addr + 1)
-                            end_cell = sheet.Cells(self.row_index + i, col_addr + col_span)
-                            sheet.Range(start_cell, end_cell).Merge()
-                
-                # 세로 병합될 셀이 있으면 줄바꿈 효과를 무력화시켜서 바로 밑 열부터 채우도록 바꿈
-                if max_row_span > 1 :
-                    max_cell_height = 1
-                    
-                self.row_index += max_cell_height
-                
-        optimize_column_height(sheet, start_row, self.row_index - 1)
-        # sheet.Rows(f"{self.row_index}:{self.row_index + max_cell_height - 1}").AutoFit()
-        # logging.info("AutoFitted")
+            src = self.hwp.GetTextFile("HWPML2X",option="saveblock")
+        logging.debug("got src for table %s on page %s", ordinal, page)
+        pipeline.put((page, ordinal, src, None))
+
+    def cell_selector(self):
+        return self.table_filter.cell_selector() if self.table_filter is not None else None
+
+    def start_pipeline(self, update_progress_callback):
+        stages = [
+            ("parse", self.parse_stage),
+            ("write", lambda item: self.store_stage(item, update_progress_callback)),
+        ]
+        return Pipeline("read", stages, self.settings["pipelineDepth"])
+
+    # 쓰다가 난 예외는 가져오기 쪽 예외가 없을 때만 다시 던진다. 어느 쪽이든 이미 넘긴 표는 모두 쓰고 닫는다.
+    def finish_pipeline(self, pipeline):
+        pipeline.close()
+        stats = pipeline.stats()
+        self.pipeline_stats.append(stats)
+        logging.info(
+            f"pipeline : {stats['tables']} tables in {stats['seconds']:.2f}s, "
+            + ", ".join(f"{name} {busy:.0%}" for name, busy in stats["utilization"].items())
+            + f" busy; bottleneck {stats['bottleneck']}"
+        )
+        if pipeline.error is not None and sys.exc_info()[1] is None:
+            raise Exception(f"Failed to write table: {pipeline.error}") from pipeline.error
+
+    def parse_stage(self, item):
+        page, ordinal, src, prescan = item
+        if isinstance(src, str):
+            rows = iter_hwpml_rows(src, select=self.cell_selector())
+        elif isinstance(src, ET.Element):
+            rows = iter_element_rows(src, select=self.cell_selector())
+        else:
+            return item
+        with self.tracer.span("parse", page=page, table=ordinal):
+            return page, ordinal, self.parse_table(rows, page, ordinal), prescan
+
+    # 거르기 조건에 걸린 표면 None을, 실행 기록 없이 파일로 바로 쓸 때는 배치한 행 목록을, 그 밖에는 Table을 돌려준다.
+    def parse_table(self, rows, page, ordinal):
+        if self.table_filter is not None:
+            rows = self.table_filter.apply(rows)
+            if rows is None:
+                return None
+        if self.sink is not None and self.run_manifest is None:
+            return list(iter_layout_rows(rows))
+        return layout_table(rows, page=page, ordinal=ordinal)
+
+    def store_stage(self, item, update_progress_callback):
+        page, ordinal, parsed, prescan = item
+        with self.tracer.span("store", page=page, table=ordinal):
+            if parsed is None:
+                self.filtered_tables += 1
+            elif isinstance(parsed, Table):
+                self.add_table(parsed, prescan)
+                self.row_index += 2
+            else:
+                self.sink.write_table(page, ordinal, parsed)
+                self.commit_table(ordinal, page=page)
+                self.row_index += 2
+        self.exported_pages += 1
+        progress = (self.exported_pages / self.total_pages) * 100
+        update_progress_callback(progress=progress, status=f"Exporting page {page}...")
+
+    def add_table(self, table, prescan=None, journal=True):
+        if self.run_manifest is not None:
+            self.run_manifest.add(table, prescan)
+        if self.sink is not None:
+            self.sink.write_table(table.page, table.ordinal, table_layout_rows(table))
+            if journal:
+                # 증분 모드에서는 이어서 추출할 때 실행 기록을 다시 채울 수 있도록 표 내용도 남긴다.
+                self.commit_table(table.ordinal, table if self.run_manifest is not None else None, page=table.page)
+            return
+        if self.table_cache is not None and table.ordinal is not None:
+            self.table_cache.add(table)
+        self.ws.tables.append(table)
+        if self.memory_budget is not None and self.memory_budget.spilled and self.table_cache is not None and not self.table_cache.frozen:
+            # 새로 추가한 표는 저장할 때까지 메모리에 있으므로 상한을 넘긴 문서에서는 이번 실행 동안 캐시를 늘리지 않는다.
+            logging.warning("tables exceed maxMemoryMB; the table cache is not updated by this run")
+            self.table_cache.freeze()
+        self.row_index += table.n_rows
+        if journal:
+            self.commit_table(table.ordinal, table, page=table.page)
+
+    # 파이프라인의 쓰기 단계에서는 가져오기 단계가 current_page를 앞서 옮겨 두므로 표의 페이지를 따로 받는다.
+    def commit_table(self, ordinal, table=None, page=None):
+        if self.checkpoint is None or self.checkpoint.file is None:
+            return
+        record = {
+            "range_index": self.range_index,
+            "sheet": self.ws.name,
+            "ordinal": ordinal,
+            "anchor": self.page_index.entries[ordinal][2] if self.page_index and ordinal is not None else None,
+            "current_page": self.current_page if page is None else page,
+            "row_index": self.row_index,
+        }
+        if table is not None:
+            record["table"] = table.to_dict()
+        if self.sink is not None:
+            record["offset"] = self.sink.tell()
+        self.checkpoint.write(record)
+
+    def resume_record(self):
+        if self.checkpoint is None:
+            return None
+        return self.checkpoint.last
+
+    # 체크포인트에 남은 범위의 표를 시트에 되살리고, 이어서 추출할 때 건너뛸 마지막 표 순번을 정한다.
+    # 범위를 끝까지 마쳤으면 True를 돌려준다.
+    def restore_range(self):
+        self.resume_after = None
+        if self.checkpoint is None:
+            return False
+        for record in self.checkpoint.records_of(self.range_index):
+            if "table" in record:
+                table = Table.from_dict(record["table"])
+                if self.sink is not None:
+                    self.run_manifest.add(table)
+                else:
+                    self.add_table(table, journal=False)
+            self.row_index = record["row_index"] + 2
+            self.exported_pages += 1
+        if self.range_index in self.checkpoint.ranges:
+            _, count, last = self.checkpoint.ranges[self.range_index]
+            self.resume_after = last["ordinal"]
+            self.current_page = last["current_page"]
+            logging.info(f"{count} tables of range #{self.range_index + 1} restored from checkpoint")
+        return self.range_index in self.checkpoint.done_ranges
+
+    # 이전 실행과 prescan 지문이 같은 표는 한글에서 다시 가져오지 않고 (Table, prescan)을 돌려준다.
+    def reuse_previous_table(self):
+        if self.prescan is None or self.table_index >= len(self.prescan):
+            return None
+        prescan = self.prescan[self.table_index]
+        entry = self.previous_manifest.by_prescan.get(prescan)
+        if entry is None:
+            return None
+        self.reused_tables += 1
+        return self.previous_manifest.table(entry, self.current_page, self.table_index), prescan
+
+    def prescan_fingerprints(self):
+        kind = "hwpx" if self.file.lower().endswith(".hwpx") else "hwp5"
+        reader = NATIVE_READERS[kind](self.file)
+        try:
+            reader.open()
+            prescan = [table_fingerprint(layout_table(iter_element_rows(table))) for _, table in reader.iter_tables()]
+        except Exception as e:
+            logging.warning(f"prescan failed, every table will be fetched : {e}")
+            return None
+        finally:
+            reader.close()
+        if len(prescan) != len(self.page_index.entries):
+            logging.warning(f"prescan found {len(prescan)} tables but the document has {len(self.page_index.entries)}; every table will be fetched")
+            return None
+        return prescan
+
+    # CHANGELOG V1.1.0: 셀 하나씩 쓰던 것을 표 하나당 Range.Value 한 번으로 쓰고, 병합, 서식과 행 높이 정리는 시트마다 모아서 한 번에 한다.
+    #
+    # com_calls는 엑셀로 나간 COM 호출 수이며, 표마다 로그에 남겨 셀 수와 상관없이 일정한지 확인할 수 있게 한다.
+    def write_sheet(self, ws, sheet):
+        self.com_calls = 0
+        style = SheetStyle.from_settings(self.settings)
+
+        merges = []
+        bordered = []
+        row_index = 1
+        for table in sheet.tables:
+            before = self.com_calls
+            with self.tracer.span("write_cells", page=table.page, table=table.ordinal):
+                self.write_table_to_sheet(ws, table, row_index)
+            merges.extend(
+                range_address(row_index + r1, c1 + 1, row_index + r2, c2 + 1)
+                for r1, c1, r2, c2 in table.merges
+            )
+            if table.bordered and table.n_rows and table.n_cols:
+                bordered.append(range_address(row_index, 1, row_index + table.n_rows - 1, table.n_cols))
+            logging.debug("COM calls for table on page %s (%sx%s) : %s", table.page, table.n_rows, table.n_cols, self.com_calls - before)
+            row_index += table.n_rows + 2
+
+        with self.tracer.span("merges", sheet=sheet.name, count=len(merges)):
+            for addresses in join_addresses(merges):
+                ws.Range(addresses).Merge()
+                self.com_calls += 2
+        with self.tracer.span("styles", sheet=sheet.name, bordered=len(bordered)):
+            self.com_calls += style.apply_com(ws, bordered)
+        if row_index > 3 and style.row_height_cap:
+            with self.tracer.span("row_height", sheet=sheet.name):
+                self.optimize_column_height(ws, 1, row_index - 3, style.row_height_cap)
+        logging.info(f"COM calls for sheet {sheet.name} : {self.com_calls}")
+
+    def write_table_to_sheet(self, sheet, table, row_index):
+        if not table.n_rows or not table.n_cols:
+            return
+
+        region = sheet.Range(range_address(row_index, 1, row_index + table.n_rows - 1, table.n_cols))
+        if self.settings["writeNumbers"]:
+            region.Value = tuple(tuple(self.com_value(value) for value in row) for row in table.rows)
+        else:
+            region.Value = tuple(tuple(row) for row in table.rows)
+        self.com_calls += 2
+
+    # 엑셀은 받은 문자열을 입력할 때처럼 다시 해석하므로 일반 숫자만 숫자로 넘기고,
+    # 천 단위 구분이나 백분율은 엑셀이 표시 형식까지 정하도록 문자열 그대로 넘긴다.
+    def com_value(self, value):
+        number = cell_number(value) if isinstance(value, str) else None
+        return number[0] if number is not None and number[1] == 0 else value
+
+    def optimize_column_height(self, sheet, start_row, end_row, cap=24):
+        # 행 높이가 모두 같으면 RowHeight가 그 값을, 다르면 None을 돌려주므로 대부분 한 번의 읽기로 끝난다.
+        rows = sheet.Rows(f"{start_row}:{end_row}")
+        height = rows.RowHeight
+        self.com_calls += 2
+        if height is not None:
+            if height > cap:
+                rows.RowHeight = cap
+                self.com_calls += 1
+            return
+        for row in range(start_row, end_row + 1):
+            if sheet.Rows(row).RowHeight > cap:
+                sheet.Rows(row).RowHeight = cap
+            self.com_calls += 2
         
     # CHANGELOG V1.0.0: 추출 방식 변경
     def copy_paste_to_endpage(self, end_page, update_progress_callback):
@@ -301,9 +2733,17 @@ class HwpConverter:
         if self.current_page > end_page:
             logging.info("current page is bigger than end_page; ending copy-paste")
             return
-        
+
+        pipeline = self.start_pipeline(update_progress_callback)
+        try:
+            self.fetch_to_endpage(end_page, pipeline)
+        finally:
+            self.finish_pipeline(pipeline)
+
+    # 컨트롤을 따라가며 표 원문을 가져와 파이프라인에 넣는다. 해석과 쓰기는 그동안 다른 스레드에서 앞 표를 처리한다.
+    def fetch_to_endpage(self, end_page, pipeline):
         while end_page >= self.current_page:
-            logging.info("Copy-Paste Started")
+            logging.debug("Copy-Paste Started")
 
             if self.cancel_extraction:
                 logging.info("Extraction cancelled during pre-copy")
@@ -319,13 +2759,8 @@ class HwpConverter:
                     break
                 
                 try:
-                    self.export_via_xml()
-                    self.row_index += 2
+                    self.export_via_xml(pipeline)
                     # self.copy_paste_action()
-
-                    self.exported_pages += 1
-                    progress = (self.exported_pages / self.total_pages) * 100
-                    update_progress_callback(progress=progress, status=f"Exporting page {self.current_page}...")
                 
                 except Exception as e:
                     logging.error(f"Copy-Paste failed: {e}")
@@ -336,215 +2771,181 @@ class HwpConverter:
                     logging.info("Extraction cancelled before excel offset")
                     return
             
-            self.ctrl = self.ctrl.Next  
+            self.move_to_table(self.table_index + 1)
             if self.ctrl is None:
                 logging.info("Extraction Ended Reaching the End of Document")
                 break
-            
-            self.hwp.SetPosBySet(self.ctrl.GetAnchorPos(0))
-            self.current_page = self.hwp.current_page
 
-            logging.info(f"moved to next page: {self.current_page}")
-            logging.info("done.")
+            logging.debug("moved to next page: %s", self.current_page)
             if self.cancel_extraction:
                 logging.info("Extraction Cancelled after processing a table")
                 return
         logging.info("while loop in copy_paste_to_endpage ended")
-    
-    def is_number(self,cell_value):
-        try:
-            float(cell_value)
-            return True
-        except:
-            return False        
-        
-    # CHANGELOG V1.0.0: 공백 조절 기능 제거, 테두리 일괄적용
-    def rearrange_demos(self):
+
+    # CHANGELOG V1.1.0: 직접 읽기 백엔드는 컨트롤을 돌지 않고 읽어온 표의 페이지로 범위를 판단한다.
+    def export_native_range(self, initial_page, end_page, update_progress_callback):
+        pipeline = self.start_pipeline(update_progress_callback)
         try:
-            for sheet in self.wb.Worksheets:
-                used_range = sheet.UsedRange
-                total_used_row = used_range.Rows.Count
-                
-                if sheet == self.wb.Worksheets("Sheet1") and self.settings["SPMode"]:
-                    logging.info("Spliting first sheet")
-                    self.split_first_sheet(sheet)
-                    
-                else:
-                    row = 1
-                    while row <= total_used_row:
-                        if self.cancel_extraction:
-                            logging.warning("extraction canceled while rearranging excel")
-                            return
-                        
-                        table = sheet.Cells(row, 1).CurrentRegion
-                        for i in range(7, 11):  # Excel에서 7-12는 테두리 상단, 하단, 좌측, 우측, 대각선 등
-                            border = table.Borders(i)
-                            border.LineStyle = 1  # 실선
-                            border.Weight = 2     # 두께: 2는 중간 굵기, 4는 두꺼운 테두리
-                            border.Color = 0x000000  # 검정색
-                        table_row = table.Rows.Count
-                        table_column = table.Columns.Count
-
-                        for cell in table:
-                            if cell.MergeCells:
-                                cell.UnMerge()
-
-                        right_column = sheet.Range(
-                            sheet.Cells(row, table_column),
-                            sheet.Cells(row + table_row - 1, table_column),
-                        )
-                        
-                        if all(
-                            cell.Value is None or (not self.is_number(str(cell.Value)) and str(cell.Value) != "-")
-                            for cell in right_column
-                        ):
-                            demo_value = right_column.Value
-                            dest = sheet.Range(
-                                table.Offset(1, 2),
-                                table.Offset(table_row, table_column + 1),
-                            )
-                            dest.Value = table.Value
-                            new_demo = sheet.Range(
-                                table.Offset(1, 1), table.Offset(table_row, 1)
-                            )
-                            new_demo.Value = demo_value
-                            sheet.Range(
-                                table.Offset(1, table_column + 1),
-                                table.Offset(table_row, table_column + 1),
-                            ).Value = ""
+            self.read_native_range(initial_page, end_page, pipeline)
+        finally:
+            self.finish_pipeline(pipeline)
+        logging.info(f"native export of pages {initial_page}~{end_page} ended")
 
-                        else:
-                            pass
+    # 범위의 첫 표는 페이지 색인에서 찾아 그 표가 있는 구역부터 읽고, 범위 밖의 표는 TABLE을 만들지 않는다.
+    def read_native_range(self, initial_page, end_page, pipeline):
+        first = self.page_index.first_table_from(initial_page)
+        if first is None:
+            return
+        if self.resume_after is not None:
+            first = max(first, self.resume_after + 1)
+        start = self.page_index.section_start(first) if self.page_index.sections else (0, 0, 1)
+        accepts_page = self.table_filter.accepts_page if self.table_filter is not None else lambda page: True
+        wanted = lambda ordinal, page: ordinal >= first and page <= end_page and accepts_page(page)
+        for ordinal, (page, table) in enumerate(self.reader.iter_tables(wanted, start), start=start[1]):
+            if self.cancel_extraction:
+                logging.info("Extraction cancelled during export_native_range")
+                return
+            if page < initial_page or (self.resume_after is not None and ordinal <= self.resume_after):
+                continue
+            if page > end_page:
+                break
 
-                        row += table_row +2
-                        # logging.info(f"row is now:{row}")  
-                            
-        except Exception as e:
-            logging.error("Error while arranging Excel")
-            logging.warning(traceback.format_exc())
-            raise Exception(f"Re-arranging Excel failed : {e}")
-        
-    def split_first_sheet(self, sheet):
-        sheet.Copy(Before=sheet)
-        sheet1 = sheet
-        sheet2 = self.wb.Worksheets(f"{sheet.Name} (2)")
-        sheet1.Select()
-
-        for i in range(2):
-            if i == 0:
-                sheet = sheet1
+            self.current_page = page
+            try:
+                pipeline.put((page, ordinal, table, None))
+            except Exception as e:
+                logging.error(f"Writing table failed: {e}")
+                raise Exception(f"Failed to write table: {e}")
+
+    def export_cached_range(self, initial_page, end_page, update_progress_callback):
+        for table in self.table_cache.tables_between(initial_page, end_page):
+            if self.cancel_extraction:
+                logging.info("Extraction cancelled during export_cached_range")
+                return
+            self.current_page = table.page
+            if self.resume_after is not None and table.ordinal <= self.resume_after:
+                continue
+            if self.run_manifest is not None:
+                self.run_manifest.add(table)
+            self.row_index += table.n_rows
+            if self.sink is not None:
+                self.sink.write_table(table.page, table.ordinal, table_layout_rows(table))
+                self.commit_table(table.ordinal, table if self.run_manifest is not None else None)
             else:
-                sheet = sheet2
+                self.ws.tables.append(table)
+                self.commit_table(table.ordinal, table)
+            self.row_index += 2
 
-            # sheet.Select()
-            used_range = sheet.UsedRange
-            total_used_row = used_range.Rows.Count
-            total_used_column = used_range.Columns.Count
+            self.exported_pages += 1
+            progress = (self.exported_pages / self.total_pages) * 100
+            update_progress_callback(progress=progress, status=f"Exporting page {self.current_page}...")
+    
+    # CHANGELOG V1.0.0: 공백 조절 기능 제거, 테두리 일괄적용
+    # CHANGELOG V1.1.0: 엑셀을 다시 읽지 않고 메모리의 표에서 바로 데모 이동과 시트 분리를 한다.
+    #
+    # 엑셀에서 하던 것처럼 모든 표의 병합을 풀고 바깥 테두리를 두르며, SPMode에서는 Sheet1을 데모가 오른쪽 끝에 있는 표(Sheet1 (2))와
+    # 나머지 표(Sheet1)로 나눈다. 표 사이 공백은 쓸 때 항상 두 줄로 맞춰지므로 따로 정리하지 않는다.
+    def is_demo_table(self, table):
+        return not any(row[-1] is not None and cell_type(row[-1]) in NUMERIC_CELL_TYPES for row in table.rows)
 
-            row = 1
-            while row <= total_used_row:
-                if self.cancel_extraction:
-                    logging.warning("extraction canceled while rearranging excel")
-                    return
-                
-                if sheet.Cells(row, 1).Value is None:
-                    
-                    if all(
-                        sheet.Cells(row, col).Value is None
-                        for col in range(1, total_used_column + 1)
-                    ):
-                        next_non_empty_row = row + 1
-
-                        while next_non_empty_row <= total_used_row and all(
-                            sheet.Cells(next_non_empty_row, col).Value is None
-                            for col in range(1, total_used_column + 1)
-                        ):
-                            next_non_empty_row += 1
-
-                        sheet.Rows(f"{row}:{next_non_empty_row - 1}").Delete(
-                            Shift=win32.constants.xlUp
-                        )
-
-                        sheet.Rows(row).Insert(Shift=win32.constants.xlDown)
-                        sheet.Rows(row).Insert(Shift=win32.constants.xlDown)
-
-                        total_used_row -= next_non_empty_row - row
-                        total_used_row += 2
-                        row += 2
-                    else:
-                        row += 1
-                    
-                    if all(
-                        all(
-                            sheet.Cells(check_row, col).Value is None
-                            for col in range(1, total_used_column + 1)
-                        )
-                        for check_row in range(
-                            row, min(row + 5, total_used_row + 1)
-                        )
-                    ) :
-                        break
-                else:
-                    table = sheet.Cells(row, 1).CurrentRegion
-                    table_row = table.Rows.Count
-                    table_column = table.Columns.Count
+    # 표를 새 시트 모델로 옮겨 담으며 바꾸므로, 임시 파일로 내려 쓴 표도 한 번씩만 읽고 다시 쓴다.
+    def rearrange_demos(self):
+        sheets = []
+        for index, sheet in enumerate(self.sheets):
+            if self.cancel_extraction:
+                logging.warning("extraction canceled while rearranging excel")
+                self.sheets = sheets + self.sheets[index:]
+                return
+            if sheet.name == "Sheet1" and self.settings["SPMode"]:
+                logging.info("Spliting first sheet")
+                sheets.extend(self.split_first_sheet(sheet))
+                continue
+            rearranged = SheetModel(sheet.name, self.memory_budget)
+            for table in sheet.tables.drain():
+                table.merges = []
+                table.bordered = True
+                if self.is_demo_table(table):
+                    move_demo_column(table)
+                rearranged.tables.append(table)
+            sheets.append(rearranged)
+        self.sheets = sheets
 
-                
-                table = sheet.Cells(row, 1).CurrentRegion
-                for j in range(7, 11):  # Excel에서 7-12는 테두리 상단, 하단, 좌측, 우측, 대각선 등
-                    border = table.Borders(j)
-                    border.LineStyle = 1  # 실선
-                    border.Weight = 2     # 두께: 2는 중간 굵기, 4는 두꺼운 테두리
-                    border.Color = 0x000000  # 검정색
-                table_row = table.Rows.Count
-                table_column = table.Columns.Count
-
-                for cell in table:
-                    if cell.MergeCells:
-                        cell.UnMerge()
-
-                right_column = sheet.Range(
-                    sheet.Cells(row, table_column),
-                    sheet.Cells(row + table_row - 1, table_column),
-                )
+    def split_first_sheet(self, sheet):
+        demo_sheet = SheetModel(f"{sheet.name} (2)", self.memory_budget)
+        rest = SheetModel(sheet.name, self.memory_budget)
+        for table in sheet.tables.drain():
+            table.merges = []
+            table.bordered = True
+            if self.is_demo_table(table):
+                move_demo_column(table)
+                demo_sheet.tables.append(table)
+            else:
+                rest.tables.append(table)
+        return [demo_sheet, rest]
 
-                if all(
-                    cell.Value is None or (not self.is_number(str(cell.Value)) and str(cell.Value) != "-")
-                    for cell in right_column
-                ):  # if demo is on right end
-                    if i == 0: # in sheet1
-                        sheet.Rows(f"{row}:{row + table_row}").Delete(
-                            Shift=win32.constants.xlDown
-                        )
-                        if row != 1:
-                            row -= 2
-                    else:
-                        row += table_row
-                        
-                        demo_value = right_column.Value
-                        dest = sheet.Range(
-                            table.Offset(1, 2),
-                            table.Offset(table_row, table_column + 1),
-                        )
-                        dest.Value = table.Value
-                        new_demo = sheet.Range(
-                            table.Offset(1, 1), table.Offset(table_row, 1)
-                        )
-                        new_demo.Value = demo_value
-                        sheet.Range(
-                            table.Offset(1, table_column + 1),
-                            table.Offset(table_row, table_column + 1),
-                        ).Value = ""
-                        
-                else:
-                    if i == 1: # in sheet1-1
-                        sheet.Rows(f"{row}:{row + table_row}").Delete(
-                            Shift=win32.constants.xlDown
-                        )
-                        if row != 1:
-                            row -= 2
-                    else:
-                        row += table_row +2
+    # xlsx 출력이면 값을 직접 읽어 새 파일로 쓰고, 엑셀(COM)이면 시트마다 UsedRange.Value를 한 번 읽고 그 자리(또는 save_file)에 다시 쓴다.
+    # 데모 열은 옮길 때마다 한 칸씩 돌아가므로 이미 첫 시트를 나눈 통합 문서는 force 없이는 다시 재배치하지 않는다.
+    def rearrange_workbook(self, path, save_file=None, force=False):
+        self.sheets = []
+        if self.settings["output"] == "xlsx":
+            workbook = read_xlsx_values(path)
+            check_not_rearranged([name for name, _ in workbook], path, force)
+            with self.tracer.span("read_workbook"):
+                for name, values in workbook:
+                    sheet = SheetModel(name, self.memory_budget)
+                    sheet.tables.extend(tables_from_values(values))
+                    self.sheets.append(sheet)
+            self.save_file = save_file or self.get_unique_filename(filename=path)
+        else:
+            if self.excel is None:
+                load_excel_module()
+                self.excel = win32.gencache.EnsureDispatch("Excel.Application")
+            self.wb = self.excel.Workbooks.Open(os.path.abspath(path))
+            try:
+                check_not_rearranged([ws.Name for ws in self.wb.Worksheets], path, force)
+                if save_file and os.path.abspath(save_file) != os.path.abspath(path):
+                    # 원본을 덮어쓰지 않도록 고치기 전에 새 이름으로 저장해 두고, 이후 저장은 이 파일에 한다.
+                    self.excel.DisplayAlerts = False
+                    try:
+                        self.wb.SaveAs(os.path.abspath(save_file))
+                    finally:
+                        self.excel.DisplayAlerts = True
+                self.save_file = save_file or path
+                used_ranges = []
+                with self.tracer.span("read_workbook"):
+                    for ws in self.wb.Worksheets:
+                        used = ws.UsedRange
+                        values = used.Value
+                        if not isinstance(values, tuple):
+                            values = ((values,),)
+                        # UsedRange가 A1에서 시작하지 않으면 앞의 빈 행과 열을 채워 원래 위치를 유지한다.
+                        values = [()] * (used.Row - 1) + [(None,) * (used.Column - 1) + tuple(row) for row in values]
+                        sheet = SheetModel(ws.Name, self.memory_budget)
+                        sheet.tables.extend(tables_from_values(values))
+                        self.sheets.append(sheet)
+                        used_ranges.append(used)
+                for used in used_ranges:
+                    used.Clear()
+            except BaseException:
+                # 다 읽기 전에 멈추면 지운 셀이 저장되지 않도록 바꾸지 않고 닫는다.
+                self.wb.Close(SaveChanges=False)
+                self.wb = None
+                self.close_excel_file()
+                raise
+        logging.info(f"{sum(len(sheet.tables) for sheet in self.sheets)} tables read from {path}")
+        with self.tracer.span("rearrange_demos"):
+            self.rearrange_demos()
+        try:
+            with self.tracer.span("save", output=self.settings["output"]):
+                self.save_workbook()
+        except BaseException:
+            if self.wb is not None:
+                self.wb.Close(SaveChanges=False)
+                self.wb = None
+            raise
+        finally:
+            self.close_excel_file()
+        return self.save_file
     
     # CHANGELOG V1.0.0: 추출 방식 안정화로 재시도 로직 제거
     # @deprecated
@@ -618,16 +3019,130 @@ class HwpConverter:
     #             logging.info("retry ended. returning.")
     #             return
 
-    def prepare_extraction(self):
+    # 켜 둔 한글이나 엑셀이 응답하지 않으면 버려서 이번 작업에서 새로 띄우게 한다.
+    def check_apps(self):
+        healthy = True
+        if self.hwp is not None:
+            try:
+                self.hwp.XHwpDocuments.Count
+            except Exception as e:
+                logging.warning(f"Hwp stopped responding and will be restarted : {e}")
+                self.hwp = None
+                healthy = False
+        if self.excel is not None:
+            try:
+                self.excel.Workbooks.Count
+            except Exception as e:
+                logging.warning(f"Excel stopped responding and will be restarted : {e}")
+                self.excel = None
+                self.wb = None
+                healthy = False
+        return healthy
+
+    def quit_apps(self):
+        self.close_hwp_file(quit_app=True)
+        self.close_excel_file(quit_app=True)
+
+    def prepare_extraction(self, range_list=()):
         self.reset_state()
-        self.open_hwp_file()
-        self.open_excel_file()
-        self.ctrl = self.hwp.HeadCtrl
+        self.check_apps()
+        self.memory_budget = MemoryBudget(int(self.settings["maxMemoryMB"] * 1024 * 1024))
+        self.table_filter = TableFilter.from_settings(self.settings)
+        self.filtered_tables = 0
+        self.backend = self.resolve_backend()
+        with self.tracer.span("cache_load"):
+            self.digest = file_digest(self.file) if self.file else None
+            # 캐시에는 거르지 않은 표 전체가 들어 있어야 하므로 거르기 조건이 있으면 캐시를 쓰지 않는다.
+            self.table_cache = TableCache.load(self.digest) if self.digest and self.settings["useCache"] and self.table_filter is None else None
+        # keep_apps로 켜 둔 한글은 문서를 닫은 뒤에도 남아 있으므로, 어느 쪽으로 읽을지는 self.hwp가 아니라 백엔드로 정한다.
+        opened = False
+        if self.table_cache is not None and range_list and all(self.table_cache.covers(start, end) for start, end in page_ranges(range_list)):
+            logging.info("every range is in the table cache; document not opened.")
+        else:
+            with self.tracer.span("open_document", backend=self.backend):
+                self.open_hwp_file()
+            opened = True
+        with self.tracer.span("open_workbook", output=self.settings["output"]):
+            self.load_checkpoint(range_list)
+            self.open_excel_file()
+        if opened and self.backend == "com":
+            self.ctrl = self.hwp.HeadCtrl
+            self.ctrl_ordinal = 0
+        if opened:
+            with self.tracer.span("page_index"):
+                self.load_page_index()
+        if self.settings["incremental"]:
+            self.prepare_incremental()
+        if self.checkpoint is not None:
+            self.checkpoint.start({"document": self.file, "digest": self.digest, "ranges": list(range_list), "output": self.settings["output"], "save_file": self.save_file})
         logging.info("Extraction Ready.")
 
+    def load_checkpoint(self, range_list):
+        output = self.settings["output"]
+        if not self.settings["checkpoint"] or not self.digest or not range_list or (output in SINKS and not SINKS[output].resumable):
+            return
+        target = os.path.join(self.export_path, self.filename)
+        self.checkpoint = Checkpoint.load(self.digest, range_list, output, target, self.table_filter and self.table_filter.describe())
+        resume = self.resume_record()
+        if resume is None:
+            return
+        if output in SINKS and not os.path.exists(self.checkpoint.header["save_file"]):
+            logging.warning(f"output of the interrupted run is missing; starting over : {self.checkpoint.header['save_file']}")
+            self.checkpoint.discard()
+            return
+        logging.info(f"resuming from checkpoint : {self.checkpoint.count} tables, last page {resume['current_page']}")
+
+    def prepare_incremental(self):
+        table_filter = self.table_filter and self.table_filter.describe()
+        self.run_manifest = RunManifest(self.file, self.digest, table_filter=table_filter)
+        self.previous_manifest = RunManifest.load(self.baseline_file or self.file)
+        self.prescan = None
+        self.reused_tables = 0
+        if self.previous_manifest is None:
+            logging.info("no previous run to compare with")
+            return
+        if self.previous_manifest.table_filter != table_filter:
+            logging.info("the previous run used other table filters; every table will be fetched")
+            return
+        if self.backend == "com" and self.page_index is not None and self.previous_manifest.by_prescan:
+            with self.tracer.span("prescan"):
+                self.prescan = self.prescan_fingerprints()
+
+    def finish_incremental(self, range_list):
+        if self.previous_manifest is not None:
+            report = self.run_manifest.compare(self.previous_manifest, list(page_ranges(range_list)))
+            report["reused"] = self.reused_tables
+            with open(os.path.splitext(self.save_file)[0] + ".changes.json", "w", encoding="utf-8") as file:
+                json.dump(report, file, ensure_ascii=False, indent="\t")
+            logging.info(f"change report : {report['summary']}, {self.reused_tables} tables reused")
+        # 다음 실행에서 GetTextFile을 건너뛸 수 있도록 이번 실행의 prescan 지문도 남긴다.
+        prescan = self.prescan
+        if prescan is None and self.backend == "com" and self.page_index is not None:
+            with self.tracer.span("prescan"):
+                prescan = self.prescan_fingerprints()
+        if prescan is not None:
+            for entry in self.run_manifest.entries:
+                entry["prescan"] = prescan[entry["ordinal"]]
+        elif self.previous_manifest is not None and self.previous_manifest.digest == self.digest:
+            # 문서가 그대로여서 한글을 열지 않은 경우에는 이전 지문을 그대로 옮긴다.
+            previous = {entry["ordinal"]: entry.get("prescan") for entry in self.previous_manifest.entries}
+            for entry in self.run_manifest.entries:
+                entry["prescan"] = previous.get(entry["ordinal"])
+        self.run_manifest.save()
+
     def extract_tables(self, range_list, update_progress_callback):
+        self.tracer = Tracer(self.trace_file if self.settings["trace"] else None, os.path.basename(self.file))
+        try:
+            with self.tracer.span("extract_tables", ranges=",".join(map(str, range_list))):
+                self.extract_ranges(range_list, update_progress_callback)
+        finally:
+            self.tracer.save()
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+
+    def extract_ranges(self, range_list, update_progress_callback):
         
-        self.prepare_extraction()
+        self.prepare_extraction(range_list)
 
         self.total_pages = 1 if len(range_list) == 1 else sum(range_list[i+1] - range_list[i] + 1 for i in range(0, len(range_list), 2))
         logging.warning(f"Total Pages : {self.total_pages}")
@@ -635,6 +3150,7 @@ class HwpConverter:
 
         for i in range(0, len(range_list), 2):
             logging.info(f"i : {i}")
+            self.range_index = i // 2
 
             if self.cancel_extraction:
                 logging.warning("Extraction cancelled by user")
@@ -644,64 +3160,490 @@ class HwpConverter:
             end_page = range_list[i+1] if i+1 < len(range_list) else 10000
             logging.info(f"initial_page : {initial_page}, end_page : {end_page}")
 
-            if i == 0:
-                self.ws = self.wb.Worksheets(1)
-            else:
-                self.ws = self.wb.Worksheets.Add()
+            self.add_sheet()
+            if i > 0:
                 self.row_index = 1
                 logging.info("new sheet added")
+            if self.restore_range():
+                continue
 
             update_progress_callback(status=f"Extracting sheets...{i//2 + 1}/{(len(range_list)+1)//2}")
             logging.info(f"Extracting Sheet #{i//2+1}")
 
             try:
-                update_progress_callback(status=f"Moving to start page {initial_page}...")
-                self.go_to_start_page(initial_page)
-                update_progress_callback(status=f"Exporting pages {initial_page} to {end_page}...")
-                logging.info(f"Exporting Pages {initial_page}~{end_page}")
-                self.copy_paste_to_endpage(end_page, update_progress_callback)
+                if self.table_cache is not None and self.table_cache.covers(initial_page, end_page):
+                    update_progress_callback(status=f"Loading pages {initial_page} to {end_page} from cache...")
+                    logging.info(f"Exporting Pages {initial_page}~{end_page} from table cache")
+                    with self.tracer.span("cache_render", first_page=initial_page, last_page=end_page):
+                        self.export_cached_range(initial_page, end_page, update_progress_callback)
+                    if self.checkpoint is not None and not self.cancel_extraction:
+                        self.checkpoint.finish_range(self.range_index)
+                    continue
+
+                if self.backend != "com":
+                    update_progress_callback(status=f"Exporting pages {initial_page} to {end_page}...")
+                    logging.info(f"Exporting Pages {initial_page}~{end_page}")
+                    self.export_native_range(initial_page, end_page, update_progress_callback)
+                else:
+                    update_progress_callback(status=f"Moving to start page {initial_page}...")
+                    with self.tracer.span("seek", page=initial_page):
+                        if self.resume_after is not None:
+                            self.move_to_table(self.resume_after + 1)
+                        else:
+                            self.go_to_start_page(initial_page)
+                    update_progress_callback(status=f"Exporting pages {initial_page} to {end_page}...")
+                    logging.info(f"Exporting Pages {initial_page}~{end_page}")
+                    self.copy_paste_to_endpage(end_page, update_progress_callback)
+
+                # 스트리밍 출력은 표를 모아두지 않으므로 캐시를 채우지 않는다.
+                if self.table_cache is not None and self.sink is None and not self.cancel_extraction:
+                    self.table_cache.cover(initial_page, end_page)
+                if self.checkpoint is not None and not self.cancel_extraction:
+                    self.checkpoint.finish_range(self.range_index)
             except Exception as e:
                 logging.error("restarting disabled.")
                 # self.resume_extraction(range_list,update_progress_callback)
                 raise Exception("extraction failure")
         
         logging.info("for clause escaped")
-        if self.wb != None : 
-            self.wb.Save()
-            logging.info("excel temp save")
+        if self.table_filter is not None:
+            logging.info(f"{self.filtered_tables} tables filtered out")
+
+        if self.table_cache is not None:
+            with self.tracer.span("cache_save"):
+                self.table_cache.save(int(self.settings["cacheMaxMB"] * 1024 * 1024))
+
+        if self.run_manifest is not None and not self.cancel_extraction:
+            self.finish_incremental(range_list)
 
         self.current_page = 1
         logging.info("Page Resetted to 1")
 
         if self.cancel_extraction:
-            if self.wb:
-                self.wb.Save()
+            with self.tracer.span("save"):
+                self.save_workbook()
             self.close_excel_file()
+            self.close_hwp_file()
             logging.info("Extraction cancelled, partial results saved.")
             return
             
         update_progress_callback(status="Rearranging Excel...")
-        self.rearrange_demos()
-        self.wb.Save()
+        with self.tracer.span("rearrange_demos"):
+            self.rearrange_demos()
+        update_progress_callback(status="Writing Excel...")
+        with self.tracer.span("save", output=self.settings["output"]):
+            self.save_workbook()
+        if self.checkpoint is not None:
+            self.checkpoint.delete()
         logging.info("Exportation Successful.")
         update_progress_callback(progress=100, status="Export Completed.")    
         
-        if self.settings["doOpenHwp"]:
+        if self.backend != "com":
+            self.close_hwp_file()
+        elif self.settings["doOpenHwp"]:
             if self.hwp:
                 self.hwp.set_visible(visible=True)
             else:
-                self.open_hwp_file
+                self.open_hwp_file()
                 self.hwp.set_visible(visible=True)
         else:
             self.close_hwp_file()            
 
-        if self.settings["doOpenXlsx"]:
+        if self.settings["output"] != "excel":
+            if self.settings["output"] == "xlsx" and self.settings["doOpenXlsx"] and hasattr(os, "startfile"):
+                os.startfile(self.save_file)
+            self.close_excel_file()
+        elif self.settings["doOpenXlsx"]:
             self.excel.Visible = True
         else:
             self.close_excel_file()
 
+def page_ranges(range_list):
+    for i in range(0, len(range_list), 2):
+        yield range_list[i], range_list[i+1] if i+1 < len(range_list) else 10000
+
+def parse_page_range(range_str):
+    try:
+        return [int(k) for k in re.split('[:,.~ ]', range_str) if k]
+    except ValueError:
+        raise Exception("invalid Datatype.")
+
+# CHANGELOG V1.1.0: 여러 문서와 범위를 프로세스 풀로 나눠 변환하는 일괄 처리
+#
+# 매니페스트는 {"document", "ranges", "output"} 작업의 목록(또는 {"jobs": [...]})이다. 작업마다 독립적으로 실패하고
+# 정해진 횟수만큼 다시 시도하며, 각 작업자 프로세스는 자기만의 HwpConverter(와 한글/엑셀 또는 직접 읽기 백엔드)를 가진다.
+def load_batch_manifest(path):
+    with open(path, "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+    jobs = manifest["jobs"] if isinstance(manifest, dict) else manifest
+    base = os.path.dirname(os.path.abspath(path))
+    for job in jobs:
+        job["document"] = os.path.join(base, job["document"])
+        if job.get("output"):
+            job["output"] = os.path.join(base, job["output"])
+    return jobs
+
+def run_batch_job(job, settings=None, retries=1, update_progress_callback=None, converter=None):
+    started = time.perf_counter()
+    document = job["document"]
+    output = job.get("output") or os.path.splitext(document)[0] + "_변환됨.xlsx"
+    ranges = job.get("ranges", "1:10000")
+    result = {"document": document, "output": output, "status": "failed", "attempts": 0, "tables": 0}
+
+    if converter is None:
+        converter = HwpConverter()
+    else:
+        # 서비스 작업자는 변환기를 계속 쓰므로 앞 작업의 설정이 남지 않게 매번 새로 읽는다.
+        converter.settings = read_settings()
+    converter.settings.update(settings or {})
+    converter.settings.update(doOpenHwp=False, doOpenXlsx=False)
+    # 작업자 프로세스들이 같은 추적 파일을 덮어쓰지 않도록 문서마다 따로 남긴다.
+    converter.trace_file = os.path.join(DATA_DIR, f"{os.path.splitext(os.path.basename(document))[0]}.trace.json")
+    converter.file = document
+    converter.baseline_file = job.get("baseline")
+    converter.export_path = os.path.dirname(os.path.abspath(output))
+    converter.filename = os.path.basename(output)
+    for attempt in range(1, retries + 2):
+        result["attempts"] = attempt
+        try:
+            converter.extract_tables(parse_page_range(ranges) if isinstance(ranges, str) else list(ranges), update_progress_callback or (lambda **kwargs: None))
+            result.update(status="ok", tables=converter.exported_pages, output=converter.save_file or output, error=None)
+            break
+        except Exception as e:
+            logging.error(f"batch job failed ({document}, attempt {attempt}) : {e}")
+            result["error"] = str(e)
+            converter.close_hwp_file()
+            converter.close_excel_file()
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+def run_batch(jobs, workers=None, retries=1, settings=None, summary_file=None):
+    started = time.perf_counter()
+    results = []
+    options = {**read_settings(), **(settings or {})}
+    setup_logging(options["logLevel"], options["logMaxMB"], options["logBackups"])
+    # 작업자의 로그는 프로세스 간 큐로 받아 이 프로세스의 파일 핸들러로 넘긴다.
+    log_queue = multiprocessing.Queue()
+    forwarder = QueueListener(log_queue, *log_listener.handlers) if log_listener else None
+    pool_options = {"initializer": setup_worker_logging, "initargs": (options["logLevel"], log_queue)} if forwarder else {}
+    if forwarder:
+        forwarder.start()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, **pool_options) as pool:
+            futures = {pool.submit(run_batch_job, job, settings, retries): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    results.append(future.result())
+                except BrokenProcessPool as e:
+                    # 작업자 프로세스가 통째로 죽은 경우에도 나머지 작업의 결과는 요약에 남긴다.
+                    results.append({"document": job["document"], "output": job.get("output"), "status": "failed", "error": f"worker crashed : {e}"})
+                logging.info("batch job finished : %s (%s)", results[-1]["document"], results[-1]["status"])
+    finally:
+        if forwarder:
+            forwarder.stop()
+
+    summary = {
+        "jobs": len(jobs),
+        "succeeded": sum(result["status"] == "ok" for result in results),
+        "failed": sum(result["status"] != "ok" for result in results),
+        "tables": sum(result.get("tables", 0) for result in results),
+        "seconds": round(time.perf_counter() - started, 3),
+        "results": sorted(results, key=lambda result: result["document"]),
+    }
+    logging.info(f"batch finished : {summary['succeeded']}/{summary['jobs']} succeeded in {summary['seconds']}s")
+    if summary_file:
+        with open(summary_file, "w", encoding="utf-8") as file:
+            json.dump(summary, file, ensure_ascii=False, indent="\t")
+    return summary
+
+# CHANGELOG V1.1.0: 여러 문서를 한 통합 문서로 합치기 (merge 명령)
+#
+# 문서마다 평소처럼 추출과 재배치까지 한 뒤 저장하는 대신 시트를 WorkbookMerger로 넘긴다. 표마다 table_fingerprint로 지문을
+# 만들어 처음 나온 표만 그 문서의 시트("D<문서 번호> <시트 이름>")에 남기고, 겹치는 표는 버린 채 처음 저장된 위치만 기록한다.
+# 맨 앞 Index 시트에는 모든 표가 한 줄씩 (문서, 시트, 페이지, 표 번호, 표 ID, 저장 위치, 중복 여부)로 들어가므로
+# 엑셀에 쓰는 표와 쓰는 시간은 서로 다른 표의 수에만 비례한다. 남긴 표는 하나의 MemoryBudget을 나눠 쓴다.
+MERGE_INDEX_HEADER = ["Doc", "Document", "Sheet", "Page", "Table", "Table ID", "Stored at", "Duplicate"]
+
+class WorkbookMerger:
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.documents = []
+        self.sheets = []
+        self.locations = {}
+        self.index = []
+
+    def add_document(self, document, sheets):
+        self.documents.append(document)
+        number = len(self.documents)
+        for sheet in sheets:
+            merged = SheetModel(f"D{number} {sheet.name}", self.budget)
+            row_index = 1
+            for table in sheet.tables.drain():
+                fingerprint = table_fingerprint(table)
+                location = self.locations.get(fingerprint)
+                duplicate = location is not None
+                if not duplicate:
+                    location = self.locations[fingerprint] = (f"T{len(self.locations) + 1}", f"'{merged.name}'!A{row_index}")
+                    merged.tables.append(table)
+                    row_index += table.n_rows + 2
+                self.index.append([
+                    str(number), os.path.basename(document), sheet.name, "" if table.page is None else str(table.page),
+                    "" if table.ordinal is None else str(table.ordinal + 1), location[0], location[1], "yes" if duplicate else "",
+                ])
+            if len(merged.tables):
+                self.sheets.append(merged)
+            else:
+                merged.tables.close()
+        logging.info(f"merged {document} : {len(self.index)} tables so far, {len(self.locations)} unique")
+
+    def workbook_sheets(self):
+        index = Table()
+        index.rows = [list(MERGE_INDEX_HEADER)] + self.index
+        sheet = SheetModel("Index")
+        sheet.tables.append(index)
+        return [sheet] + self.sheets
+
+    def close(self):
+        for sheet in self.sheets:
+            sheet.tables.close()
+
+def run_merge(documents, output, settings=None, ranges="1:10000", update_progress_callback=None):
+    started = time.perf_counter()
+    converter = HwpConverter()
+    converter.settings.update(settings or {})
+    output_kind = converter.settings["output"]
+    if output_kind not in ("xlsx", "excel"):
+        raise ValueError(f"merge writes one workbook; use xlsx or excel output instead of {output_kind}")
+    # 문서마다 표를 시트 모델에만 모으고, 한글은 문서 사이에 끄지 않는다.
+    converter.settings.update(output="xlsx", doOpenHwp=False, doOpenXlsx=False, checkpoint=False, incremental=False)
+    converter.keep_apps = True
+    merger = WorkbookMerger(MemoryBudget(int(converter.settings["maxMemoryMB"] * 1024 * 1024)))
+    converter.export_path = os.path.dirname(os.path.abspath(output))
+    converter.filename = os.path.basename(output)
+    try:
+        converter.merger = merger
+        for number, document in enumerate(documents, start=1):
+            if update_progress_callback is not None:
+                update_progress_callback(status=f"Extracting document {number}/{len(documents)} : {document}")
+            converter.file = document
+            converter.extract_tables(parse_page_range(ranges) if isinstance(ranges, str) else list(ranges), update_progress_callback or (lambda **kwargs: None))
+        converter.merger = None
+        converter.settings["output"] = output_kind
+        converter.memory_budget = merger.budget
+        converter.open_excel_file()
+        converter.sheets = merger.workbook_sheets()
+        with converter.tracer.span("save", output=output_kind):
+            converter.save_workbook()
+    finally:
+        converter.merger = None
+        merger.close()
+        converter.quit_apps()
+    summary = {
+        "output": converter.save_file,
+        "documents": len(documents),
+        "tables": len(merger.index),
+        "unique": len(merger.locations),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logging.info(f"merge finished : {summary['tables']} tables, {summary['unique']} unique, {summary['output']}")
+    return summary
+
+# CHANGELOG V1.1.0: 한글과 엑셀을 켜 둔 채 작업을 이어 받는 변환 서비스 (serve 명령)
+#
+# 작업마다 한글과 엑셀을 새로 띄우면 시작하는 데만 몇 초씩 걸린다. 서비스는 작업자 스레드마다 변환기 하나를 두고
+# 프로그램을 미리 띄워 둔 채(keep_apps) 로컬 HTTP로 받은 작업을 큐에서 꺼내 차례로 처리한다. 작업 사이에는
+# check_apps로 프로그램이 응답하는지 확인하고, 죽었으면 다음 작업에서 새로 띄운다.
+# 한글이 없는 환경에서는 직접 읽기 백엔드(hwpx/hwp5)와 xlsx 출력으로 같은 방식으로 돌아간다.
+#
+#   POST /jobs        {"document": ..., "ranges": "1:100", "output": ..., "settings": {...}, "wait": false}
+#   GET  /jobs/<id>   작업 상태와 결과
+#   GET  /stats       큐 길이, 처리 수, 대기·처리 시간 통계
+#   GET  /health      작업자 상태
+class ConversionService:
+    def __init__(self, workers=1, settings=None, retries=1, history=1000):
+        self.settings = settings or {}
+        self.retries = retries
+        self.queue = queue.Queue()
+        self.jobs = {}
+        self.history = history
+        self.lock = threading.Lock()
+        self.finished = threading.Condition(self.lock)
+        self.counts = {"submitted": 0, "ok": 0, "failed": 0}
+        self.wait_times = []
+        self.run_times = []
+        self.workers = [{"index": index, "state": "starting", "jobs": 0, "restarts": 0} for index in range(workers)]
+        self.threads = [threading.Thread(target=self.work, args=(worker,), name=f"worker-{worker['index']}", daemon=True) for worker in self.workers]
+        self.started = time.time()
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def submit(self, job):
+        if not isinstance(job, dict):
+            raise ValueError("job must be a JSON object")
+        if not job.get("document"):
+            raise ValueError("job needs a document")
+        job_id = hashlib.sha1(f"{time.time_ns()}{id(job)}".encode()).hexdigest()[:12]
+        with self.lock:
+            self.counts["submitted"] += 1
+            self.jobs[job_id] = {"id": job_id, "status": "queued", "document": job["document"], "submitted": time.time()}
+            # 오래된 완료 작업은 지워서 기록이 끝없이 늘지 않게 한다.
+            while len(self.jobs) > self.history:
+                oldest = next((key for key, value in self.jobs.items() if value["status"] in ("ok", "failed")), None)
+                if oldest is None:
+                    break
+                del self.jobs[oldest]
+        self.queue.put((job_id, job, time.perf_counter()))
+        return job_id
+
+    def status(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def wait(self, job_id, timeout=None):
+        with self.finished:
+            self.finished.wait_for(lambda: self.jobs.get(job_id, {}).get("status") not in ("queued", "running"), timeout)
+        return self.status(job_id)
+
+    def warm_up(self, converter):
+        backend = self.settings.get("backend", converter.settings["backend"])
+        output = self.settings.get("output", converter.settings["output"])
+        # auto는 .hwp 문서를 한글로 읽으므로 한글이 있는 윈도우에서는 함께 띄워 둔다.
+        if backend == "com" or (backend == "auto" and sys.platform == "win32"):
+            load_hwp_module()
+            converter.hwp = Hwp(visible=not converter.settings["isHwpVisible"], new=True, register_module="./FilePathCheckeModule.dll")
+        if output == "excel":
+            load_excel_module()
+            converter.excel = win32.gencache.EnsureDispatch("Excel.Application")
+
+    def work(self, worker):
+        if sys.platform == "win32":
+            import pythoncom
+            pythoncom.CoInitialize()
+        converter = HwpConverter()
+        converter.keep_apps = True
+        try:
+            self.warm_up(converter)
+        except Exception as e:
+            logging.error(f"worker {worker['index']} could not start the backends; they will be started by the first job : {e}")
+        worker["state"] = "idle"
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                job_id, job, queued = item
+                started = time.perf_counter()
+                with self.lock:
+                    self.jobs[job_id].update(status="running", worker=worker["index"])
+                worker["state"] = "busy"
+                if not converter.check_apps():
+                    worker["restarts"] += 1
+                try:
+                    result = run_batch_job(job, {**self.settings, **job.get("settings", {})}, self.retries, converter=converter)
+                except Exception as e:
+                    logging.error(f"service job {job_id} failed : {e}")
+                    result = {"document": job["document"], "status": "failed", "error": str(e)}
+                finished = time.perf_counter()
+                worker["state"] = "idle"
+                worker["jobs"] += 1
+                with self.finished:
+                    self.counts[result["status"]] += 1
+                    self.wait_times = (self.wait_times + [started - queued])[-self.history:]
+                    self.run_times = (self.run_times + [finished - started])[-self.history:]
+                    self.jobs[job_id].update(status=result["status"], result=result)
+                    self.finished.notify_all()
+        finally:
+            converter.quit_apps()
+            worker["state"] = "stopped"
+
+    def stats(self):
+        def summary(values):
+            if not values:
+                return {"count": 0}
+            ordered = sorted(values)
+            def percentile(p):
+                return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+            return {"count": len(ordered), "mean": round(sum(ordered) / len(ordered), 3), "p50": percentile(0.5), "p95": percentile(0.95), "max": round(ordered[-1], 3)}
+
+        with self.lock:
+            return {
+                "uptime": round(time.time() - self.started, 1),
+                "queued": self.queue.qsize(),
+                "running": sum(worker["state"] == "busy" for worker in self.workers),
+                **self.counts,
+                "wait_seconds": summary(self.wait_times),
+                "run_seconds": summary(self.run_times),
+                "workers": [dict(worker) for worker in self.workers],
+            }
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/stats":
+            return self.send_json(200, self.service.stats())
+        if self.path == "/health":
+            workers = self.service.stats()["workers"]
+            return self.send_json(200 if all(worker["state"] != "stopped" for worker in workers) else 503, {"workers": workers})
+        if self.path.startswith("/jobs/"):
+            job = self.service.status(self.path[len("/jobs/"):])
+            return self.send_json(200, job) if job else self.send_json(404, {"error": "unknown job"})
+        self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/jobs":
+            return self.send_json(404, {"error": "not found"})
+        try:
+            job = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            job_id = self.service.submit(job)
+        except ValueError as e:
+            return self.send_json(400, {"error": str(e)})
+        if job.get("wait"):
+            return self.send_json(200, self.service.wait(job_id))
+        self.send_json(202, self.service.status(job_id))
+
+    def log_message(self, format, *args):
+        logging.debug("service request : " + format, *args)
+
+def run_service(host="127.0.0.1", port=8765, workers=1, settings=None, retries=1):
+    options = {**read_settings(), **(settings or {})}
+    setup_logging(options["logLevel"], options["logMaxMB"], options["logBackups"])
+    service = ConversionService(workers, settings, retries)
+    handler = type("Handler", (ServiceRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    service.start()
+    logging.info(f"conversion service listening on http://{host}:{server.server_address[1]} with {workers} workers")
+    print(f"listening on http://{host}:{server.server_address[1]}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+    return 0
+
 class GUI:
     def __init__(self, converter):
+        load_gui_modules()
         self.converter = converter
         self.window = tk.Tk()
         self.setup_ui()
@@ -709,7 +3651,7 @@ class GUI:
         self.is_extracting = False
 
     def setup_ui(self):
-        self.window.title(f"TableExporter v{VERSION} {"(unstable)" if not IS_STABLE else ""}")
+        self.window.title(f"TableExporter v{VERSION} {'(unstable)' if not IS_STABLE else ''}")
         self.window.resizable(width=False, height=False)
 
         notebook = ttk.Notebook(self.window, width=505, height=253)
@@ -782,6 +3724,17 @@ class GUI:
         self.special_mode = tk.IntVar(value=int(self.converter.settings['SPMode']))
         ttk.Checkbutton(self.tab2, text="첫 번째 시트를 데모의 위치에 따라 분리합니다.", variable=self.special_mode).place(x=10,y=90)
 
+        self.backend = tk.StringVar(value=self.converter.settings['backend'])
+        ttk.Label(self.tab2, text="추출 방식").place(x=10, y=120)
+        ttk.Combobox(self.tab2, state="readonly", values=BACKENDS, textvariable=self.backend).place(x=100, y=120, width=120)
+
+        self.incremental = tk.IntVar(value=int(self.converter.settings['incremental']))
+        ttk.Checkbutton(self.tab2, text="바뀐 표만 다시 추출합니다.", variable=self.incremental).place(x=240, y=120)
+
+        self.output = tk.StringVar(value=self.converter.settings['output'])
+        ttk.Label(self.tab2, text="출력 방식").place(x=10, y=150)
+        ttk.Combobox(self.tab2, state="readonly", values=OUTPUTS, textvariable=self.output).place(x=100, y=150, width=120)
+
         # CHANGELOG V1.0.0: 추출 방식 변화로 인한 안정화로 딜레이/재시도 횟수 옵션 삭제.
         # @deprecated 
         # self.copy_paste_delay = tk.StringVar(value=str(self.converter.settings['copyPasteDelay']))
@@ -828,11 +3781,7 @@ class GUI:
             self.range_entry.insert(0, "추출할 범위 입력. ex) 124:200, 203:400")
 
     def get_page_range(self):
-        range_str = self.range_string.get()
-        try:
-            return [int(k) for k in re.split('[:,.~ ]', range_str) if k]
-        except ValueError:
-            raise Exception("invalid Datatype.")
+        return parse_page_range(self.range_string.get())
     
     # CHANGELOG V1.0.0: 안정화에 따른 설정 요소 제거 
     def save_settings(self):
@@ -841,6 +3790,9 @@ class GUI:
         self.converter.settings["doOpenHwp"] = bool(self.do_open_hwp.get())
         self.converter.settings["doOpenXlsx"] = bool(self.do_open_xlsx.get())
         self.converter.settings["SPMode"] = bool(self.special_mode.get())
+        self.converter.settings["backend"] = self.backend.get()
+        self.converter.settings["output"] = self.output.get()
+        self.converter.settings["incremental"] = bool(self.incremental.get())
         # self.converter.settings["copyPasteDelay"] = float(self.copy_paste_delay.get())
         # self.converter.settings["retryLife"] = int(self.retry_life.get())
         self.converter.save_settings()
@@ -913,12 +3865,250 @@ class GUI:
                 pass
         self.window.destroy()
 
-def main():
+# CHANGELOG V1.1.0: GUI 없이 쓸 수 있는 명령줄 진입점 (python -m HwpExporter export/batch/gui)
+def cli_settings(args, document=None):
+    settings = {}
+    if args.backend:
+        settings["backend"] = args.backend
+    backend = args.backend
+    if backend in (None, "auto") and document and document.lower().endswith(".hwpx"):
+        backend = "hwpx"
+    if args.format:
+        settings["output"] = args.format
+    elif backend in NATIVE_READERS:
+        # 한글 없이 읽는 환경이면 엑셀(COM)도 없을 가능성이 높으므로 따로 지정하지 않으면 xlsx로 바로 쓴다.
+        settings["output"] = "xlsx"
+    if args.sp_mode is not None:
+        settings["SPMode"] = args.sp_mode
+    if args.no_cache:
+        settings["useCache"] = False
+    if args.incremental:
+        settings["incremental"] = True
+    table_filter = {
+        "header": args.header or "",
+        "minRows": args.min_rows, "maxRows": args.max_rows,
+        "minCols": args.min_cols, "maxCols": args.max_cols,
+        "pages": args.filter_pages or "", "columns": args.columns or "",
+    }
+    if any(table_filter.values()):
+        settings["tableFilter"] = table_filter
+    return settings
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="HwpExporter", description=f"TableExporter v{VERSION}")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("gui", help="open the GUI (default)")
+
+    export = commands.add_parser("export", help="export tables of one document")
+    export.add_argument("document")
+    export.add_argument("--ranges", default="1:10000", help="page ranges, ex) 124:200,203:400")
+    export.add_argument("-o", "--output", help="output workbook (default: <document>_변환됨.xlsx)")
+    export.add_argument("-q", "--quiet", action="store_true", help="do not print progress")
+    export.add_argument("--baseline", help="document of the previous run to compare with (default: the same path)")
+
+    batch = commands.add_parser("batch", help="export every job of a manifest in a process pool")
+    batch.add_argument("manifest")
+    batch.add_argument("--workers", type=int, default=None)
+    batch.add_argument("--retries", type=int, default=1)
+    batch.add_argument("--summary", help="write the summary json to this file")
+
+    serve = commands.add_parser("serve", help="run a local HTTP conversion service that keeps Hwp and Excel running between jobs")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=int, default=1)
+    serve.add_argument("--retries", type=int, default=1)
+
+    merge = commands.add_parser("merge", help="export several documents into one workbook, storing each distinct table once")
+    merge.add_argument("documents", nargs="+")
+    merge.add_argument("-o", "--output", required=True, help="merged workbook")
+    merge.add_argument("--ranges", default="1:10000", help="page ranges applied to every document")
+    merge.add_argument("-q", "--quiet", action="store_true", help="do not print progress")
+
+    for command in (export, batch, serve, merge):
+        command.add_argument("--backend", choices=BACKENDS)
+        command.add_argument("--format", choices=OUTPUTS)
+        command.add_argument("--sp-mode", action=argparse.BooleanOptionalAction, default=None)
+        command.add_argument("--no-cache", action="store_true", help="neither read nor update the table cache")
+        command.add_argument("--incremental", action="store_true", help="compare with the previous run, reuse unchanged tables and write a change report")
+        command.add_argument("--header", help="keep only tables whose first row matches this regular expression")
+        command.add_argument("--min-rows", type=int, default=0)
+        command.add_argument("--max-rows", type=int, default=0)
+        command.add_argument("--min-cols", type=int, default=0)
+        command.add_argument("--max-cols", type=int, default=0)
+        command.add_argument("--filter-pages", help="keep only tables on these pages, ex) 3-5,9")
+        command.add_argument("--columns", help="keep only these columns (1-based), ex) 1-2,5")
+
+    rearrange = commands.add_parser("rearrange", help="move demo columns and split Sheet1 of a workbook that was saved before rearranging")
+    rearrange.add_argument("workbook")
+    rearrange.add_argument("-o", "--output", help="rearranged workbook (default: <workbook>(1).xlsx, or the workbook itself with --excel)")
+    rearrange.add_argument("--excel", action="store_true", help="open the workbook in Excel and rewrite it in place, or save it as --output")
+    rearrange.add_argument("--force", action="store_true", help="rearrange even if the first sheet was already split")
+    rearrange.add_argument("--sp-mode", action=argparse.BooleanOptionalAction, default=None)
+
+    verify = commands.add_parser("verify-pages", help="compare table pages found without Hwp against Hwp's layout or a saved reference")
+    verify.add_argument("documents", nargs="+")
+    verify.add_argument("--reference", help="json of document name -> table pages; documents missing from it are opened in Hwp")
+    verify.add_argument("--save-reference", help="write the reference pages (including the ones read from Hwp) to this file")
+    verify.add_argument("--min-accuracy", type=float, default=0.95, help="exit 1 when a document matches fewer tables than this")
+    verify.add_argument("--show", type=int, default=5, help="mismatched tables to print per document")
+
+    cache = commands.add_parser("cache", help="manage the table cache")
+    cache.add_argument("action", choices=("clear",))
+    cache.add_argument("documents", nargs="*", help="documents to drop from the cache (default: everything)")
+    return parser
+
+def run_export_command(args):
+    def print_progress(progress=None, status=None):
+        if status is not None and not args.quiet:
+            print(status, file=sys.stderr)
+
+    job = {"document": os.path.abspath(args.document), "ranges": args.ranges, "output": args.output and os.path.abspath(args.output), "baseline": args.baseline and os.path.abspath(args.baseline)}
+    result = run_batch_job(job, cli_settings(args, job["document"]), retries=0, update_progress_callback=print_progress)
+    if result["status"] != "ok":
+        print(f"export failed : {result['error']}", file=sys.stderr)
+        return 1
+    print(result["output"])
+    return 0
+
+def run_batch_command(args):
+    summary = run_batch(load_batch_manifest(args.manifest), workers=args.workers, retries=args.retries, settings=cli_settings(args), summary_file=args.summary)
+    for result in summary["results"]:
+        print(f"{result['status']}\t{result['document']}\t{result.get('output') or result.get('error')}")
+    print(f"{summary['succeeded']}/{summary['jobs']} succeeded in {summary['seconds']}s", file=sys.stderr)
+    return 0 if summary["failed"] == 0 else 1
+
+def run_rearrange_command(args):
+    converter = HwpConverter()
+    converter.settings["output"] = "excel" if args.excel else "xlsx"
+    if args.sp_mode is not None:
+        converter.settings["SPMode"] = args.sp_mode
+    try:
+        print(converter.rearrange_workbook(os.path.abspath(args.workbook), args.output and os.path.abspath(args.output), args.force))
+    except ValueError as e:
+        print(f"rearrange failed : {e}", file=sys.stderr)
+        return 1
+    return 0
+
+def run_merge_command(args):
+    def print_progress(progress=None, status=None):
+        if status is not None and not args.quiet:
+            print(status, file=sys.stderr)
+
+    documents = [os.path.abspath(document) for document in args.documents]
+    try:
+        summary = run_merge(documents, os.path.abspath(args.output), cli_settings(args, documents[0]), args.ranges, print_progress)
+    except Exception as e:
+        print(f"merge failed : {e}", file=sys.stderr)
+        return 1
+    print(summary["output"])
+    print(f"{summary['tables']} tables from {summary['documents']} documents, {summary['unique']} unique, {summary['seconds']}s", file=sys.stderr)
+    return 0
+
+def run_serve_command(args):
+    return run_service(args.host, args.port, args.workers, cli_settings(args), args.retries)
+
+# CHANGELOG V1.1.0: 직접 읽기 페이지 계산 검증 (python -m HwpExporter verify-pages)
+#
+# 문서마다 PageResolver로 센 표의 페이지를 기준 페이지와 표 순번별로 맞춰 본다. 기준은 --reference 파일(문서 이름 -> 페이지 목록)에
+# 있으면 그것을, 없으면 한글(COM)을 열어 PageIndex.build로 얻는다. --save-reference로 한글에서 얻은 기준을 남겨 두면
+# 한글이 없는 환경에서도 같은 기준 문서들로 다시 검증할 수 있다.
+def native_table_pages(document):
+    reader = NATIVE_READERS["hwpx" if document.lower().endswith(".hwpx") else "hwp5"](document)
+    reader.open()
+    try:
+        return [page for _, page, _ in PageIndex.build_native(reader).entries]
+    finally:
+        reader.close()
+
+def com_table_pages(converter, document):
+    converter.file = document
+    converter.backend = "com"
+    converter.open_hwp_file()
+    try:
+        return [page for _, page, _ in PageIndex.build(converter.hwp).entries]
+    finally:
+        converter.close_hwp_file(quit_app=False)
+
+# 표 수가 다르면 남는 표도 틀린 것으로 센다.
+def compare_table_pages(pages, reference):
+    mismatches = [(ordinal, page, expected) for ordinal, (page, expected) in enumerate(zip(pages, reference)) if page != expected]
+    tables = max(len(pages), len(reference))
+    matched = min(len(pages), len(reference)) - len(mismatches)
+    return {
+        "tables": len(pages),
+        "reference_tables": len(reference),
+        "matched": matched,
+        "accuracy": matched / tables if tables else 1.0,
+        "mismatches": mismatches,
+    }
+
+def run_verify_pages_command(args):
+    references = {}
+    if args.reference and os.path.exists(args.reference):
+        with open(args.reference, "r", encoding="utf-8") as file:
+            references = json.load(file)
+    converter = None
+    failed = 0
+    try:
+        for document in args.documents:
+            name = os.path.basename(document)
+            try:
+                pages = native_table_pages(document)
+                if name not in references:
+                    if converter is None:
+                        converter = HwpConverter()
+                    references[name] = com_table_pages(converter, os.path.abspath(document))
+            except Exception as e:
+                print(f"failed\t{document}\t{e}")
+                failed += 1
+                continue
+            result = compare_table_pages(pages, references[name])
+            print(f"{result['accuracy']:.1%}\t{result['matched']}/{max(result['tables'], result['reference_tables'])} tables\t{document}")
+            if result["tables"] != result["reference_tables"]:
+                print(f"\t{result['tables']} tables found, {result['reference_tables']} in the reference")
+            for ordinal, page, expected in result["mismatches"][:args.show]:
+                print(f"\ttable #{ordinal + 1}: page {page}, expected {expected}")
+            if result["accuracy"] < args.min_accuracy:
+                failed += 1
+    finally:
+        if converter is not None:
+            converter.quit_apps()
+    if args.save_reference:
+        with open(args.save_reference, "w", encoding="utf-8") as file:
+            json.dump(references, file, ensure_ascii=False, indent="\t")
+    print(f"{len(args.documents) - failed}/{len(args.documents)} documents at or above {args.min_accuracy:.0%}", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+def run_cache_command(args):
+    if args.documents:
+        removed = sum(TableCache.clear(file_digest(document)) for document in args.documents)
+    else:
+        removed = TableCache.clear()
+    print(f"{removed} cached documents removed", file=sys.stderr)
+    return 0
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "export":
+        return run_export_command(args)
+    if args.command == "batch":
+        return run_batch_command(args)
+    if args.command == "serve":
+        return run_serve_command(args)
+    if args.command == "merge":
+        return run_merge_command(args)
+    if args.command == "rearrange":
+        return run_rearrange_command(args)
+    if args.command == "verify-pages":
+        return run_verify_pages_command(args)
+    if args.command == "cache":
+        return run_cache_command(args)
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
     converter = HwpConverter()
     gui = GUI(converter)
     gui.run()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,758 @@
+import os
+import sys
+import time
+import json
+import zlib
+import random
+import struct
+import zipfile
+import argparse
+import tempfile
+import tracemalloc
+import multiprocessing
+from xml.sax.saxutils import escape
+
+import HwpExporter as hx
+
+# 한글/엑셀 없이(리눅스에서도) 변환 단계별 속도를 재는 벤치마크.
+#
+# 합성 표 문서를 만들어 한글(Hwp)과 엑셀(COM) 자리에 같은 메서드를 흉내 내는 객체를 끼워 넣고,
+# 페이지 색인, 원문 파싱, 배치, 추출(export_via_xml), 재배치(rearrange_demos/split_first_sheet), xlsx/COM 쓰기, HWPX/HWP 직접 읽기를
+# 단계마다 따로 잰다. 원문 파싱과 직접 읽기에서 셀에 각주 본문이 섞여 나오면 AssertionError로 멈춘다.
+# --json으로 결과를 남기고 --compare로 이전 결과와 비교하면 느려진 단계가 있을 때 1을 돌려준다.
+#
+#   python benchmark.py --tables 2000 --json base.json
+#   python benchmark.py --tables 2000 --compare base.json --max-slowdown 1.2
+#
+# --memory-check는 같은 모양의 HWPX와 HWP 문서를 --tables와 그 4배 크기로 만들어 xlsx 변환 전체를 기본 설정(표 캐시, 체크포인트,
+# 추적 포함)에 maxMemoryMB 상한만 낮춰 돌린다. 처음 실행과 표 캐시에서 다시 그리는 실행을 따로 재며, 실행마다 새 프로세스를 띄워
+# 변환 전보다 늘어난 최고 RSS를 비교한다(/proc가 없으면 tracemalloc 최고치). 문서가 커져도 최고치가 --max-growth배를 넘으면
+# 1을 돌려주므로 CI에서 그대로 검사로 쓴다.
+#
+#   python benchmark.py --tables 300 --memory-check
+#
+# --check-pages는 쪽 표시, 단 표시, 오래된 쪽 나누기, 쪽을 넘어 나뉜 표, 여러 조각으로 나뉜 줄, 구역을 담은 합성 HWPX/HWP 문서를
+# 만들어 PageIndex.build_native가 정한 표 페이지를 문서마다 적어 둔 기대 페이지와 비교하고, 하나라도 다르면 1을 돌려준다.
+#
+#   python benchmark.py --check-pages
+#
+# --com-latency는 GetTextFile마다 한글과 주고받는 시간을 흉내 내어 기다리고, --pipeline-depth는 추출 파이프라인의 큐 크기다.
+# 0이면 가져오기, 해석, 쓰기를 한 스레드에서 차례로 한다. 추출 단계의 단계별 사용률도 함께 보여 준다.
+#
+#   python benchmark.py --tables 500 --com-latency 2 --pipeline-depth 0
+#   python benchmark.py --tables 500 --com-latency 2 --pipeline-depth 4
+
+# 표 하나 = 행 목록, 행 = (ColAddr, ColSpan, RowSpan, 문단 텍스트 목록) 셀 목록
+def make_table(rnd, rows, cols, span_density, footnote_rate, demo):
+    table = []
+    for r in range(rows):
+        row = []
+        c = 0
+        while c < cols:
+            col_span = 2 if c + 1 < cols - 1 and rnd.random() < span_density else 1
+            row_span = 2 if r + 1 < rows and rnd.random() < span_density / 3 else 1
+            if c == cols - 1:
+                # 데모 표는 오른쪽 끝 열이 글자, 나머지는 숫자(천 단위 구분, 백분율 포함)이다.
+                text = f"데모{r}" if demo else rnd.choice((f"{rnd.randint(0, 10**6):,}", f"{rnd.random() * 100:.1f}%", "-", str(r * 7)))
+                paragraphs = [(text, False)]
+            else:
+                paragraphs = [(f"r{r}c{c}p{k}", rnd.random() < footnote_rate) for k in range(1 if rnd.random() < 0.8 else 2)]
+            row.append((c, col_span, row_span, paragraphs))
+            c += col_span
+        table.append(row)
+    return table
+
+def make_document(n_tables, rows, cols, span_density, footnote_rate, demo_ratio, seed):
+    rnd = random.Random(seed)
+    return [
+        make_table(
+            rnd,
+            rnd.randint(max(1, rows // 2), rows * 3 // 2),
+            rnd.randint(max(2, cols // 2), cols * 3 // 2),
+            span_density,
+            footnote_rate,
+            rnd.random() < demo_ratio,
+        )
+        for _ in range(n_tables)
+    ]
+
+# 각주 본문. 셀 값에 섞여 나오면 각주를 건너뛰지 못한 것이다.
+FOOTNOTE_TEXT = "각주"
+
+def check_footnotes(tables, stage):
+    leaked = sum(1 for table in tables for row in table.rows for text in row if text and FOOTNOTE_TEXT in text)
+    if leaked:
+        raise AssertionError(f"{stage}: footnote text leaked into {leaked} cells")
+
+# GetTextFile("HWPML2X", "saveblock")이 돌려주는 모양을 흉내 낸다. 블록 뒤의 TAIL(그림 데이터 등)까지 붙인다.
+def to_hwpml(table):
+    out = ['<?xml version="1.0" encoding="UTF-16" standalone="no" ?><HWPML Version="2.8"><HEAD/><BODY><SECTION><P><TEXT>']
+    out.append(f'<TABLE RowCount="{len(table)}"><SHAPEOBJECT/>')
+    for r, row in enumerate(table):
+        out.append("<ROW>")
+        for col_addr, col_span, row_span, paragraphs in row:
+            out.append(f'<CELL ColAddr="{col_addr}" RowAddr="{r}" ColSpan="{col_span}" RowSpan="{row_span}"><PARALIST>')
+            for text, footnote in paragraphs:
+                note = f"<FOOTNOTE><PARALIST><P><TEXT><CHAR>{FOOTNOTE_TEXT}</CHAR></TEXT></P></PARALIST></FOOTNOTE>" if footnote else ""
+                out.append(f"<P><TEXT><CHAR>{escape(text)}</CHAR>{note}</TEXT></P>")
+            out.append("</PARALIST></CELL>")
+        out.append("</ROW>")
+    out.append('</TABLE></TEXT></P></SECTION></BODY><TAIL><BINDATASTORAGE><BINDATA>' + "A" * 2000 + "</BINDATA></BINDATASTORAGE></TAIL></HWPML>")
+    return "".join(out)
+
+HWPX_NS = 'xmlns:hp="http://www.hancom.co.kr/hwpml/2011/paragraph" xmlns:hs="http://www.hancom.co.kr/hwpml/2011/section"'
+
+def to_hwpx_table(table):
+    out = [f'<hp:tbl rowCnt="{len(table)}">']
+    for r, row in enumerate(table):
+        out.append("<hp:tr>")
+        for col_addr, col_span, row_span, paragraphs in row:
+            out.append("<hp:tc><hp:subList>")
+            for text, footnote in paragraphs:
+                # 각주 컨트롤은 hp:t 안이 아니라 같은 hp:run 아래 hp:t 옆에 온다.
+                note = f"<hp:ctrl><hp:footNote><hp:subList><hp:p><hp:run><hp:t>{FOOTNOTE_TEXT}</hp:t></hp:run></hp:p></hp:subList></hp:footNote></hp:ctrl>" if footnote else ""
+                out.append(f"<hp:p><hp:run><hp:t>{escape(text)}</hp:t>{note}</hp:run></hp:p>")
+            out.append(f'</hp:subList><hp:cellAddr colAddr="{col_addr}" rowAddr="{r}"/><hp:cellSpan colSpan="{col_span}" rowSpan="{row_span}"/></hp:tc>')
+        out.append("</hp:tr>")
+    out.append("</hp:tbl>")
+    return "".join(out)
+
+# 한글이 저장한 문서처럼 문단마다 줄 배치 정보를 남긴다. 쪽의 첫 문단은 쪽 표시(0x01)를 달고 위에서 시작한다.
+def write_hwpx(path, tables, per_page):
+    body = "".join(
+        f'<hp:p pageBreak="{int(i > 0 and i % per_page == 0)}"><hp:run>{to_hwpx_table(table)}</hp:run>'
+        f'<hp:linesegarray><hp:lineseg textpos="0" vertpos="{i % per_page * 20000}" vertsize="1000" '
+        f'flags="{hx.LINESEG_SEGMENTS | (hx.LINESEG_PAGE_START if i % per_page == 0 else 0)}"/></hp:linesegarray></hp:p>'
+        for i, table in enumerate(tables)
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as file:
+        file.writestr("mimetype", "application/hwp+zip")
+        file.writestr("Contents/section0.xml", f"<hs:sec {HWPX_NS}>{body}</hs:sec>")
+
+# 쪽 번호 검사용 합성 문서. 한글이 저장하는 줄 배치 정보(lineseg)를 그대로 흉내 내어 PageIndex.build_native가 돌려주는 표 페이지를
+# 문서마다 적어 둔 기대 페이지와 비교한다. 문단 = (pageBreak, 줄 목록[(textpos, vertpos, flags)], 내용[("t", 글자 수) | ("tbl", 기대 페이지)])
+PAGE, COLUMN = hx.LINESEG_PAGE_START, hx.LINESEG_COLUMN_START
+FIRST, NEXT = hx.LINESEG_FIRST_SEGMENT, hx.LINESEG_SEGMENTS & ~hx.LINESEG_FIRST_SEGMENT
+WHOLE = FIRST | NEXT
+PAGE_CASES = {
+    "page_flag": [[
+        (False, [(0, 0, WHOLE | PAGE)], [("tbl", 1)]),
+        (False, [(0, 40000, WHOLE)], [("tbl", 1)]),
+        (False, [(0, 0, WHOLE | PAGE)], [("tbl", 2)]),
+        (False, [(0, 0, WHOLE | PAGE), (10, 2000, WHOLE)], [("t", 15), ("tbl", 3)]),
+    ]],
+    # 다단에서 다음 단으로 넘어가면 세로 위치가 줄어도 같은 쪽이다.
+    "column_flag": [[
+        (False, [(0, 0, WHOLE | PAGE)], [("tbl", 1)]),
+        (False, [(0, 50000, WHOLE)], [("tbl", 1)]),
+        (False, [(0, 0, WHOLE | COLUMN)], [("tbl", 1)]),
+        (False, [(0, 20000, WHOLE)], [("tbl", 1)]),
+        (False, [(0, 0, WHOLE | PAGE)], [("tbl", 2)]),
+    ]],
+    # 쪽 나누기가 있는데 첫 줄 표시가 없거나 줄 정보가 아예 없으면 배치 정보가 오래된 것이다.
+    "stale_page_break": [[
+        (False, [(0, 0, WHOLE | PAGE)], [("tbl", 1)]),
+        (True, [(0, 0, WHOLE | PAGE)], [("tbl", 2)]),
+        (True, [], [("tbl", 3)]),
+        (True, [(0, 100, WHOLE)], [("tbl", 4)]),
+        (False, [], [("t", 3)]),
+        (False, [(0, 5000, WHOLE)], [("tbl", 4)]),
+    ]],
+    # 쪽을 넘어 나뉜 표는 시작한 쪽에 두고, 다음 문단이 새 쪽의 위쪽에서 시작한다.
+    "split_table": [[
+        (False, [(0, 0, WHOLE | PAGE)], [("tbl", 1)]),
+        (False, [(0, 30000, WHOLE)], [("tbl", 1)]),
+        (False, [(0, 10000, WHOLE)], [("t", 4)]),
+        (False, [(0, 20000, WHOLE)], [("tbl", 2)]),
+        (False, [(0, 60000, WHOLE)], [("tbl", 2)]),
+        (False, [(0, 3000, WHOLE)], [("tbl", 3)]),
+    ]],
+    # 한 줄이 여러 조각으로 나뉘면 첫 조각만 센다. 뒤 조각에 붙은 쪽 표시는 같은 줄이다.
+    "multi_segment_line": [[
+        (False, [(0, 0, WHOLE | PAGE)], [("tbl", 1)]),
+        (False, [(0, 5000, FIRST | PAGE), (4, 5000, NEXT | PAGE)], [("t", 6), ("tbl", 2)]),
+        (False, [(0, 9000, FIRST), (4, 9000, NEXT), (8, 0, WHOLE | PAGE)], [("t", 5), ("tbl", 2), ("t", 12), ("tbl", 3)]),
+    ]],
+    # 한 문단의 표가 줄을 따라 여러 쪽에 놓인다.
+    "tables_across_lines": [[
+        (False, [(0, 0, WHOLE | PAGE)], [("tbl", 1)]),
+        (False, [(0, 50000, WHOLE), (20, 0, WHOLE | PAGE)], [("t", 5), ("tbl", 1), ("t", 12), ("tbl", 2)]),
+    ]],
+    # 구역은 새 쪽에서 시작하고, 구역 첫 문단의 쪽 나누기는 쪽을 더하지 않는다.
+    "sections": [
+        [
+            (False, [(0, 0, WHOLE | PAGE)], [("tbl", 1)]),
+            (False, [(0, 0, WHOLE | PAGE)], [("tbl", 2)]),
+        ],
+        [
+            (True, [(0, 0, WHOLE | PAGE)], [("tbl", 3)]),
+            (False, [(0, 0, WHOLE | PAGE)], [("t", 2), ("tbl", 4)]),
+        ],
+        [
+            (False, [], [("tbl", 5)]),
+            (True, [], [("tbl", 6)]),
+        ],
+    ],
+}
+
+def expected_pages(sections):
+    return [value for section in sections for _, _, runs in section for kind, value in runs if kind == "tbl"]
+
+def layout_cell_table(tag):
+    return [[(0, 1, 1, [(f"{tag}-{r}0", False)]), (1, 1, 1, [(f"{tag}-{r}1", False)])] for r in range(2)]
+
+def write_layout_hwpx(path, sections):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as file:
+        file.writestr("mimetype", "application/hwp+zip")
+        for s, section in enumerate(sections):
+            body = []
+            for p, (page_break, lines, runs) in enumerate(section):
+                inner = "".join(f"<hp:t>{'x' * value}</hp:t>" if kind == "t" else to_hwpx_table(layout_cell_table(f"{s}.{p}.{i}")) for i, (kind, value) in enumerate(runs))
+                segs = "".join(f'<hp:lineseg textpos="{textpos}" vertpos="{vertpos}" vertsize="1000" flags="{flags}"/>' for textpos, vertpos, flags in lines)
+                body.append(f'<hp:p pageBreak="{int(page_break)}"><hp:run>{inner}</hp:run>' + (f"<hp:linesegarray>{segs}</hp:linesegarray>" if lines else "") + "</hp:p>")
+            file.writestr(f"Contents/section{s}.xml", f"<hs:sec {HWPX_NS}>{''.join(body)}</hs:sec>")
+
+def hwp5_record(tag, level, payload):
+    if len(payload) >= 0xFFF:
+        return struct.pack("<II", tag | level << 10 | 0xFFF << 20, len(payload)) + payload
+    return struct.pack("<I", tag | level << 10 | len(payload) << 20) + payload
+
+def hwp5_paragraph(level, text, page_break=False, lines=()):
+    out = hwp5_record(hx.HWPTAG_PARA_HEADER, level, struct.pack("<IIHBB", 0x80000000, 0, 0, 0, 0x04 if page_break else 0) + bytes(12))
+    out += hwp5_record(hx.HWPTAG_PARA_TEXT, level + 1, (text + "\r").encode("utf-16-le"))
+    if lines:
+        out += hwp5_record(hx.HWPTAG_PARA_LINE_SEG, level + 1, b"".join(hx.HWP5_LINE_SEG.pack(textpos, vertpos, 1000, 1000, 850, 600, 0, 42520, flags) for textpos, vertpos, flags in lines))
+    return out
+
+# 확장 컨트롤 문자는 8글자(16바이트)를 차지하며, 가운데에 컨트롤 ID를 뒤집어 담는다.
+HWP5_TABLE_CHAR = "\x0b" + "tbl "[::-1] + "\0\0\x0b"
+HWP5_FOOTNOTE_CHAR = "\x11" + "fn  "[::-1] + "\0\0\x11"
+
+def hwp5_table(level, table):
+    out = hwp5_record(hx.HWPTAG_CTRL_HEADER, level, struct.pack("<I", hx.HWP5_TABLE_ID) + bytes(40))
+    out += hwp5_record(hx.HWPTAG_TABLE, level + 1, struct.pack("<IHH", 0, len(table), max(col_addr + col_span for row in table for col_addr, col_span, _, _ in row)) + bytes(30))
+    for r, row in enumerate(table):
+        for col_addr, col_span, row_span, paragraphs in row:
+            out += hwp5_record(hx.HWPTAG_LIST_HEADER, level + 1, struct.pack("<HHI4H", len(paragraphs), 0, 0, col_addr, r, col_span, row_span) + bytes(20))
+            for text, footnote in paragraphs:
+                if not footnote:
+                    out += hwp5_paragraph(level + 1, text)
+                    continue
+                # 각주는 문단 텍스트의 컨트롤 문자와 그 문단 아래 CTRL_HEADER(fn), 본문 목록으로 들어간다.
+                out += hwp5_paragraph(level + 1, text + HWP5_FOOTNOTE_CHAR)
+                out += hwp5_record(hx.HWPTAG_CTRL_HEADER, level + 2, struct.pack("<I", hx.HWP5_NOTE_IDS[0]) + bytes(40))
+                out += hwp5_record(hx.HWPTAG_LIST_HEADER, level + 3, struct.pack("<HHI", 1, 0, 0))
+                out += hwp5_paragraph(level + 3, FOOTNOTE_TEXT)
+    return out
+
+# 최소한의 복합 문서(CFB) 파일. 4096바이트보다 작은 스트림은 미니 스트림에, 큰 스트림은 실제 .hwp처럼 FAT 체인으로 이은 섹터에 담고,
+# FAT 섹터가 헤더에 다 적히지 않으면(109개 초과) DIFAT 섹터를 잇는다. 한 단계 저장소(BodyText/Section0)까지만 만든다.
+def write_cfb(path, streams):
+    sector, mini_sector, cutoff = 512, 64, 4096
+    per_sector = sector // 4
+    free, end, fat_mark, difat_mark = hx.CFB_NO_STREAM, hx.CFB_END_OF_CHAIN, 0xFFFFFFFD, 0xFFFFFFFC
+    entries = [["Root Entry", 5, end, 0, free, free]]  # 이름, 종류, 시작, 크기, 오른쪽 형제, 자식
+    last_child = {0: None}
+    mini = bytearray()
+    mini_fat = []
+    fat = []
+    body = bytearray()
+
+    def chain(data, size, table):
+        count = max(1, -(-len(data) // size))
+        start = len(table)
+        table.extend(list(range(start + 1, start + count)) + [end])
+        return start, bytes(data).ljust(count * size, b"\0")
+
+    def add(parent, entry):
+        entries.append(entry)
+        if last_child[parent] is None:
+            entries[parent][5] = len(entries) - 1
+        else:
+            entries[last_child[parent]][4] = len(entries) - 1
+        last_child[parent] = len(entries) - 1
+        return len(entries) - 1
+
+    storages = {}
+    for name, data in streams.items():
+        *folders, leaf = name.split("/")
+        parent = 0
+        for folder in folders:
+            if folder not in storages:
+                storages[folder] = add(parent, [folder, 1, 0, 0, free, free])
+                last_child[storages[folder]] = None
+            parent = storages[folder]
+        if len(data) < cutoff:
+            start, padded = chain(data, mini_sector, mini_fat)
+            mini += padded
+        else:
+            start, padded = chain(data, sector, fat)
+            body += padded
+        add(parent, [leaf, 2, start, len(data), free, free])
+
+    entries[0][2], padded = chain(mini, sector, fat)
+    entries[0][3] = len(mini)
+    body += padded
+    mini_fat_data = struct.pack(f"<{len(mini_fat)}I", *mini_fat)
+    mini_fat_start, padded = chain(mini_fat_data, sector, fat)
+    body += padded
+    directory = bytearray()
+    for name, kind, start, size, right, child in entries:
+        encoded = (name + "\0").encode("utf-16-le")
+        directory += encoded.ljust(64, b"\0") + struct.pack("<HBBIII", len(encoded), kind, 1, free, right, child) + bytes(36) + struct.pack("<IQ", start, size)
+    directory_start, padded = chain(directory, sector, fat)
+    body += padded
+
+    # FAT 섹터와 DIFAT 섹터도 FAT에 한 칸씩 차지하므로 개수가 더 늘지 않을 때까지 센다.
+    fat_count = difat_count = 0
+    while True:
+        need_fat = -(-(len(fat) + fat_count + difat_count) // per_sector)
+        need_difat = -(-max(0, need_fat - 109) // (per_sector - 1))
+        if (need_fat, need_difat) == (fat_count, difat_count):
+            break
+        fat_count, difat_count = need_fat, need_difat
+    fat_sectors = list(range(len(fat), len(fat) + fat_count))
+    difat_sectors = list(range(len(fat) + fat_count, len(fat) + fat_count + difat_count))
+    fat += [fat_mark] * fat_count + [difat_mark] * difat_count
+    fat += [free] * (fat_count * per_sector - len(fat))
+    body += struct.pack(f"<{len(fat)}I", *fat)
+    for i in range(difat_count):
+        listed = fat_sectors[109 + i * (per_sector - 1):109 + (i + 1) * (per_sector - 1)]
+        following = difat_sectors[i + 1] if i + 1 < difat_count else end
+        body += struct.pack(f"<{per_sector}I", *listed, *[free] * (per_sector - 1 - len(listed)), following)
+
+    header = hx.CFB_SIGNATURE + bytes(16) + struct.pack("<HHHHH", 0x3E, 3, 0xFFFE, 9, 6) + bytes(6)
+    header += struct.pack("<9I", 0, fat_count, directory_start, 0, cutoff, mini_fat_start, max(1, -(-len(mini_fat_data) // sector)),
+                          difat_sectors[0] if difat_sectors else end, difat_count)
+    header += struct.pack("<109I", *fat_sectors[:109], *[free] * (109 - min(109, fat_count)))
+    with open(path, "wb") as file:
+        file.write(header)
+        file.write(body)
+
+def hwp5_streams(sections):
+    streams = {"FileHeader": (hx.HWP5_SIGNATURE.ljust(32, b"\0") + struct.pack("<II", 0x05000300, 1)).ljust(256, b"\0")}
+    for s, body in enumerate(sections):
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        streams[f"BodyText/Section{s}"] = compressor.compress(bytes(body)) + compressor.flush()
+    return streams
+
+# write_hwpx와 같은 문서를 HWP 5.0으로 쓴다. 구역은 압축해서 4096바이트를 넘으므로 FAT 체인으로 읽힌다.
+def write_hwp5(path, tables, per_page):
+    body = bytearray()
+    for i, table in enumerate(tables):
+        flags = hx.LINESEG_SEGMENTS | (hx.LINESEG_PAGE_START if i % per_page == 0 else 0)
+        body += hwp5_paragraph(0, HWP5_TABLE_CHAR, i > 0 and i % per_page == 0, [(0, i % per_page * 20000, flags)])
+        body += hwp5_table(1, table)
+    write_cfb(path, hwp5_streams([body]))
+
+def write_layout_hwp5(path, sections):
+    bodies = []
+    for s, section in enumerate(sections):
+        body = bytearray()
+        for p, (page_break, lines, runs) in enumerate(section):
+            text = "".join("x" * value if kind == "t" else HWP5_TABLE_CHAR for kind, value in runs)
+            body += hwp5_paragraph(0, text, page_break, lines)
+            body += b"".join(hwp5_table(1, layout_cell_table(f"{s}.{p}.{i}")) for i, (kind, _) in enumerate(runs) if kind == "tbl")
+        bodies.append(body)
+    write_cfb(path, hwp5_streams(bodies))
+
+def run_page_check():
+    results = []
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as workdir:
+        for name, sections in PAGE_CASES.items():
+            reference = expected_pages(sections)
+            for extension, write in (("hwpx", write_layout_hwpx), ("hwp", write_layout_hwp5)):
+                path = os.path.join(workdir, f"{name}.{extension}")
+                write(path, sections)
+                results.append((name, extension, hx.compare_table_pages(hx.native_table_pages(path), reference)))
+    return results
+
+# pyhwpx.Hwp 대신 쓰는 객체. 표 컨트롤 사이에 다른 컨트롤을 하나씩 끼워 컨트롤 목록을 따라가는 비용도 들어가게 한다.
+class FakeAnchor:
+    def __init__(self, index):
+        self.index = index
+
+    def Item(self, key):
+        return {"List": 0, "Para": self.index, "Pos": 0}[key]
+
+class FakeCtrl:
+    def __init__(self, hwp, index, ctrl_id, page, src=None):
+        self.hwp = hwp
+        self.index = index
+        self.CtrlID = ctrl_id
+        self.page = page
+        self.src = src
+
+    @property
+    def Next(self):
+        ctrls = self.hwp.ctrls
+        return ctrls[self.index + 1] if self.index + 1 < len(ctrls) else None
+
+    def GetAnchorPos(self, kind):
+        return FakeAnchor(self.index)
+
+class FakeHwp:
+    def __init__(self, sources, per_page, latency=0.0):
+        self.latency = latency
+        self.ctrls = []
+        for i, src in enumerate(sources):
+            page = 1 + i // per_page
+            self.ctrls.append(FakeCtrl(self, len(self.ctrls), "gso", page))
+            self.ctrls.append(FakeCtrl(self, len(self.ctrls), "tbl", page, src))
+        self.pos = 0
+
+    @property
+    def HeadCtrl(self):
+        return self.ctrls[0] if self.ctrls else None
+
+    @property
+    def current_page(self):
+        return self.ctrls[self.pos].page
+
+    def SetPosBySet(self, anchor):
+        self.pos = anchor.index
+
+    def FindCtrl(self):
+        pass
+
+    def GetTextFile(self, fmt, option=""):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.ctrls[self.pos].src
+
+# 엑셀(COM) 대신 쓰는 객체. 넘어온 값은 튜플을 한 번 훑어 마샬링 비용을 흉내 내고, 호출 수를 센다.
+class FakeComObject:
+    def __init__(self, excel):
+        self.__dict__["excel"] = excel
+
+    def __setattr__(self, name, value):
+        self.excel.calls += 1
+        if name == "Value":
+            self.excel.cells += sum(len(row) for row in value)
+
+    def __getattr__(self, name):
+        self.excel.calls += 1
+        if name == "RowHeight":
+            return 15.0
+        return FakeComObject(self.excel)
+
+    def __call__(self, *args, **kwargs):
+        self.excel.calls += 1
+        return FakeComObject(self.excel)
+
+class FakeWorksheets:
+    def __init__(self, excel):
+        self.excel = excel
+        self.items = [FakeComObject(excel)]
+
+    @property
+    def Count(self):
+        return len(self.items)
+
+    def Add(self, After=None):
+        self.excel.calls += 1
+        self.items.append(FakeComObject(self.excel))
+        return self.items[-1]
+
+    def __call__(self, index):
+        self.excel.calls += 1
+        return self.items[index - 1]
+
+class FakeWorkbook:
+    def __init__(self):
+        self.calls = 0
+        self.cells = 0
+        self.Worksheets = FakeWorksheets(self)
+
+    def Save(self):
+        self.calls += 1
+
+class Bench:
+    def __init__(self, workdir, tables, per_page, com_latency=0.0, pipeline_depth=4):
+        self.workdir = workdir
+        self.tables = tables
+        self.per_page = per_page
+        self.com_latency = com_latency
+        self.pipeline_depth = pipeline_depth
+        self.sources = [to_hwpml(table) for table in tables]
+        self.hwpx = os.path.join(workdir, "bench.hwpx")
+        write_hwpx(self.hwpx, tables, per_page)
+        self.hwp5 = os.path.join(workdir, "bench.hwp")
+        write_hwp5(self.hwp5, tables, per_page)
+        self.pages = 1 + (len(tables) - 1) // per_page
+
+    def converter(self):
+        converter = hx.HwpConverter()
+        converter.settings.update(SPMode=True, useCache=False, pipelineDepth=self.pipeline_depth)
+        converter.reset_state()
+        return converter
+
+    # 단계 이름, 실행 함수 목록. 각 단계는 앞 단계가 남긴 상태(state)를 이어받는다.
+    def stages(self):
+        def parse(state):
+            state["rows"] = [list(hx.iter_hwpml_rows(src)) for src in self.sources]
+            return len(self.sources)
+
+        def layout(state):
+            state["laid_out"] = [hx.layout_table(rows) for rows in state.pop("rows")]
+            check_footnotes(state["laid_out"], "layout")
+            state["cells"] = sum(table.n_rows * table.n_cols for table in state.pop("laid_out"))
+            return len(self.sources)
+
+        def page_index(state):
+            converter = self.converter()
+            converter.hwp = FakeHwp(self.sources, self.per_page, self.com_latency)
+            converter.page_index = hx.PageIndex.build(converter.hwp)
+            state["converter"] = converter
+            return len(self.sources)
+
+        def extract(state):
+            # export_via_xml 경로(GetTextFile + 파싱 + 배치)를 문서 앞뒤 절반씩 두 시트로 나눠 돌린다.
+            converter = state["converter"]
+            converter.total_pages = self.pages
+            half = max(1, self.pages // 2)
+            for first, last in ((1, half), (half + 1, self.pages)):
+                converter.add_sheet()
+                converter.ctrl = converter.hwp.HeadCtrl
+                converter.ctrl_ordinal = 0
+                converter.go_to_start_page(first)
+                converter.copy_paste_to_endpage(last, lambda **kwargs: None)
+            state["pipeline"] = converter.pipeline_stats
+            return converter.exported_pages
+
+        def rearrange(state):
+            state["converter"].rearrange_demos()
+            return len(self.sources)
+
+        def write_xlsx(state):
+            converter = state["converter"]
+            writer = hx.XlsxWriter(os.path.join(self.workdir, "bench.xlsx"))
+            try:
+                for sheet in converter.sheets:
+                    writer.add_sheet(sheet.name, sheet.tables)
+            finally:
+                writer.close()
+            return len(self.sources)
+
+        def write_com(state):
+            converter = state["converter"]
+            converter.settings["output"] = "excel"
+            converter.wb = FakeWorkbook()
+            converter.save_workbook()
+            state["com_calls"] = converter.wb.calls
+            converter.wb = None
+            return len(self.sources)
+
+        def native(reader, stage):
+            reader.open()
+            try:
+                count = 0
+                for _, table in reader.iter_tables():
+                    check_footnotes([hx.layout_table(hx.iter_element_rows(table))], stage)
+                    count += 1
+            finally:
+                reader.close()
+            return count
+
+        return [
+            ("parse", parse),
+            ("layout", layout),
+            ("page_index", page_index),
+            ("extract", extract),
+            ("rearrange", rearrange),
+            ("write_xlsx", write_xlsx),
+            ("write_com", write_com),
+            ("native_hwpx", lambda state: native(hx.HwpxReader(self.hwpx), "native_hwpx")),
+            ("native_hwp5", lambda state: native(hx.Hwp5Reader(self.hwp5), "native_hwp5")),
+        ]
+
+    def run(self, trace_memory=False):
+        state = {}
+        results = {}
+        for name, stage in self.stages():
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            count = stage(state)
+            seconds = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            if trace_memory:
+                tracemalloc.stop()
+            results[name] = {"seconds": seconds, "tables": count, "peak_kb": peak and peak // 1024}
+        return results, state
+
+def run_benchmark(args):
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)  # HwpConverter는 현재 폴더의 data/에 설정과 로그를 남긴다.
+        try:
+            tables = make_document(args.tables, args.rows, args.cols, args.span_density, args.footnote_rate, args.demo_ratio, args.seed)
+            bench = Bench(workdir, tables, args.per_page, args.com_latency / 1000, args.pipeline_depth)
+            best = None
+            for _ in range(args.repeat):
+                results, state = bench.run()
+                if best is None:
+                    best = results
+                else:
+                    for name, result in results.items():
+                        best[name]["seconds"] = min(best[name]["seconds"], result["seconds"])
+            memory, _ = bench.run(trace_memory=True)
+        finally:
+            os.chdir(cwd)
+
+    cells = state["cells"]
+    for name, result in best.items():
+        result["peak_kb"] = memory[name]["peak_kb"]
+        result["tables_per_s"] = result["tables"] / result["seconds"] if result["seconds"] else None
+        result["cells_per_s"] = cells * result["tables"] / len(tables) / result["seconds"] if result["seconds"] else None
+    return {
+        "scenario": {key: value for key, value in vars(args).items() if key not in ("json", "compare", "max_slowdown")},
+        "cells": cells,
+        "com_calls": state["com_calls"],
+        "pipeline": pipeline_utilization(state["pipeline"]),
+        "stages": best,
+    }
+
+# 추출 단계의 범위별 파이프라인 사용률을 표 수로 가중 평균한다.
+def pipeline_utilization(stats):
+    tables = sum(stat["tables"] for stat in stats) or 1
+    names = stats[0]["utilization"] if stats else {}
+    return {name: sum(stat["utilization"][name] * stat["tables"] for stat in stats) / tables for name in names}
+
+def rss_kb(field):
+    with open("/proc/self/status", "r", encoding="ascii") as file:
+        for line in file:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return None
+
+# 새 프로세스에서 변환 한 번을 돌리고 늘어난 최고 메모리(KB)를 돌려준다. VmHWM은 exec한 프로세스마다 새로 세므로
+# 부모가 문서를 만드느라 쓴 메모리가 섞이지 않는다.
+def measure_conversion(path, workdir, ranges, max_memory_mb, results):
+    os.chdir(workdir)
+    converter = hx.HwpConverter()
+    converter.settings.update(backend="hwpx" if path.endswith(".hwpx") else "hwp5", output="xlsx", doOpenHwp=False, doOpenXlsx=False)
+    if max_memory_mb is not None:
+        converter.settings["maxMemoryMB"] = max_memory_mb
+    converter.file = path
+    converter.filename = os.path.splitext(os.path.basename(path))[0] + ".xlsx"
+    converter.export_path = workdir
+    use_proc = os.path.exists("/proc/self/status")
+    if use_proc:
+        before = rss_kb("VmRSS")
+    else:
+        tracemalloc.start()
+    started = time.perf_counter()
+    converter.extract_tables(ranges, lambda **kwargs: None)
+    seconds = time.perf_counter() - started
+    peak = rss_kb("VmHWM") - before if use_proc else tracemalloc.get_traced_memory()[1] // 1024
+    results.put({"peak_kb": peak, "seconds": seconds, "spilled": converter.memory_budget.spilled, "measure": "rss" if use_proc else "tracemalloc"})
+
+def run_memory_check(args):
+    peaks = {}
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as workdir:
+        for extension, write in (("hwpx", write_hwpx), ("hwp", write_hwp5)):
+            for n_tables in (args.tables, args.tables * 4):
+                path = os.path.join(workdir, f"memory{n_tables}.{extension}")
+                write(path, make_document(n_tables, args.rows, args.cols, args.span_density, args.footnote_rate, args.demo_ratio, args.seed), args.per_page)
+                pages = 1 + (n_tables - 1) // args.per_page
+                ranges = [1, pages // 2, pages // 2 + 1, pages]
+                # 처음 실행(cold)은 상한을 넘겨 캐시를 채우지 않으므로, 넉넉한 기본 상한으로 한 번 더 돌려 캐시를 채운 뒤 캐시에서 다시 그린다.
+                for run, max_memory_mb in (("cold", args.max_memory_mb), ("fill", None), ("cached", args.max_memory_mb)):
+                    results = context.Queue()
+                    process = context.Process(target=measure_conversion, args=(path, workdir, ranges, max_memory_mb, results))
+                    process.start()
+                    result = results.get()
+                    process.join()
+                    if run != "fill":
+                        peaks[(extension, run, n_tables)] = result
+    return peaks
+
+def print_report(report):
+    scenario = report["scenario"]
+    print(f"{scenario['tables']} tables, {report['cells']} cells, {report['com_calls']} COM calls (best of {scenario['repeat']})")
+    print(f"{'stage':<12}{'seconds':>10}{'tables/s':>12}{'cells/s':>14}{'peak KB':>10}")
+    for name, result in report["stages"].items():
+        print(f"{name:<12}{result['seconds']:>10.3f}{result['tables_per_s'] or 0:>12.0f}{result['cells_per_s'] or 0:>14.0f}{result['peak_kb']:>10}")
+    if report.get("pipeline"):
+        print("extract pipeline utilization : " + ", ".join(f"{name} {busy:.0%}" for name, busy in report["pipeline"].items()))
+
+def compare(report, baseline, max_slowdown):
+    slower = []
+    for name, result in report["stages"].items():
+        before = baseline["stages"].get(name)
+        # 수 밀리초 단위 단계는 잡음이 크므로 10ms 이상 차이 날 때만 느려진 것으로 본다.
+        if before and result["seconds"] > max(before["seconds"] * max_slowdown, before["seconds"] + 0.01):
+            slower.append(f"{name}: {before['seconds']:.3f}s -> {result['seconds']:.3f}s")
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the table export without Hwp or Excel.")
+    parser.add_argument("--tables", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=12, help="average rows per table")
+    parser.add_argument("--cols", type=int, default=6, help="average columns per table")
+    parser.add_argument("--span-density", type=float, default=0.15, help="share of cells with ColSpan/RowSpan")
+    parser.add_argument("--footnote-rate", type=float, default=0.05)
+    parser.add_argument("--demo-ratio", type=float, default=0.3, help="share of tables with the demo column on the right")
+    parser.add_argument("--per-page", type=int, default=2, help="tables per page")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--compare", help="baseline report; exit 1 when a stage got slower")
+    parser.add_argument("--max-slowdown", type=float, default=1.2)
+    parser.add_argument("--com-latency", type=float, default=0, help="milliseconds to wait in each GetTextFile")
+    parser.add_argument("--pipeline-depth", type=int, default=4, help="pipelineDepth setting; 0 runs the stages in one thread")
+    parser.add_argument("--memory-check", action="store_true", help="check that peak memory stays flat as the document grows")
+    parser.add_argument("--max-memory-mb", type=float, default=1, help="maxMemoryMB setting for --memory-check")
+    parser.add_argument("--check-pages", action="store_true", help="check the native page numbers against synthetic HWPX/HWP layouts")
+    parser.add_argument("--max-growth", type=float, default=2, help="allowed peak memory growth for a 4x larger document (holding every table grows it about 4x)")
+    args = parser.parse_args(argv)
+
+    if args.check_pages:
+        failed = False
+        for name, extension, result in run_page_check():
+            print(f"{name:<22}{extension:<6}{result['matched']}/{max(result['tables'], result['reference_tables'])}")
+            for ordinal, page, expected in result["mismatches"]:
+                print(f"{name}.{extension}: table {ordinal + 1} on page {page}, expected {expected}", file=sys.stderr)
+            if result["accuracy"] < 1:
+                if result["tables"] != result["reference_tables"]:
+                    print(f"{name}.{extension}: {result['tables']} tables, expected {result['reference_tables']}", file=sys.stderr)
+                failed = True
+        return 1 if failed else 0
+
+    if args.memory_check:
+        peaks = run_memory_check(args)
+        print(f"{'format':<8}{'run':<8}{'tables':>8}{'seconds':>10}{'peak KB':>10}  spilled")
+        for (extension, run, n_tables), result in peaks.items():
+            print(f"{extension:<8}{run:<8}{n_tables:>8}{result['seconds']:>10.3f}{result['peak_kb']:>10}  {result['spilled']}")
+        print(f"peak = {next(iter(peaks.values()))['measure']} growth during the conversion")
+        failed = False
+        for extension in ("hwpx", "hwp"):
+            for run in ("cold", "cached"):
+                small, large = (peaks[(extension, run, n_tables)]["peak_kb"] for n_tables in (args.tables, args.tables * 4))
+                if large > small * args.max_growth:
+                    print(f"{extension} {run} run: peak memory grew {large / small:.2f}x for a 4x larger document", file=sys.stderr)
+                    failed = True
+        return 1 if failed else 0
+
+    report = run_benchmark(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent="\t")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        scenario = {key: value for key, value in report["scenario"].items() if key != "repeat"}
+        if scenario != {key: value for key, value in baseline["scenario"].items() if key != "repeat"}:
+            print("baseline was measured with a different scenario", file=sys.stderr)
+            return 2
+        slower = compare(report, baseline, args.max_slowdown)
+        for line in slower:
+            print(f"slower : {line}", file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())